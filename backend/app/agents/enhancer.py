@@ -5,11 +5,13 @@ Enhancer Agent - Enhances resumes based on job requirements and gap analysis.
 import logging
 from typing import Dict, Any
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, SystemMessage
 
 from ..prompts.base import CAREERCRAFT_SYSTEM_PROMPT
 from ..prompts.enhancement import ENHANCE_RESUME_PROMPT
-from ..prompts.utils import format_prompt, validate_json_response
+from ..prompts.utils import (
+    format_prompt_parts, build_cached_messages, supports_prompt_caching, validate_json_response,
+)
+from ..utils.concurrency import invoke_with_limit, ainvoke_with_limit
 from ..graphs.state import (
     RecruitmentState,
     update_state_status,
@@ -59,7 +61,7 @@ async def enhancer_node(state: RecruitmentState, llm: BaseChatModel) -> Recruitm
 
         # Format prompt
         import json
-        prompt = format_prompt(
+        static_prompt, variable_prompt = format_prompt_parts(
             ENHANCE_RESUME_PROMPT,
             candidate_json=json.dumps(parsed_resume, indent=2),
             job_json=json.dumps(analyzed_job, indent=2),
@@ -67,12 +69,11 @@ async def enhancer_node(state: RecruitmentState, llm: BaseChatModel) -> Recruitm
         )
 
         # Call LLM with higher temperature for creativity
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = await llm.ainvoke(messages)
+        response = await ainvoke_with_limit(llm, messages, call_site="enhance")
 
         # Validate and parse JSON response
         enhanced_data = validate_json_response(response.content)
@@ -143,7 +144,7 @@ def enhancer_node_sync(state: RecruitmentState, llm: BaseChatModel) -> Recruitme
 
         # Format prompt
         import json
-        prompt = format_prompt(
+        static_prompt, variable_prompt = format_prompt_parts(
             ENHANCE_RESUME_PROMPT,
             candidate_json=json.dumps(parsed_resume, indent=2),
             job_json=json.dumps(analyzed_job, indent=2),
@@ -151,12 +152,11 @@ def enhancer_node_sync(state: RecruitmentState, llm: BaseChatModel) -> Recruitme
         )
 
         # Call LLM (sync)
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = llm.invoke(messages)
+        response = invoke_with_limit(llm, messages, call_site="enhance")
 
         # Validate and parse JSON response
         enhanced_data = validate_json_response(response.content)
@@ -3,12 +3,18 @@ Job Analyzer Agent - Analyzes job descriptions and extracts requirements.
 """
 
 import logging
-from typing import Dict, Any
+import hashlib
+from typing import Dict, Any, List
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage
 
 from ..prompts.base import CAREERCRAFT_SYSTEM_PROMPT, ANALYZE_JOB_DESCRIPTION_PROMPT
-from ..prompts.utils import format_prompt, validate_json_response
+from ..prompts.utils import (
+    format_prompt_parts, build_cached_messages, supports_prompt_caching, validate_json_response,
+)
+from ..utils.concurrency import invoke_with_limit, ainvoke_with_limit
+from ..utils.match_cache import describe_llm
+from ..utils.job_analysis_cache import get_job_analysis_cache, make_job_analysis_key
 from ..graphs.state import (
     RecruitmentState,
     update_state_status,
@@ -18,6 +24,41 @@ from ..graphs.state import (
 
 logger = logging.getLogger(__name__)
 
+# Changes whenever the job analysis prompts change, invalidating cached analyses
+JOB_ANALYSIS_PROMPT_VERSION = hashlib.sha256(
+    (CAREERCRAFT_SYSTEM_PROMPT + ANALYZE_JOB_DESCRIPTION_PROMPT).encode("utf-8")
+).hexdigest()[:12]
+
+
+def job_analysis_messages(job_description: str, llm: BaseChatModel) -> List[BaseMessage]:
+    """
+    Build the job analysis request
+
+    Args:
+        job_description: Raw job description text
+        llm: Language model instance (decides on prompt cache markers)
+
+    Returns:
+        Messages to send to the LLM
+    """
+    static_prompt, variable_prompt = format_prompt_parts(
+        ANALYZE_JOB_DESCRIPTION_PROMPT,
+        job_description=job_description
+    )
+    return build_cached_messages(
+        CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+    )
+
+
+def job_analysis_cache_key(job_description: str, llm: BaseChatModel) -> str:
+    """Key of a job description's analysis in the job analysis cache"""
+    return make_job_analysis_key(job_description, *describe_llm(llm), JOB_ANALYSIS_PROMPT_VERSION)
+
+
+def is_complete_analysis(analyzed_data: Dict[str, Any]) -> bool:
+    """Check that an analysis has its essential fields (only complete analyses are cached)"""
+    return bool(analyzed_data.get("job_info")) and bool(analyzed_data.get("requirements"))
+
 
 # ============================================================================
 # JOB ANALYZER NODE
@@ -47,28 +88,28 @@ async def job_analyzer_node(state: RecruitmentState, llm: BaseChatModel) -> Recr
         if not job_description:
             raise ValueError("No job description provided")
 
-        # Format prompt
-        prompt = format_prompt(
-            ANALYZE_JOB_DESCRIPTION_PROMPT,
-            job_description=job_description
-        )
-
-        # Call LLM
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        # The same job description is analyzed once, then reused for every resume
+        cache = get_job_analysis_cache()
+        cache_key = job_analysis_cache_key(job_description, llm)
 
-        response = await llm.ainvoke(messages)
+        async with cache.alock(cache_key):
+            analyzed_data = await cache.aget(cache_key)
+            if analyzed_data is None:
+                # Call LLM
+                response = await ainvoke_with_limit(
+                    llm, job_analysis_messages(job_description, llm), call_site="job_analysis"
+                )
 
-        # Validate and parse JSON response
-        analyzed_data = validate_json_response(response.content)
+                # Validate and parse JSON response
+                analyzed_data = validate_json_response(response.content)
+                if is_complete_analysis(analyzed_data):
+                    await cache.aset(cache_key, analyzed_data)
 
         # Calculate confidence (simple heuristic)
         confidence = 95.0  # High confidence for job analysis (typically accurate)
 
         # Check if essential fields are present
-        if not analyzed_data.get("job_info") or not analyzed_data.get("requirements"):
+        if not is_complete_analysis(analyzed_data):
             confidence = 60.0
 
         # Update state
@@ -120,27 +161,27 @@ def job_analyzer_node_sync(state: RecruitmentState, llm: BaseChatModel) -> Recru
         if not job_description:
             raise ValueError("No job description provided")
 
-        # Format prompt
-        prompt = format_prompt(
-            ANALYZE_JOB_DESCRIPTION_PROMPT,
-            job_description=job_description
-        )
-
-        # Call LLM (sync)
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        # The same job description is analyzed once, then reused for every resume
+        cache = get_job_analysis_cache()
+        cache_key = job_analysis_cache_key(job_description, llm)
 
-        response = llm.invoke(messages)
+        with cache.lock(cache_key):
+            analyzed_data = cache.get(cache_key)
+            if analyzed_data is None:
+                # Call LLM (sync)
+                response = invoke_with_limit(
+                    llm, job_analysis_messages(job_description, llm), call_site="job_analysis"
+                )
 
-        # Validate and parse JSON response
-        analyzed_data = validate_json_response(response.content)
+                # Validate and parse JSON response
+                analyzed_data = validate_json_response(response.content)
+                if is_complete_analysis(analyzed_data):
+                    cache.set(cache_key, analyzed_data)
 
         # Calculate confidence
         confidence = 95.0
 
-        if not analyzed_data.get("job_info") or not analyzed_data.get("requirements"):
+        if not is_complete_analysis(analyzed_data):
             confidence = 60.0
 
         # Update state
@@ -5,11 +5,13 @@ Matcher Agent - Matches candidates to job requirements.
 import logging
 from typing import Dict, Any
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, SystemMessage
 
 from ..prompts.base import CAREERCRAFT_SYSTEM_PROMPT
 from ..prompts.matching import MATCH_CANDIDATE_TO_JOB_PROMPT
-from ..prompts.utils import format_prompt, validate_json_response
+from ..prompts.utils import (
+    format_prompt_parts, build_cached_messages, supports_prompt_caching, validate_json_response,
+)
+from ..utils.concurrency import invoke_with_limit, ainvoke_with_limit
 from ..graphs.state import (
     RecruitmentState,
     update_state_status,
@@ -53,19 +55,18 @@ async def matcher_node(state: RecruitmentState, llm: BaseChatModel) -> Recruitme
 
         # Format prompt
         import json
-        prompt = format_prompt(
+        static_prompt, variable_prompt = format_prompt_parts(
             MATCH_CANDIDATE_TO_JOB_PROMPT,
             candidate_json=json.dumps(parsed_resume, indent=2),
             job_json=json.dumps(analyzed_job, indent=2)
         )
 
         # Call LLM
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = await llm.ainvoke(messages)
+        response = await ainvoke_with_limit(llm, messages, call_site="match")
 
         # Validate and parse JSON response
         match_data = validate_json_response(response.content)
@@ -128,19 +129,18 @@ def matcher_node_sync(state: RecruitmentState, llm: BaseChatModel) -> Recruitmen
 
         # Format prompt
         import json
-        prompt = format_prompt(
+        static_prompt, variable_prompt = format_prompt_parts(
             MATCH_CANDIDATE_TO_JOB_PROMPT,
             candidate_json=json.dumps(parsed_resume, indent=2),
             job_json=json.dumps(analyzed_job, indent=2)
         )
 
         # Call LLM (sync)
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = llm.invoke(messages)
+        response = invoke_with_limit(llm, messages, call_site="match")
 
         # Validate and parse JSON response
         match_data = validate_json_response(response.content)
@@ -5,11 +5,13 @@ Resume Parser Agent - Extracts structured data from resumes.
 import logging
 from typing import Dict, Any
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.tools import tool
 
 from ..prompts.base import CAREERCRAFT_SYSTEM_PROMPT, PARSE_RESUME_PROMPT
-from ..prompts.utils import format_prompt, validate_json_response
+from ..prompts.utils import (
+    format_prompt_parts, build_cached_messages, supports_prompt_caching, validate_json_response,
+)
+from ..utils.concurrency import invoke_with_limit, ainvoke_with_limit
 from ..graphs.state import (
     RecruitmentState,
     update_state_status,
@@ -91,15 +93,14 @@ async def parser_node(state: RecruitmentState, llm: BaseChatModel) -> Recruitmen
             raise ValueError("No resume text provided")
 
         # Format prompt
-        prompt = format_prompt(PARSE_RESUME_PROMPT, resume_text=resume_text)
+        static_prompt, variable_prompt = format_prompt_parts(PARSE_RESUME_PROMPT, resume_text=resume_text)
 
         # Call LLM
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = await llm.ainvoke(messages)
+        response = await ainvoke_with_limit(llm, messages, call_site="parse")
 
         # Validate and parse JSON response
         parsed_data = validate_json_response(response.content)
@@ -163,15 +164,14 @@ def parser_node_sync(state: RecruitmentState, llm: BaseChatModel) -> Recruitment
             raise ValueError("No resume text provided")
 
         # Format prompt
-        prompt = format_prompt(PARSE_RESUME_PROMPT, resume_text=resume_text)
+        static_prompt, variable_prompt = format_prompt_parts(PARSE_RESUME_PROMPT, resume_text=resume_text)
 
         # Call LLM (sync)
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = llm.invoke(messages)
+        response = invoke_with_limit(llm, messages, call_site="parse")
 
         # Validate and parse JSON response
         parsed_data = validate_json_response(response.content)
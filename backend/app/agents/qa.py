@@ -5,11 +5,13 @@ QA Agent - Quality assurance for enhanced resumes.
 import logging
 from typing import Dict, Any
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, SystemMessage
 
 from ..prompts.base import CAREERCRAFT_SYSTEM_PROMPT
 from ..prompts.enhancement import QA_ENHANCED_RESUME_PROMPT
-from ..prompts.utils import format_prompt, validate_json_response
+from ..prompts.utils import (
+    format_prompt_parts, build_cached_messages, supports_prompt_caching, validate_json_response,
+)
+from ..utils.concurrency import invoke_with_limit, ainvoke_with_limit
 from ..graphs.state import (
     RecruitmentState,
     update_state_status,
@@ -56,19 +58,18 @@ async def qa_node(state: RecruitmentState, llm: BaseChatModel) -> RecruitmentSta
 
         # Format prompt
         import json
-        prompt = format_prompt(
+        static_prompt, variable_prompt = format_prompt_parts(
             QA_ENHANCED_RESUME_PROMPT,
             original_json=json.dumps(parsed_resume, indent=2),
             enhanced_json=json.dumps(enhanced_resume, indent=2)
         )
 
         # Call LLM with low temperature for consistency
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = await llm.ainvoke(messages)
+        response = await ainvoke_with_limit(llm, messages, call_site="qa")
 
         # Validate and parse JSON response
         qa_data = validate_json_response(response.content)
@@ -133,19 +134,18 @@ def qa_node_sync(state: RecruitmentState, llm: BaseChatModel) -> RecruitmentStat
 
         # Format prompt
         import json
-        prompt = format_prompt(
+        static_prompt, variable_prompt = format_prompt_parts(
             QA_ENHANCED_RESUME_PROMPT,
             original_json=json.dumps(parsed_resume, indent=2),
             enhanced_json=json.dumps(enhanced_resume, indent=2)
         )
 
         # Call LLM (sync)
-        messages = [
-            SystemMessage(content=CAREERCRAFT_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+        messages = build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, static_prompt, variable_prompt, supports_prompt_caching(llm)
+        )
 
-        response = llm.invoke(messages)
+        response = invoke_with_limit(llm, messages, call_site="qa")
 
         # Validate and parse JSON response
         qa_data = validate_json_response(response.content)
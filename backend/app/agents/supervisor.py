@@ -105,6 +105,26 @@ def route_after_parsing(state: RecruitmentState) -> Literal["job_analyzer", "hum
     return "end"
 
 
+def route_after_inputs(state: RecruitmentState) -> Literal["matcher", "human_review", "end"]:
+    """
+    Route workflow after resume parsing and job analysis ran in parallel.
+
+    Applies the parsing rules first (low confidence review, no job), then the
+    job analysis rules.
+
+    Args:
+        state: Current state
+
+    Returns:
+        Next node name
+    """
+    next_step = route_after_parsing(state)
+    if next_step != "job_analyzer":
+        return next_step
+
+    return route_after_job_analysis(state)
+
+
 def route_after_job_analysis(state: RecruitmentState) -> Literal["matcher", "end"]:
     """
     Route workflow after job analysis.
@@ -152,6 +172,24 @@ def route_after_matching(state: RecruitmentState) -> Literal["enhancer", "qa_che
     return "enhancer"
 
 
+def route_after_match_only(state: RecruitmentState) -> Literal["completed", "end"]:
+    """
+    Route workflow after matching when enhancement and QA are not compiled in.
+
+    Args:
+        state: Current state
+
+    Returns:
+        Next node name
+    """
+    if not state.get("match_result"):
+        logger.warning("Matching failed, ending workflow")
+        return "end"
+
+    logger.info("Matching complete, generating recommendation")
+    return "completed"
+
+
 def route_after_enhancement(state: RecruitmentState) -> Literal["enhancer", "qa_check"]:
     """
     Route workflow after resume enhancement.
@@ -4,10 +4,21 @@ Analyzes template format and applies it to other resumes
 """
 
 from typing import TypedDict, Annotated
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_core.language_models import BaseChatModel
 from pydantic import BaseModel, Field
 
+from ..prompts.base import CAREERCRAFT_SYSTEM_PROMPT, PARSE_RESUME_PROMPT
+from ..prompts.utils import (
+    format_prompt_parts, build_cached_messages, supports_prompt_caching, message_text,
+)
+from ..utils.concurrency import invoke_with_limit
+from ..utils.cost_estimator import RunEstimate, DEFAULT_MAX_RUN_COST, count_message_tokens, count_tokens
+
+# Expected response sizes used by estimate_formatting_run
+TEMPLATE_FORMAT_TOKENS = 600        # TemplateFormat analysis
+MAX_RESPONSE_TOKENS = 4000          # parsed or formatted resume, capped by the model config
+
 
 class TemplateFormat(BaseModel):
     """Template format structure"""
@@ -39,17 +50,20 @@ class TemplateFormatterState(TypedDict):
     errors: Annotated[list, lambda x, y: x + y]
 
 
-def analyze_template_format(llm: BaseChatModel, template_text: str, custom_instructions: str = None) -> dict:
+def template_analysis_messages(template_text: str, custom_instructions: str = None, cache: bool = False) -> list[BaseMessage]:
     """
-    Analyze the template resume to extract its format structure.
+    Build the chat messages that analyze a template's format.
+
+    The instructions come first and the template last, so the instructions
+    are a cacheable prefix shared by every template.
 
     Args:
-        llm: Language model instance
         template_text: Text extracted from template resume
         custom_instructions: Optional user-provided specific instructions
+        cache: Add provider cache markers (see supports_prompt_caching)
 
     Returns:
-        Dictionary containing template format structure
+        System and user messages
     """
 
     system_prompt = """You are a resume format analyzer. Your job is to analyze a resume template
@@ -87,10 +101,7 @@ CRITICAL USER INSTRUCTIONS - FOLLOW THESE EXACTLY:
 
 These instructions are MANDATORY. The template MUST be analyzed according to these specific requirements."""
 
-    user_prompt = f"""Analyze this resume template and extract its format structure with EXTREME PRECISION:
-
-{template_text}
-{user_instructions}
+    static_prompt = """Analyze the resume template at the end of this message and extract its format structure with EXTREME PRECISION.
 
 Provide an EXTREMELY detailed analysis of:
 1. The EXACT order of sections (include specific names as they appear)
@@ -105,14 +116,37 @@ Be VERY SPECIFIC. For example:
 - Don't just say "sections are ordered", list them: "1. PROFESSIONAL SUMMARY, 2. WORK EXPERIENCE, etc."
 - Include actual examples from the template whenever possible
 
-Return your analysis in a structured format."""
+Return your analysis in a structured format.
+
+"""
+
+    variable_prompt = f"""TEMPLATE:
+{template_text}
+{user_instructions}"""
+
+    return build_cached_messages(system_prompt, static_prompt, variable_prompt, cache)
+
+
+def analyze_template_format(llm: BaseChatModel, template_text: str, custom_instructions: str = None) -> dict:
+    """
+    Analyze the template resume to extract its format structure.
+
+    Args:
+        llm: Language model instance
+        template_text: Text extracted from template resume
+        custom_instructions: Optional user-provided specific instructions
+
+    Returns:
+        Dictionary containing template format structure
+    """
 
     try:
         structured_llm = llm.with_structured_output(TemplateFormat, method="function_calling")
-        result = structured_llm.invoke([
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ])
+        result = invoke_with_limit(
+            structured_llm,
+            template_analysis_messages(template_text, custom_instructions, supports_prompt_caching(llm)),
+            call_site="template_analysis",
+        )
 
         return {
             "template_format": result.model_dump(),
@@ -127,18 +161,21 @@ Return your analysis in a structured format."""
         }
 
 
-def apply_template_format(llm: BaseChatModel, parsed_resume: dict, template_format: dict, custom_instructions: str = None) -> dict:
+def template_apply_messages(parsed_resume: dict, template_format: dict, custom_instructions: str = None, cache: bool = False) -> list[BaseMessage]:
     """
-    Apply the template format to a parsed resume.
+    Build the chat messages that reformat a parsed resume to a template.
+
+    The rules and template format come first and the parsed resume last, so
+    every resume formatted to the same template shares a cacheable prefix.
 
     Args:
-        llm: Language model instance
         parsed_resume: Parsed resume data
         template_format: Template format structure
         custom_instructions: Optional user-provided specific instructions
+        cache: Add provider cache markers (see supports_prompt_caching)
 
     Returns:
-        Dictionary containing formatted resume
+        System and user messages
     """
 
     system_prompt = """You are a resume formatter. Your job is to reformat a resume to match
@@ -169,17 +206,14 @@ CRITICAL USER-PROVIDED INSTRUCTIONS - THESE ARE MANDATORY:
 
 You MUST follow these instructions EXACTLY. They override any general formatting guidelines."""
 
-    user_prompt = f"""Reformat this resume to match the template format using ONLY the candidate's real data:
-
-PARSED RESUME (ONLY source of truth - use ONLY this data):
-{parsed_resume}
+    static_prompt = f"""Reformat the resume at the end of this message to match the template format using ONLY the candidate's real data.
 
 TEMPLATE FORMAT TO MATCH:
 {template_format}
 {user_instructions_text}
 
 CRITICAL ANTI-HALLUCINATION RULES:
-1. ONLY use information from the PARSED RESUME above
+1. ONLY use information from the PARSED RESUME below
 2. If template shows "MBA" but candidate has "BS" - use BS (their actual degree)
 3. If template shows "20+ years SAP" but candidate has different skills - use their actual skills
 4. NEVER copy example content from template (names, companies, skills, dates)
@@ -197,16 +231,40 @@ Formula: Template STRUCTURE (format/order) + Candidate's REAL DATA (from parsed
 
 VERIFY before returning: Did I use any information NOT in the parsed resume? If yes, remove it!
 
-Return the reformatted resume using ONLY the candidate's actual information."""
+Return the reformatted resume using ONLY the candidate's actual information.
+
+Return your response as valid JSON matching the FormattedResume schema.
+
+"""
+
+    variable_prompt = f"""PARSED RESUME (ONLY source of truth - use ONLY this data):
+{parsed_resume}"""
+
+    return build_cached_messages(system_prompt, static_prompt, variable_prompt, cache)
+
+
+def apply_template_format(llm: BaseChatModel, parsed_resume: dict, template_format: dict, custom_instructions: str = None) -> dict:
+    """
+    Apply the template format to a parsed resume.
+
+    Args:
+        llm: Language model instance
+        parsed_resume: Parsed resume data
+        template_format: Template format structure
+        custom_instructions: Optional user-provided specific instructions
+
+    Returns:
+        Dictionary containing formatted resume
+    """
 
     try:
         # Use JSON mode instead of function_calling for better compatibility
         import json
 
-        response = llm.invoke([
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt + "\n\nReturn your response as valid JSON matching the FormattedResume schema."}
-        ])
+        response = invoke_with_limit(
+            llm, template_apply_messages(parsed_resume, template_format, custom_instructions, supports_prompt_caching(llm)),
+            call_site="template_apply",
+        )
 
         # Parse the JSON response
         response_text = response.content if hasattr(response, 'content') else str(response)
@@ -304,3 +362,74 @@ def format_resume_with_template(llm: BaseChatModel, template_text: str, resume_t
         "formatting_confidence": format_result["formatting_confidence"],
         "errors": []
     }
+
+
+def estimate_formatting_run(
+    model: str,
+    template_text: str,
+    resume_texts: list[str],
+    custom_instructions: str = None,
+    max_concurrency: int = 1,
+    max_cost: float = DEFAULT_MAX_RUN_COST,
+    prompt_caching: bool = False,
+) -> dict:
+    """
+    Project the tokens, cost and duration of formatting a batch of resumes.
+
+    Every resume costs three requests, as in the batch formatter: parsing,
+    template analysis and applying the format. Parsing and analysis prompts
+    are rendered exactly; the format prompt is rendered with the resume text
+    standing in for its parsed data. Parsed and formatted resumes are assumed
+    to be about as long as the resume text.
+
+    Args:
+        model: Model name used for pricing
+        template_text: Text extracted from template resume
+        resume_texts: Extracted text of every resume to format
+        custom_instructions: Optional user-provided specific instructions
+        max_concurrency: Resumes formatted at the same time
+        max_cost: Hard cap in USD the estimate is checked against (None for no cap)
+        prompt_caching: Requests carry provider cache markers (see supports_prompt_caching)
+
+    Returns:
+        RunEstimate summary (see RunEstimate.summary)
+    """
+    estimate = RunEstimate(model, max_concurrency, prompt_caching)
+
+    def parts(messages: list[BaseMessage]) -> tuple[str, int, int]:
+        # Static prefix (system prompt and first human block), its tokens and the request's tokens
+        *system, human = messages
+        prefix_messages = [message_text(message) for message in system] + [human.content[0]["text"]]
+        total = count_message_tokens([message_text(message) for message in messages])
+        return "".join(prefix_messages), count_message_tokens(prefix_messages), total
+
+    analysis_prefix, analysis_prefix_tokens, analysis_tokens = parts(
+        template_analysis_messages(template_text, custom_instructions, cache=True)
+    )
+    placeholder_format = TemplateFormat().model_dump()
+
+    for resume_text in resume_texts:
+        if not resume_text:
+            estimate.skip("no_text", 1)
+            continue
+        resume_tokens = min(count_tokens(resume_text), MAX_RESPONSE_TOKENS)
+
+        parse_prefix, parse_prefix_tokens, parse_tokens = parts(build_cached_messages(
+            CAREERCRAFT_SYSTEM_PROMPT, *format_prompt_parts(PARSE_RESUME_PROMPT, resume_text=resume_text), cache=True
+        ))
+        estimate.add_request("parsing", parse_tokens, resume_tokens, prefix=parse_prefix, prefix_tokens=parse_prefix_tokens)
+        estimate.add_request(
+            "template_analysis", analysis_tokens, TEMPLATE_FORMAT_TOKENS,
+            prefix=analysis_prefix, prefix_tokens=analysis_prefix_tokens,
+        )
+
+        # The real template format is only known after analysis: the placeholder is padded to its expected size
+        apply_prefix, apply_prefix_tokens, apply_tokens = parts(
+            template_apply_messages({"resume_text": resume_text}, placeholder_format, custom_instructions, cache=True)
+        )
+        estimate.add_request(
+            "formatting", apply_tokens + TEMPLATE_FORMAT_TOKENS, resume_tokens,
+            prefix=apply_prefix, prefix_tokens=apply_prefix_tokens + TEMPLATE_FORMAT_TOKENS,
+        )
+
+    return estimate.summary(max_cost)
@@ -3,10 +3,18 @@ State management for LangGraph recruitment workflows.
 Defines the shared state that flows through all agents.
 """
 
-from typing import TypedDict, Optional, List, Dict, Any, Literal
+from typing import TypedDict, Optional, List, Dict, Any, Literal, Annotated
 from datetime import datetime
 
 
+def merge_branch_updates(
+    current: Optional[Dict[str, Dict[str, Any]]],
+    update: Optional[Dict[str, Dict[str, Any]]],
+) -> Dict[str, Dict[str, Any]]:
+    """Reducer letting parallel branches each add their own entry to branch_updates"""
+    return {**(current or {}), **(update or {})}
+
+
 # ============================================================================
 # CORE STATE DEFINITIONS
 # ============================================================================
@@ -107,6 +115,10 @@ class RecruitmentState(TypedDict, total=False):
     match_score: Optional[float]
     """Overall match score (0-100)"""
 
+    # ===== Parallel Branches =====
+    branch_updates: Annotated[Dict[str, Dict[str, Any]], merge_branch_updates]
+    """Errors, confidence and status of each parallel branch, merged by the join node"""
+
 
 # ============================================================================
 # BATCH PROCESSING STATE
@@ -188,6 +200,7 @@ def create_initial_state(resume_text: str, job_description: Optional[str] = None
         updated_at=now,
         final_recommendation=None,
         match_score=None,
+        branch_updates={},
     )
 
 
@@ -2,21 +2,38 @@
 LangGraph workflow for recruitment pipeline.
 """
 
+import os
 import logging
-from typing import Dict, Any
-from langgraph.graph import StateGraph, END
+import threading
+from typing import Dict, Any, Tuple
+from langgraph.graph import StateGraph, START, END
 from langchain_core.language_models import BaseChatModel
-
-from .state import RecruitmentState, create_initial_state
-from ..agents.parser import parser_node_sync
-from ..agents.job_analyzer import job_analyzer_node_sync
-from ..agents.matcher import matcher_node_sync, should_enhance_resume
-from ..agents.enhancer import enhancer_node_sync, should_retry_enhancement
-from ..agents.qa import qa_node_sync, should_request_human_review
+from langchain_core.runnables import RunnableConfig
+
+# Chat model providers for runs that do not pass a model (deployed graph)
+try:
+    from langchain_anthropic import ChatAnthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+try:
+    from langchain_openai import ChatOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from ..prompts.config import LLMProvider, LLM_CONFIGS
+from .state import RecruitmentState, create_initial_state, update_state_status, flag_for_review
+from ..agents.parser import parser_node, parser_node_sync
+from ..agents.job_analyzer import job_analyzer_node, job_analyzer_node_sync
+from ..agents.matcher import matcher_node, matcher_node_sync, should_enhance_resume
+from ..agents.enhancer import enhancer_node, enhancer_node_sync, should_retry_enhancement
+from ..agents.qa import qa_node, qa_node_sync, should_request_human_review
 from ..agents.supervisor import (
-    route_after_parsing,
-    route_after_job_analysis,
+    route_after_inputs,
     route_after_matching,
+    route_after_match_only,
     route_after_enhancement,
     route_after_qa,
     generate_final_recommendation,
@@ -26,88 +43,350 @@ logger = logging.getLogger(__name__)
 
 
 # ============================================================================
-# WORKFLOW BUILDER
+# GRAPH PROFILES
 # ============================================================================
 
+PARSE_PROFILE = "parse"
+MATCH_PROFILE = "match"
+FULL_PROFILE = "full"
+
+# Nodes compiled into each profile. Shorter profiles stop as soon as their
+# outputs exist, so they never pay for enhancer or QA calls they would discard.
+GRAPH_PROFILES = {
+    # parser -> end
+    PARSE_PROFILE: ("parser",),
+    # (parser | job_analyzer) -> join_inputs -> matcher -> completed (if matching succeeded)
+    MATCH_PROFILE: ("parser", "job_analyzer", "join_inputs", "matcher", "human_review", "completed"),
+    # (parser | job_analyzer) -> join_inputs -> matcher -> enhancer (retries) -> qa -> completed
+    FULL_PROFILE: (
+        "parser", "job_analyzer", "join_inputs", "matcher", "enhancer", "qa", "human_review", "completed",
+    ),
+}
+
+# Fields both parallel branches write; each branch reports them through
+# branch_updates and join_inputs merges them
+BRANCH_FIELDS = ("errors", "confidence_scores", "needs_review", "status", "current_agent")
+
+
+# Default model of runs without llm_config (override with LLM_PROVIDER and LLM_MODEL)
+DEFAULT_LLM_PROVIDER = os.getenv("LLM_PROVIDER", LLMProvider.ANTHROPIC.value)
+DEFAULT_LLM_MODEL = os.getenv("LLM_MODEL")
+
+
+_graph_registry: Dict[Tuple[str, bool], Any] = {}
+_registry_lock = threading.Lock()
+_default_llm_lock = threading.Lock()
 
-def create_recruitment_workflow(llm: BaseChatModel) -> StateGraph:
+
+# ============================================================================
+# NODES
+# ============================================================================
+
+
+def llm_config(llm: BaseChatModel) -> RunnableConfig:
     """
-    Create the recruitment workflow graph.
+    Build the runtime config that hands the language model to the graph's nodes
 
     Args:
         llm: Language model instance to use across all agents
 
     Returns:
-        Compiled StateGraph
+        RunnableConfig to pass to invoke
     """
-    logger.info("Building recruitment workflow graph...")
+    return {"configurable": {"llm": llm}}
 
-    # Create the workflow
-    workflow = StateGraph(RecruitmentState)
 
-    # Define node functions with LLM bound
-    def parser(state: RecruitmentState) -> RecruitmentState:
-        return parser_node_sync(state, llm)
+def get_default_llm() -> BaseChatModel:
+    """
+    Get the environment-configured language model, creating it on first use
+
+    Used by runs that do not pass a model with llm_config, such as HTTP
+    calls to the deployed graph.
+
+    Returns:
+        Chat model for DEFAULT_LLM_PROVIDER (DEFAULT_LLM_MODEL, or the
+        provider's model in LLM_CONFIGS)
+
+    Raises:
+        ValueError: If the provider is unsupported or its package is not installed
+    """
+    global _default_llm_instance
+
+    # Locked: parallel runs may ask for the model at the same time
+    with _default_llm_lock:
+        if '_default_llm_instance' not in globals():
+            if DEFAULT_LLM_PROVIDER == LLMProvider.ANTHROPIC.value and ANTHROPIC_AVAILABLE:
+                chat_model = ChatAnthropic
+            elif DEFAULT_LLM_PROVIDER == LLMProvider.OPENAI.value and OPENAI_AVAILABLE:
+                chat_model = ChatOpenAI
+            else:
+                raise ValueError(
+                    f"No default language model: provider {DEFAULT_LLM_PROVIDER!r} is unsupported "
+                    "or its package is not installed"
+                )
+            config = LLM_CONFIGS[LLMProvider(DEFAULT_LLM_PROVIDER)]
+            _default_llm_instance = chat_model(
+                model=DEFAULT_LLM_MODEL or config.model,
+                temperature=config.temperature,
+                max_tokens=config.max_tokens,
+            )
+            logger.info(f"Default language model: {DEFAULT_LLM_PROVIDER} {DEFAULT_LLM_MODEL or config.model}")
+
+    return _default_llm_instance
+
+
+def _config_llm(config: RunnableConfig) -> BaseChatModel:
+    """Get the language model passed with llm_config, or the default model"""
+    llm = (config or {}).get("configurable", {}).get("llm")
+    if llm is None:
+        return get_default_llm()
+    return llm
+
+
+def parser(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Parse the resume"""
+    return parser_node_sync(state, _config_llm(config))
+
+
+def job_analyzer(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Analyze the job description"""
+    return job_analyzer_node_sync(state, _config_llm(config))
+
+
+def matcher(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Match the candidate to the job"""
+    return matcher_node_sync(state, _config_llm(config))
+
+
+def enhancer(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Enhance the resume for the job"""
+    return enhancer_node_sync(state, _config_llm(config))
+
+
+def qa(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Check the enhanced resume"""
+    return qa_node_sync(state, _config_llm(config))
+
+
+async def parser_async(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Parse the resume (async)"""
+    return await parser_node(state, _config_llm(config))
+
+
+async def job_analyzer_async(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Analyze the job description (async)"""
+    return await job_analyzer_node(state, _config_llm(config))
+
+
+async def matcher_async(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Match the candidate to the job (async)"""
+    return await matcher_node(state, _config_llm(config))
+
+
+async def enhancer_async(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Enhance the resume for the job (async)"""
+    return await enhancer_node(state, _config_llm(config))
+
+
+async def qa_async(state: RecruitmentState, config: RunnableConfig) -> RecruitmentState:
+    """Check the enhanced resume (async)"""
+    return await qa_node(state, _config_llm(config))
+
+
+def _branch_state(state: RecruitmentState) -> RecruitmentState:
+    """Private copy of the state for a node running in parallel with another branch"""
+    return {**state, "errors": [], "confidence_scores": {}, "needs_review": []}
+
+
+def _branch_update(name: str, result: RecruitmentState, output: str) -> Dict[str, Any]:
+    """Update returned by a parallel branch: its own output plus its bookkeeping for join_inputs"""
+    return {
+        output: result.get(output),
+        "branch_updates": {name: {field: result.get(field) for field in BRANCH_FIELDS}},
+    }
+
+
+def _has_job_description(state: RecruitmentState) -> bool:
+    return bool((state.get("job_description") or "").strip())
+
+
+def parser_branch(state: RecruitmentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Parse the resume next to job analysis"""
+    result = parser_node_sync(_branch_state(state), _config_llm(config))
+    return _branch_update("parser", result, "parsed_resume")
+
 
-    def job_analyzer(state: RecruitmentState) -> RecruitmentState:
-        return job_analyzer_node_sync(state, llm)
+def job_analyzer_branch(state: RecruitmentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Analyze the job description next to resume parsing (nothing to do without one)"""
+    if not _has_job_description(state):
+        return {}
+    result = job_analyzer_node_sync(_branch_state(state), _config_llm(config))
+    return _branch_update("job_analyzer", result, "analyzed_job")
 
-    def matcher(state: RecruitmentState) -> RecruitmentState:
-        return matcher_node_sync(state, llm)
 
-    def enhancer(state: RecruitmentState) -> RecruitmentState:
-        return enhancer_node_sync(state, llm)
+async def parser_branch_async(state: RecruitmentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Parse the resume next to job analysis (async)"""
+    result = await parser_node(_branch_state(state), _config_llm(config))
+    return _branch_update("parser", result, "parsed_resume")
 
-    def qa(state: RecruitmentState) -> RecruitmentState:
-        return qa_node_sync(state, llm)
 
-    def human_review_node(state: RecruitmentState) -> RecruitmentState:
-        """Placeholder for human review - in production, this would wait for human input"""
-        logger.info("Human review required - workflow paused")
-        state["status"] = "human_review"
-        return state
+async def job_analyzer_branch_async(state: RecruitmentState, config: RunnableConfig) -> Dict[str, Any]:
+    """Analyze the job description next to resume parsing (async)"""
+    if not _has_job_description(state):
+        return {}
+    result = await job_analyzer_node(_branch_state(state), _config_llm(config))
+    return _branch_update("job_analyzer", result, "analyzed_job")
 
-    def completion_node(state: RecruitmentState) -> RecruitmentState:
-        """Final node that generates recommendation"""
-        logger.info("Workflow completed, generating final recommendation")
-        state["status"] = "completed"
-        state["final_recommendation"] = generate_final_recommendation(state)
-        return state
 
-    # Add nodes to the workflow
-    workflow.add_node("parser", parser)
-    workflow.add_node("job_analyzer", job_analyzer)
-    workflow.add_node("matcher", matcher)
-    workflow.add_node("enhancer", enhancer)
-    workflow.add_node("qa", qa)
-    workflow.add_node("human_review", human_review_node)
-    workflow.add_node("completed", completion_node)
+def join_inputs(state: RecruitmentState) -> RecruitmentState:
+    """Merge the parser and job analyzer branches in the order they used to run"""
+    branch_updates = state.get("branch_updates") or {}
+    statuses = []
 
-    # Set entry point
-    workflow.set_entry_point("parser")
+    for name in ("parser", "job_analyzer"):
+        update = branch_updates.get(name)
+        if not update:
+            continue
+        state["errors"] = state.get("errors", []) + (update["errors"] or [])
+        state["confidence_scores"] = {**state.get("confidence_scores", {}), **(update["confidence_scores"] or {})}
+        for field in update["needs_review"] or []:
+            state = flag_for_review(state, field)
+        statuses.append((update["status"], update["current_agent"]))
+
+    if statuses:
+        status, agent = next((entry for entry in statuses if entry[0] == "failed"), statuses[-1])
+        state = update_state_status(state, status, agent)
+
+    return state
+
+
+def human_review_node(state: RecruitmentState) -> RecruitmentState:
+    """Placeholder for human review - in production, this would wait for human input"""
+    logger.info("Human review required - workflow paused")
+    state["status"] = "human_review"
+    return state
+
+
+def completion_node(state: RecruitmentState) -> RecruitmentState:
+    """Final node that generates recommendation"""
+    logger.info("Workflow completed, generating final recommendation")
+    state["status"] = "completed"
+    state["final_recommendation"] = generate_final_recommendation(state)
+    return state
+
+
+NODES = {
+    "parser": parser,
+    "job_analyzer": job_analyzer,
+    "matcher": matcher,
+    "enhancer": enhancer,
+    "qa": qa,
+    "human_review": human_review_node,
+    "completed": completion_node,
+    "join_inputs": join_inputs,
+}
+
+# Parser and job analyzer when they run in parallel (profiles with join_inputs)
+BRANCH_NODES = {
+    "parser": parser_branch,
+    "job_analyzer": job_analyzer_branch,
+}
+
+# LLM nodes awaiting llm.ainvoke, for graphs run with ainvoke
+ASYNC_NODES = {
+    **NODES,
+    "parser": parser_async,
+    "job_analyzer": job_analyzer_async,
+    "matcher": matcher_async,
+    "enhancer": enhancer_async,
+    "qa": qa_async,
+}
+
+ASYNC_BRANCH_NODES = {
+    "parser": parser_branch_async,
+    "job_analyzer": job_analyzer_branch_async,
+}
+
+
+# ============================================================================
+# WORKFLOW BUILDER
+# ============================================================================
+
+
+def create_recruitment_workflow(profile: str = FULL_PROFILE, use_async: bool = False) -> StateGraph:
+    """
+    Create the recruitment workflow graph.
+
+    The graph holds no language model: nodes read it from the run config, so
+    one compiled graph serves every request (see get_recruitment_graph).
+
+    Args:
+        profile: Graph profile to compile (see GRAPH_PROFILES)
+        use_async: Use the async LLM nodes (run the graph with ainvoke)
+
+    Returns:
+        Compiled StateGraph
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in GRAPH_PROFILES:
+        raise ValueError(f"Unknown graph profile: {profile}. Expected one of {list(GRAPH_PROFILES)}")
+
+    logger.info(f"Building recruitment workflow graph ({profile} profile, {'async' if use_async else 'sync'})...")
+
+    # Create the workflow
+    workflow = StateGraph(RecruitmentState)
+
+    # Add the profile's nodes to the workflow
+    nodes = ASYNC_NODES if use_async else NODES
+    if "join_inputs" in GRAPH_PROFILES[profile]:
+        nodes = {**nodes, **(ASYNC_BRANCH_NODES if use_async else BRANCH_NODES)}
+    for name in GRAPH_PROFILES[profile]:
+        workflow.add_node(name, nodes[name])
+
+    if profile == PARSE_PROFILE:
+        workflow.add_edge(START, "parser")
+        workflow.add_edge("parser", END)
+        logger.info("Workflow graph built successfully")
+        return workflow.compile()
 
     # Define edges
-    # After parsing -> conditional route
-    workflow.add_conditional_edges(
-        "parser",
-        route_after_parsing,
-        {
-            "job_analyzer": "job_analyzer",
-            "human_review": "human_review",
-            "end": END,
-        }
-    )
+    # Fan out: parsing and job analysis only depend on their own inputs
+    workflow.add_edge(START, "parser")
+    workflow.add_edge(START, "job_analyzer")
 
-    # After job analysis -> matcher
+    # Fan in: wait for both, then apply the parsing and job analysis routing rules
+    workflow.add_edge(["parser", "job_analyzer"], "join_inputs")
     workflow.add_conditional_edges(
-        "job_analyzer",
-        route_after_job_analysis,
+        "join_inputs",
+        route_after_inputs,
         {
             "matcher": "matcher",
+            "human_review": "human_review",
             "end": END,
         }
     )
 
+    # After human review -> end
+    workflow.add_edge("human_review", END)
+
+    # After completion -> end
+    workflow.add_edge("completed", END)
+
+    if profile == MATCH_PROFILE:
+        # Matching done: generate the recommendation without enhancement or QA
+        workflow.add_conditional_edges(
+            "matcher",
+            route_after_match_only,
+            {
+                "completed": "completed",
+                "end": END,
+            }
+        )
+        logger.info("Workflow graph built successfully")
+        return workflow.compile()
+
     # After matching -> conditional route
     workflow.add_conditional_edges(
         "matcher",
@@ -139,17 +418,35 @@ def create_recruitment_workflow(llm: BaseChatModel) -> StateGraph:
         }
     )
 
-    # After human review -> end
-    workflow.add_edge("human_review", END)
-
-    # After completion -> end
-    workflow.add_edge("completed", END)
-
     logger.info("Workflow graph built successfully")
 
     return workflow.compile()
 
 
+def get_recruitment_graph(profile: str = FULL_PROFILE, use_async: bool = False):
+    """
+    Get the compiled graph of a profile, compiling it on first use
+
+    Args:
+        profile: Graph profile (see GRAPH_PROFILES)
+        use_async: Get the graph built from the async LLM nodes
+
+    Returns:
+        Compiled StateGraph shared by every caller in the process
+    """
+    # Locked: API workers and Streamlit sessions may ask for a graph at the same time
+    with _registry_lock:
+        if (profile, use_async) not in _graph_registry:
+            _graph_registry[(profile, use_async)] = create_recruitment_workflow(profile, use_async)
+
+    return _graph_registry[(profile, use_async)]
+
+
+# Entry point of the LangGraph deployment (see langgraph.json). The platform
+# runs graphs asynchronously, and runs without llm_config use get_default_llm.
+graph = get_recruitment_graph(FULL_PROFILE, use_async=True)
+
+
 # ============================================================================
 # WORKFLOW EXECUTOR
 # ============================================================================
@@ -160,16 +457,17 @@ class RecruitmentWorkflow:
     Wrapper class for executing the recruitment workflow.
     """
 
-    def __init__(self, llm: BaseChatModel):
+    def __init__(self, llm: BaseChatModel, profile: str = FULL_PROFILE):
         """
         Initialize the workflow.
 
         Args:
             llm: Language model to use
+            profile: Graph profile to compile (see GRAPH_PROFILES)
         """
         self.llm = llm
-        self.workflow = create_recruitment_workflow(llm)
-        logger.info("Recruitment workflow initialized")
+        self.profile = profile
+        self.workflow = get_recruitment_graph(profile)
 
     def run(
         self,
@@ -192,7 +490,7 @@ class RecruitmentWorkflow:
         initial_state = create_initial_state(resume_text, job_description)
 
         # Execute workflow
-        final_state = self.workflow.invoke(initial_state)
+        final_state = self.workflow.invoke(initial_state, config=llm_config(self.llm))
 
         logger.info(f"Workflow completed with status: {final_state.get('status')}")
 
@@ -210,7 +508,43 @@ class RecruitmentWorkflow:
         """
         logger.info("Starting recruitment workflow with custom state...")
 
-        final_state = self.workflow.invoke(initial_state)
+        final_state = self.workflow.invoke(initial_state, config=llm_config(self.llm))
+
+        logger.info(f"Workflow completed with status: {final_state.get('status')}")
+
+        return final_state
+
+    async def arun(
+        self,
+        resume_text: str,
+        job_description: str = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute the workflow without blocking the event loop.
+
+        Args:
+            resume_text: Raw resume text
+            job_description: Optional job description
+
+        Returns:
+            Final state as dictionary
+        """
+        return await self.arun_with_state(create_initial_state(resume_text, job_description))
+
+    async def arun_with_state(self, initial_state: RecruitmentState) -> Dict[str, Any]:
+        """
+        Execute the workflow with custom initial state without blocking the event loop.
+
+        Args:
+            initial_state: Pre-configured state
+
+        Returns:
+            Final state as dictionary
+        """
+        logger.info("Starting async recruitment workflow execution...")
+
+        graph = get_recruitment_graph(self.profile, use_async=True)
+        final_state = await graph.ainvoke(initial_state, config=llm_config(self.llm))
 
         logger.info(f"Workflow completed with status: {final_state.get('status')}")
 
@@ -222,6 +556,28 @@ class RecruitmentWorkflow:
 # ============================================================================
 
 
+def _parse_output(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of a parse-profile run returned to callers"""
+    return {
+        "parsed_resume": result.get("parsed_resume"),
+        "confidence_scores": result.get("confidence_scores"),
+        "needs_review": result.get("needs_review"),
+        "errors": result.get("errors", []),
+    }
+
+
+def _match_output(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of a match-profile run returned to callers"""
+    return {
+        "parsed_resume": result.get("parsed_resume"),
+        "analyzed_job": result.get("analyzed_job"),
+        "match_result": result.get("match_result"),
+        "match_score": result.get("match_score"),
+        "final_recommendation": result.get("final_recommendation"),
+        "errors": result.get("errors", []),
+    }
+
+
 def parse_resume_only(llm: BaseChatModel, resume_text: str) -> Dict[str, Any]:
     """
     Parse a resume without job matching.
@@ -233,15 +589,8 @@ def parse_resume_only(llm: BaseChatModel, resume_text: str) -> Dict[str, Any]:
     Returns:
         Parsed resume data
     """
-    workflow = RecruitmentWorkflow(llm)
-    result = workflow.run(resume_text)
-
-    return {
-        "parsed_resume": result.get("parsed_resume"),
-        "confidence_scores": result.get("confidence_scores"),
-        "needs_review": result.get("needs_review"),
-        "errors": result.get("errors", []),
-    }
+    workflow = RecruitmentWorkflow(llm, PARSE_PROFILE)
+    return _parse_output(workflow.run(resume_text))
 
 
 def match_candidate_to_job(
@@ -260,17 +609,8 @@ def match_candidate_to_job(
     Returns:
         Match results
     """
-    workflow = RecruitmentWorkflow(llm)
-    result = workflow.run(resume_text, job_description)
-
-    return {
-        "parsed_resume": result.get("parsed_resume"),
-        "analyzed_job": result.get("analyzed_job"),
-        "match_result": result.get("match_result"),
-        "match_score": result.get("match_score"),
-        "final_recommendation": result.get("final_recommendation"),
-        "errors": result.get("errors", []),
-    }
+    workflow = RecruitmentWorkflow(llm, MATCH_PROFILE)
+    return _match_output(workflow.run(resume_text, job_description))
 
 
 def complete_workflow(
@@ -289,7 +629,62 @@ def complete_workflow(
     Returns:
         Complete workflow results
     """
-    workflow = RecruitmentWorkflow(llm)
+    workflow = RecruitmentWorkflow(llm, FULL_PROFILE)
     result = workflow.run(resume_text, job_description)
 
     return result
+
+
+async def aparse_resume_only(llm: BaseChatModel, resume_text: str) -> Dict[str, Any]:
+    """
+    Parse a resume without job matching (async).
+
+    Args:
+        llm: Language model
+        resume_text: Resume text
+
+    Returns:
+        Parsed resume data
+    """
+    workflow = RecruitmentWorkflow(llm, PARSE_PROFILE)
+    return _parse_output(await workflow.arun(resume_text))
+
+
+async def amatch_candidate_to_job(
+    llm: BaseChatModel,
+    resume_text: str,
+    job_description: str,
+) -> Dict[str, Any]:
+    """
+    Parse resume and match to job without enhancement (async).
+
+    Args:
+        llm: Language model
+        resume_text: Resume text
+        job_description: Job description
+
+    Returns:
+        Match results
+    """
+    workflow = RecruitmentWorkflow(llm, MATCH_PROFILE)
+    return _match_output(await workflow.arun(resume_text, job_description))
+
+
+async def acomplete_workflow(
+    llm: BaseChatModel,
+    resume_text: str,
+    job_description: str,
+) -> Dict[str, Any]:
+    """
+    Run complete workflow including enhancement and QA (async).
+
+    Args:
+        llm: Language model
+        resume_text: Resume text
+        job_description: Job description
+
+    Returns:
+        Complete workflow results
+    """
+    workflow = RecruitmentWorkflow(llm, FULL_PROFILE)
+    return await workflow.arun(resume_text, job_description)
@@ -38,12 +38,7 @@ You communicate in a professional, helpful, and clear manner.
 # ============================================================================
 
 PARSE_RESUME_PROMPT = """
-Extract structured information from the following resume. Handle any format gracefully.
-
-RESUME TEXT:
-```
-{resume_text}
-```
+Extract structured information from the resume at the end of this message. Handle any format gracefully.
 
 EXTRACTION RULES:
 1. Use YYYY-MM format for all dates (e.g., "2023-06" or "Present")
@@ -144,6 +139,11 @@ OUTPUT SCHEMA (JSON):
 }}
 
 IMPORTANT: Return ONLY valid JSON without markdown code blocks or explanations.
+
+RESUME TEXT:
+```
+{resume_text}
+```
 """
 
 # ============================================================================
@@ -151,12 +151,7 @@ IMPORTANT: Return ONLY valid JSON without markdown code blocks or explanations.
 # ============================================================================
 
 ANALYZE_JOB_DESCRIPTION_PROMPT = """
-Analyze the following job description and extract structured requirements for candidate matching.
-
-JOB DESCRIPTION:
-```
-{job_description}
-```
+Analyze the job description at the end of this message and extract structured requirements for candidate matching.
 
 ANALYSIS OBJECTIVES:
 1. Distinguish required vs preferred qualifications
@@ -247,6 +242,11 @@ OUTPUT SCHEMA (JSON):
 }}
 
 Return ONLY valid JSON.
+
+JOB DESCRIPTION:
+```
+{job_description}
+```
 """
 
 # ============================================================================
@@ -161,17 +161,26 @@ def get_recommended_model(task: str, provider: LLMProvider = LLMProvider.OPENAI)
 # COST TRACKING
 # ============================================================================
 
-# Approximate costs per 1K tokens (as of 2024)
+# Approximate costs per 1K tokens (as of 2024). "cached_input" is the price of
+# prompt tokens read from the provider's prompt cache, "cache_write_input" the
+# price of prompt tokens written to it (1.25x input on Anthropic).
 PRICING = {
     "gpt-4-turbo-preview": {"input": 0.01, "output": 0.03},
     "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
-    "claude-3-opus-20240229": {"input": 0.015, "output": 0.075},
-    "claude-3-sonnet-20240229": {"input": 0.003, "output": 0.015},
+    "claude-3-opus-20240229": {"input": 0.015, "output": 0.075, "cached_input": 0.0015, "cache_write_input": 0.01875},
+    "claude-3-sonnet-20240229": {"input": 0.003, "output": 0.015, "cached_input": 0.0003, "cache_write_input": 0.00375},
+    "claude-3-haiku-20240307": {"input": 0.00025, "output": 0.00125, "cached_input": 0.00003, "cache_write_input": 0.0003125},
     "gemini-pro": {"input": 0.00025, "output": 0.0005},
 }
 
 
-def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_input_tokens: int = 0,
+    cache_write_input_tokens: int = 0,
+) -> float:
     """
     Estimate the cost of an LLM call.
 
@@ -179,6 +188,8 @@ def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
         model: The model name
         input_tokens: Number of input tokens
         output_tokens: Number of output tokens
+        cached_input_tokens: Input tokens (included in input_tokens) read from the prompt cache
+        cache_write_input_tokens: Input tokens (included in input_tokens) written to the prompt cache
 
     Returns:
         Estimated cost in USD
@@ -187,7 +198,11 @@ def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
         return 0.0
 
     pricing = PRICING[model]
-    input_cost = (input_tokens / 1000) * pricing["input"]
+    cached_price = pricing.get("cached_input", pricing["input"])
+    cache_write_price = pricing.get("cache_write_input", pricing["input"])
+    input_cost = ((input_tokens - cached_input_tokens - cache_write_input_tokens) / 1000) * pricing["input"] \
+        + (cached_input_tokens / 1000) * cached_price \
+        + (cache_write_input_tokens / 1000) * cache_write_price
     output_cost = (output_tokens / 1000) * pricing["output"]
 
     return input_cost + output_cost
@@ -7,22 +7,7 @@ Resume enhancement prompts with ethical guidelines and quality assurance.
 # ============================================================================
 
 ENHANCE_RESUME_PROMPT = """
-Enhance this resume to better align with the target job description while maintaining complete factual accuracy.
-
-CANDIDATE PROFILE:
-```json
-{candidate_json}
-```
-
-TARGET JOB:
-```json
-{job_json}
-```
-
-GAP ANALYSIS:
-```json
-{gap_analysis}
-```
+Enhance the resume at the end of this message to better align with the target job description while maintaining complete factual accuracy.
 
 ENHANCEMENT RULES:
 ✅ ALLOWED:
@@ -165,24 +150,29 @@ OUTPUT SCHEMA (JSON):
 }}
 
 Return ONLY valid JSON. Prioritize ethics and accuracy.
-"""
-
-# ============================================================================
-# QUALITY ASSURANCE PROMPT
-# ============================================================================
 
-QA_ENHANCED_RESUME_PROMPT = """
-Review this enhanced resume for quality, accuracy, and ethical compliance.
+CANDIDATE PROFILE:
+```json
+{candidate_json}
+```
 
-ORIGINAL:
+TARGET JOB:
 ```json
-{original_json}
+{job_json}
 ```
 
-ENHANCED:
+GAP ANALYSIS:
 ```json
-{enhanced_json}
+{gap_analysis}
 ```
+"""
+
+# ============================================================================
+# QUALITY ASSURANCE PROMPT
+# ============================================================================
+
+QA_ENHANCED_RESUME_PROMPT = """
+Review the enhanced resume at the end of this message for quality, accuracy, and ethical compliance.
 
 VERIFICATION CHECKLIST:
 1. No fabricated information
@@ -243,4 +233,14 @@ OUTPUT SCHEMA (JSON):
 }}
 
 Return ONLY valid JSON.
+
+ORIGINAL:
+```json
+{original_json}
+```
+
+ENHANCED:
+```json
+{enhanced_json}
+```
 """
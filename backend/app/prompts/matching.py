@@ -7,20 +7,7 @@ Candidate matching prompts for job-candidate alignment analysis.
 # ============================================================================
 
 MATCH_CANDIDATE_TO_JOB_PROMPT = """
-Analyze how well this candidate matches the job requirements. Provide detailed scoring and insights.
-
-CANDIDATE PROFILE:
-```json
-{candidate_json}
-```
-
-JOB REQUIREMENTS:
-```json
-{job_json}
-```
-
-MATCHING RULES (from config):
-{matching_rules}
+Analyze how well the candidate at the end of this message matches the job requirements. Provide detailed scoring and insights.
 
 MATCHING CRITERIA (WEIGHTED):
 1. Technical Skills Match (30% weight) - Required vs preferred skills
@@ -148,6 +135,19 @@ OUTPUT SCHEMA (JSON):
 }}
 
 Return ONLY valid JSON.
+
+CANDIDATE PROFILE:
+```json
+{candidate_json}
+```
+
+JOB REQUIREMENTS:
+```json
+{job_json}
+```
+
+MATCHING RULES (from config):
+{matching_rules}
 """
 
 # ============================================================================
@@ -2,14 +2,30 @@
 Utility functions for LLM calls and response processing.
 """
 
+import os
+import re
 import json
 import logging
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Tuple
 from functools import wraps
 import time
 
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from ..utils.concurrency import get_concurrency_limiter
+
 logger = logging.getLogger(__name__)
 
+# Anthropic prompt cache breakpoint: everything up to the marked block is cached
+# for a few minutes and billed at a fraction of the input price when reused
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Set LLM_PROMPT_CACHING=false to send prompts without cache markers
+PROMPT_CACHING_ENABLED = os.getenv("LLM_PROMPT_CACHING", "true").lower() != "false"
+
+# First {variable} placeholder of a template ({{ and }} are escaped braces)
+_PLACEHOLDER = re.compile(r"(?<!\{)\{[A-Za-z_]\w*\}(?!\})")
+
 
 # ============================================================================
 # PROMPT FORMATTING
@@ -34,6 +50,113 @@ def format_prompt(template: str, **kwargs: Any) -> str:
         raise ValueError(f"Missing required prompt variable: {e}")
 
 
+def split_prompt_template(template: str) -> Tuple[str, str]:
+    """
+    Split a prompt template into its static head and variable tail.
+
+    The head ends at the paragraph that holds the first {variable}, so
+    templates that list their instructions first and inputs last get the
+    longest cacheable prefix.
+
+    Args:
+        template: The prompt template string
+
+    Returns:
+        Tuple of (head template without variables, tail template)
+    """
+    match = _PLACEHOLDER.search(template)
+    if match is None:
+        return template, ""
+    split = template.rfind("\n\n", 0, match.start())
+    split = 0 if split == -1 else split + 2
+    return template[:split], template[split:]
+
+
+def format_prompt_parts(template: str, **kwargs: Any) -> Tuple[str, str]:
+    """
+    Format a prompt template as a static prefix and a per-call suffix.
+
+    The two parts concatenate to exactly format_prompt(template, **kwargs),
+    and the prefix is byte-identical on every call.
+
+    Args:
+        template: The prompt template string
+        **kwargs: Variables to substitute in the template
+
+    Returns:
+        Tuple of (static prefix, variable suffix)
+    """
+    head, tail = split_prompt_template(template)
+    return format_prompt(head), format_prompt(tail, **kwargs)
+
+
+def supports_prompt_caching(llm: Any) -> bool:
+    """
+    Check whether a chat model accepts cache_control markers.
+
+    Args:
+        llm: Chat model instance
+
+    Returns:
+        True for Anthropic chat models when LLM_PROMPT_CACHING is enabled
+    """
+    return PROMPT_CACHING_ENABLED and "anthropic" in type(llm).__module__.lower()
+
+
+def build_cached_messages(
+    system_prompt: Optional[str],
+    static_prompt: str,
+    variable_prompt: str,
+    cache: bool = False,
+) -> List[BaseMessage]:
+    """
+    Build chat messages with the static prefix first and per-call content last.
+
+    Without cache markers the request is a system message plus one human
+    message holding static_prompt + variable_prompt. With markers the human
+    message is split into two text blocks and the static block (or the
+    system prompt, if there is no static block) carries CACHE_CONTROL, so
+    the provider caches everything before the per-call content.
+
+    Args:
+        system_prompt: System prompt, or None for no system message
+        static_prompt: Instructions identical across calls of a run
+        variable_prompt: Per-call content (resume, candidates, ...)
+        cache: Add Anthropic cache_control markers (see supports_prompt_caching)
+
+    Returns:
+        List of messages
+    """
+    messages: List[BaseMessage] = []
+    if not cache:
+        if system_prompt:
+            messages.append(SystemMessage(content=system_prompt))
+        messages.append(HumanMessage(content=static_prompt + variable_prompt))
+        return messages
+
+    if system_prompt:
+        system_block = {"type": "text", "text": system_prompt}
+        if not static_prompt:
+            system_block["cache_control"] = CACHE_CONTROL
+        messages.append(SystemMessage(content=[system_block]))
+
+    # Empty text blocks are rejected by the API
+    blocks = []
+    if static_prompt:
+        blocks.append({"type": "text", "text": static_prompt, "cache_control": CACHE_CONTROL})
+    if variable_prompt:
+        blocks.append({"type": "text", "text": variable_prompt})
+    messages.append(HumanMessage(content=blocks))
+    return messages
+
+
+def message_text(message: BaseMessage) -> str:
+    """Text of a message whose content is a string or a list of text blocks"""
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(block.get("text", "") for block in message.content if isinstance(block, dict))
+
+
 def format_json_for_prompt(data: Dict[str, Any], indent: int = 2) -> str:
     """
     Format dictionary as JSON string for inclusion in prompts.
@@ -132,8 +255,14 @@ def safe_llm_call(
     """
     for attempt in range(max_retries):
         try:
-            # Call the LLM function
-            response = llm_function(prompt=prompt, system_prompt=system_prompt, **llm_kwargs)
+            # Call the LLM function (rate limits are retried by the shared limiter)
+            response = get_concurrency_limiter().call(
+                llm_function,
+                prompt=prompt,
+                system_prompt=system_prompt,
+                call_site=getattr(llm_function, "__name__", "safe_llm_call"),
+                **llm_kwargs,
+            )
 
             # Validate JSON if expected
             if llm_kwargs.get("expect_json", True):
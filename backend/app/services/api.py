@@ -13,8 +13,11 @@ import os
 
 from langchain_openai import ChatOpenAI
 
-from ..graphs.workflow import RecruitmentWorkflow, parse_resume_only, match_candidate_to_job, complete_workflow
+from ..graphs.workflow import RecruitmentWorkflow, aparse_resume_only, amatch_candidate_to_job, acomplete_workflow
 from ..graphs.state import create_initial_state
+from ..utils.concurrency import get_concurrency_limiter
+from ..utils.token_usage import get_token_usage_tracker
+from ..utils.job_analysis_cache import get_job_analysis_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -141,6 +144,9 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
+        "llm_concurrency": get_concurrency_limiter().snapshot(),
+        "llm_usage": get_token_usage_tracker().snapshot(),
+        "job_analysis_cache": get_job_analysis_cache().stats(),
     }
 
 
@@ -165,7 +171,7 @@ async def parse_resume(request: ParseResumeRequest):
     try:
         llm = get_llm(temperature=0.0)  # Deterministic for parsing
 
-        result = parse_resume_only(llm, request.resume_text)
+        result = await aparse_resume_only(llm, request.resume_text)
 
         return WorkflowResponse(
             status="success",
@@ -200,7 +206,7 @@ async def parse_resume_upload(file: UploadFile = File(...)):
 
         # Parse resume
         llm = get_llm(temperature=0.0)
-        result = parse_resume_only(llm, resume_text)
+        result = await aparse_resume_only(llm, resume_text)
 
         return WorkflowResponse(
             status="success",
@@ -239,7 +245,7 @@ async def match_candidate(request: MatchRequest):
     try:
         llm = get_llm(temperature=0.1)  # Low temperature for consistency
 
-        result = match_candidate_to_job(
+        result = await amatch_candidate_to_job(
             llm,
             request.resume_text,
             request.job_description,
@@ -280,7 +286,7 @@ async def enhance_resume(request: EnhanceRequest):
     try:
         llm = get_llm(temperature=0.3)  # Higher temperature for creativity
 
-        result = complete_workflow(
+        result = await acomplete_workflow(
             llm,
             request.resume_text,
             request.job_description,
@@ -322,7 +328,7 @@ async def execute_workflow(request: EnhanceRequest):
         llm = get_llm()
 
         workflow = RecruitmentWorkflow(llm)
-        result = workflow.run(
+        result = await workflow.arun(
             request.resume_text,
             request.job_description,
         )
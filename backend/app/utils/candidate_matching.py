@@ -0,0 +1,1720 @@
+"""
+Candidate Matching - Score resume bank candidates against job positions
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+from langchain_core.language_models import BaseChatModel
+
+from .rules_engine import MatchingRulesEngine, COMPONENT_KEYS, get_rules_engine
+from .match_engine import MatchingEngine, MatchOutcome, DEFAULT_MAX_CONCURRENCY
+from .concurrency import invoke_with_limit
+from .lexical_index import ResumeBankIndex, job_query
+from .match_cache import MatchResultCache, make_match_key, describe_llm
+from .resume_bank import diff_resume_banks
+from .duplicates import find_duplicates
+from .score_matrix import ScoreMatrix
+from .cost_estimator import RunEstimate, DEFAULT_MAX_RUN_COST, count_message_tokens, count_tokens, enforce_budget
+from .skills import get_skill_matcher, format_skill_overlap_hint
+from app.prompts.utils import (
+    chunk_list, merge_batch_responses, validate_json_response, build_cached_messages, supports_prompt_caching,
+)
+
+logger = logging.getLogger(__name__)
+
+# Prompt plus response tokens allowed per batched request (override with MATCH_BATCH_TOKEN_BUDGET)
+DEFAULT_BATCH_TOKEN_BUDGET = int(os.getenv("MATCH_BATCH_TOKEN_BUDGET", "8000"))
+
+# Response tokens reserved for each candidate's scores, strengths and reasoning
+OUTPUT_TOKENS_PER_CANDIDATE = 250
+
+# Response tokens reserved per candidate in hybrid mode (two components only)
+HYBRID_OUTPUT_TOKENS_PER_CANDIDATE = 150
+
+# Upper bound on candidates per batched request
+MAX_BATCH_SIZE = 20
+
+# "llm" has the LLM score all four components. "hybrid" computes skills and
+# experience locally and asks the LLM for title and profile fit only.
+SCORING_MODES = ("llm", "hybrid")
+DEFAULT_SCORING_MODE = "llm"
+
+# Components computed locally in hybrid mode
+LOCAL_COMPONENTS = ("skills", "experience")
+
+# Bump when the scoring prompts or local component scores change so cached
+# LLM analyses and shared runs are not reused
+MATCH_PROMPT_VERSION = "components-v4"
+
+# Match result fields produced by the LLM (everything else is computed locally)
+ANALYSIS_FIELDS = ("component_scores", "strengths", "gaps", "reasoning")
+
+# Component instructions shared by the single and batched scoring prompts.
+# Weights are deliberately left out: they are applied locally after scoring.
+COMPONENT_INSTRUCTIONS = """1. JOB TITLE MATCH: How well does candidate's current/previous titles align with this job title?
+2. SKILLS MATCH: Technical skills from job description match
+3. EXPERIENCE: Years and domain relevance
+4. PROFILE DESCRIPTION MATCH: Overall profile narrative alignment with job description
+"""
+
+HYBRID_COMPONENT_INSTRUCTIONS = """1. JOB TITLE MATCH: How well does candidate's current/previous titles align with this job title?
+2. PROFILE DESCRIPTION MATCH: Overall profile narrative alignment with job description
+(Skills and experience are scored separately - do not score them.)
+"""
+
+# Score fields of the JSON answer, per scoring mode
+SCORE_FIELDS = {
+    "llm": ("job_title_match_score", "skills_score", "experience_score", "profile_description_match_score"),
+    "hybrid": ("job_title_match_score", "profile_description_match_score"),
+}
+
+
+# ============================================================================
+# DESCRIPTION BUILDERS
+# ============================================================================
+
+
+def prepare_job_description(job: Dict[str, Any]) -> str:
+    """Convert job dict to text description for AI"""
+    skills_text = ", ".join(job["required_skills"])
+    return f"""
+Job Title: {job["title"]}
+Department: {job["department"]}
+Required Experience: {job["experience_years"]} years
+Location: {job["location"]}
+Location Type: {job.get("location_type", "Remote")}
+Job Type: {job["job_type"]}
+Required Skills: {skills_text}
+Description: {job["description"]}
+"""
+
+
+def prepare_candidate_description(candidate: Dict[str, Any]) -> str:
+    """Convert candidate dict to text description for AI"""
+    return f"""
+Candidate Name: {candidate.get('name', 'N/A')}
+Skills: {candidate.get('skill_set', 'N/A')}
+Experience: {candidate.get('exp_years', 'N/A')} years
+Domain: {candidate.get('domain', 'N/A')}
+Previous Roles: {candidate.get('previous_roles', 'N/A')}
+Education: {candidate.get('education', 'N/A')}
+Current Location: {candidate.get('location', 'N/A')}
+Location Preference: {candidate.get('location_preference', 'Flexible')}
+Willing to Relocate: {candidate.get('willing_to_relocate', 'Unknown')}
+Work Authorization: {candidate.get('work_authorization', 'Not Specified')}
+"""
+
+
+def compute_skill_overlap(candidate: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+    """Local dictionary-based overlap between a candidate's skill_set and the job's required skills"""
+    return get_skill_matcher().overlap(candidate.get('skill_set'), job.get('required_skills', []))
+
+
+def match_prompt_version() -> str:
+    """
+    Version of everything a match result depends on besides its inputs
+
+    The skill dictionary feeds the overlap hint in the prompts and the local
+    skills score in hybrid mode, so its version is part of it.
+
+    Returns:
+        MATCH_PROMPT_VERSION plus the skill dictionary version
+    """
+    return f"{MATCH_PROMPT_VERSION}/skills-{get_skill_matcher().version}"
+
+
+def compute_experience_score(
+    candidate: Dict[str, Any],
+    job: Dict[str, Any],
+    rules_engine: MatchingRulesEngine,
+) -> Tuple[float, str]:
+    """
+    Score a candidate's years of experience against the job requirement
+
+    The rules' adjustments are offsets meant for an LLM score, so they are
+    mapped onto a full 0-100 scale: meeting the requirement is anchored below
+    the rules' "meets requirement" score by the "exceeds" bonus, so the bonus
+    (and the overqualified penalty) is never clipped away. Underqualified
+    candidates scale with the share of required years they have, capped by
+    the rules' penalty, so 0 years for a 10-year role scores 0.
+
+    Args:
+        candidate: Candidate dictionary (one resume bank row)
+        job: Job position dictionary
+        rules_engine: Rules engine providing the experience rules
+
+    Returns:
+        Tuple of (score 0-100, reasoning)
+    """
+    try:
+        candidate_years = float(candidate.get('exp_years'))
+        required_years = float(job.get('experience_years'))
+    except (TypeError, ValueError):
+        return 50.0, "Years of experience not specified"
+    if np.isnan(candidate_years) or np.isnan(required_years):
+        return 50.0, "Years of experience not specified"
+
+    adjustment, reasoning = rules_engine.get_experience_score_adjustment(
+        round(candidate_years), round(required_years)
+    )
+    experience_rules = rules_engine.rules["experience_rules"]
+    meets = experience_rules["meets_requirement"].get("score", 100) - max(
+        experience_rules["exceeds_requirement"].get("bonus", 0), 0
+    )
+
+    score = meets + adjustment
+    if adjustment < 0 and candidate_years < required_years and required_years > 0:
+        score = min(score, meets * max(candidate_years, 0) / required_years)
+    return float(np.clip(score, 0, 100)), reasoning
+
+
+def compute_local_components(
+    candidate: Dict[str, Any],
+    job: Dict[str, Any],
+    rules_engine: MatchingRulesEngine,
+    skill_overlap: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, float], str]:
+    """
+    Compute the skills and experience components without the LLM (hybrid mode)
+
+    Args:
+        candidate: Candidate dictionary (one resume bank row)
+        job: Job position dictionary
+        rules_engine: Rules engine providing the experience rules
+        skill_overlap: Precomputed compute_skill_overlap result, if available
+
+    Returns:
+        Tuple of (component scores for LOCAL_COMPONENTS, experience reasoning)
+    """
+    if skill_overlap is None:
+        skill_overlap = compute_skill_overlap(candidate, job)
+    experience_score, experience_reasoning = compute_experience_score(candidate, job, rules_engine)
+
+    # Jobs without required skills give no skills signal
+    has_required = skill_overlap["matched"] or skill_overlap["missing"]
+    return {
+        "skills": skill_overlap["score"] if has_required else 50.0,
+        "experience": experience_score,
+    }, experience_reasoning
+
+
+def _prompt_components(scoring_mode: str, indent: str) -> Tuple[str, str]:
+    """Component instructions and JSON score lines of the scoring prompts"""
+    if scoring_mode not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {scoring_mode}")
+    instructions = HYBRID_COMPONENT_INSTRUCTIONS if scoring_mode == "hybrid" else COMPONENT_INSTRUCTIONS
+    score_lines = "\n".join(f'{indent}"{field}": 0-100,' for field in SCORE_FIELDS[scoring_mode])
+    return instructions, score_lines
+
+
+def _skill_overlap_section(scoring_mode: str, skill_overlap: Dict[str, Any], heading: str) -> str:
+    """Skill overlap hint block (left out in hybrid mode, where skills are scored locally)"""
+    if scoring_mode == "hybrid":
+        return ""
+    return f"{heading}\n{format_skill_overlap_hint(skill_overlap)}\n"
+
+
+# ============================================================================
+# DEAL BREAKERS
+# ============================================================================
+
+
+def evaluate_deal_breakers(
+    candidate: Dict[str, Any],
+    job: Dict[str, Any],
+    rules_engine: Optional[MatchingRulesEngine] = None,
+) -> Dict[str, Any]:
+    """
+    Check location and work authorization deal breakers for one candidate
+
+    Args:
+        candidate: Candidate dictionary (one resume bank row)
+        job: Job position dictionary
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+
+    Returns:
+        Dictionary with exclusion flag/reason and location and work auth details
+    """
+    if rules_engine is None:
+        rules_engine = get_rules_engine()
+
+    exclusion_reason = None
+
+    # Check work authorization (DEAL BREAKER)
+    candidate_work_auth = candidate.get('work_authorization', 'Not Specified')
+    job_sponsorship = job.get('sponsorship_policy', 'full_sponsorship')
+
+    work_auth_passes = True
+    work_auth_reasoning = ""
+
+    if candidate_work_auth != 'Not Specified':
+        work_auth_passes, work_auth_reasoning = rules_engine.check_work_authorization(
+            candidate_work_auth, job_sponsorship
+        )
+        if not work_auth_passes:
+            exclusion_reason = "work_authorization"
+
+    # Check location compatibility (DEAL BREAKER)
+    job_location = job.get('location_type', 'Remote')
+    candidate_pref = candidate.get('location_preference', 'Flexible')
+    willing_relocate = str(candidate.get('willing_to_relocate', 'No')).lower() in ['yes', 'true', '1']
+
+    location_score, location_reasoning, location_passes = rules_engine.get_location_compatibility_score(
+        job_location, candidate_pref, willing_relocate
+    )
+
+    if not location_passes and not exclusion_reason:
+        exclusion_reason = "location_mismatch"
+
+    return {
+        "excluded": exclusion_reason is not None,
+        "exclusion_reason": exclusion_reason,
+        "location_score": location_score,
+        "location_reasoning": location_reasoning,
+        "location_passes": location_passes,
+        "work_auth_passes": work_auth_passes,
+        "work_auth_reasoning": work_auth_reasoning
+    }
+
+
+def deal_breaker_only_result(deal_breakers: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a match result for a candidate excluded before any LLM call
+
+    Args:
+        deal_breakers: Result of evaluate_deal_breakers for the candidate
+
+    Returns:
+        Match result dictionary without component scores
+    """
+    if deal_breakers["exclusion_reason"] == "work_authorization":
+        reasoning = deal_breakers["work_auth_reasoning"]
+    else:
+        reasoning = deal_breakers["location_reasoning"]
+
+    return {
+        "match_score": 0,
+        "score_without_deal_breakers": None,
+        "component_scores": {},
+        "recommendation": "NOT RECOMMENDED",
+        "strengths": [],
+        "gaps": [],
+        "reasoning": f"Excluded by deal breaker: {reasoning}",
+        "deal_breaker_only": True,
+        **deal_breakers
+    }
+
+
+def not_shortlisted_result(deal_breakers: Dict[str, Any], lexical_score: float) -> Dict[str, Any]:
+    """
+    Build a match result for a candidate dropped by the lexical retrieval stage
+
+    Args:
+        deal_breakers: Deal breaker details for the candidate
+        lexical_score: BM25 score of the candidate for the job
+
+    Returns:
+        Match result dictionary without component scores
+    """
+    return {
+        "match_score": 0,
+        "score_without_deal_breakers": None,
+        "component_scores": {},
+        "recommendation": "NOT RECOMMENDED",
+        "strengths": [],
+        "gaps": [],
+        "reasoning": "Not shortlisted: low keyword overlap with the job's required skills",
+        "deal_breaker_only": False,
+        "shortlisted": False,
+        "lexical_score": round(lexical_score, 2),
+        **deal_breakers
+    }
+
+
+# ============================================================================
+# MATCHING
+# ============================================================================
+
+
+def match_candidate_to_job_simple(
+    llm: BaseChatModel,
+    candidate: Dict[str, Any],
+    job: Dict[str, Any],
+    rules_engine: Optional[MatchingRulesEngine] = None,
+    deal_breakers: Optional[Dict[str, Any]] = None,
+    candidate_description: Optional[str] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+) -> Dict[str, Any]:
+    """
+    Enhanced matching with deal-breaker filtering and weighted scoring
+
+    NEW ALGORITHM (v2.0):
+    - Job Title Match
+    - Skills Match
+    - Experience
+    - Profile Description Match
+
+    The LLM only scores the components. Weights and recommendation bands from
+    the matching rules are applied locally (see rescore_results), so changing
+    them never requires a new LLM call. In hybrid scoring mode the skills and
+    experience components are computed locally (see compute_local_components)
+    and the LLM only scores job title and profile description match.
+
+    DEAL BREAKERS (must pass or excluded):
+    - Location compatibility
+    - Work authorization
+
+    Args:
+        llm: Language model instance
+        candidate: Candidate dictionary (one resume bank row)
+        job: Job position dictionary
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+        deal_breakers: Precomputed result of evaluate_deal_breakers, if available
+        candidate_description: Prerendered prepare_candidate_description output, if available
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+
+    Returns:
+        Match result dictionary with scores and deal-breaker info
+    """
+    if rules_engine is None:
+        rules_engine = get_rules_engine()
+    if candidate_description is None:
+        candidate_description = prepare_candidate_description(candidate)
+
+    # STEP 1: Check Deal Breakers (skipped when the bank was pre-filtered)
+    if deal_breakers is None:
+        deal_breakers = evaluate_deal_breakers(candidate, job, rules_engine)
+
+    # STEP 2: Ask AI to score components, with the local skill overlap as a hint
+    skill_overlap = compute_skill_overlap(candidate, job)
+    messages = build_cached_messages(
+        None,
+        prepare_match_prefix(job, scoring_mode),
+        prepare_match_prompt(candidate, job, candidate_description, scoring_mode, skill_overlap),
+        supports_prompt_caching(llm),
+    )
+    response = invoke_with_limit(llm, messages, call_site="match")
+
+    try:
+        ai_result = json.loads(response.content)
+        result = build_match_result(
+            ai_result, rules_engine, deal_breakers,
+            _local_components_for(scoring_mode, candidate, job, rules_engine, skill_overlap),
+        )
+        result["skill_overlap"] = skill_overlap
+        return result
+    except Exception as e:
+        logger.error(f"Matching error for {candidate.get('name', 'Unknown')}: {e}")
+        return match_error_result(e)
+
+
+def prepare_match_prefix(job: Dict[str, Any], scoring_mode: str = DEFAULT_SCORING_MODE) -> str:
+    """
+    Build the static part of the single-candidate scoring prompt
+
+    It only depends on the job and scoring mode, so it is byte-identical for
+    every candidate scored against the job and can be cached by the provider.
+
+    Args:
+        job: Job position dictionary
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+
+    Returns:
+        Prompt prefix (instructions, job block and answer format)
+    """
+    instructions, score_lines = _prompt_components(scoring_mode, "  ")
+    return f"""
+You are an expert recruiter. Score the candidate at the end of this message against the job.
+
+JOB:
+{prepare_job_description(job)}
+
+Score these components (0-100 each):
+{instructions}
+Return ONLY valid JSON:
+{{
+{score_lines}
+  "strengths": ["strength1", "strength2", "strength3"],
+  "gaps": ["gap1", "gap2"],
+  "reasoning": "Brief explanation"
+}}
+
+"""
+
+
+def prepare_match_prompt(
+    candidate: Dict[str, Any],
+    job: Dict[str, Any],
+    candidate_description: Optional[str] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+    skill_overlap: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build the per-candidate part of the scoring prompt (sent after prepare_match_prefix)
+
+    Args:
+        candidate: Candidate dictionary (one resume bank row)
+        job: Job position dictionary
+        candidate_description: Prerendered prepare_candidate_description output, if available
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+        skill_overlap: Precomputed compute_skill_overlap output, if available
+
+    Returns:
+        Prompt text
+    """
+    if candidate_description is None:
+        candidate_description = prepare_candidate_description(candidate)
+    if skill_overlap is None:
+        skill_overlap = compute_skill_overlap(candidate, job)
+
+    overlap_section = _skill_overlap_section(
+        scoring_mode, skill_overlap, "PRECOMPUTED SKILL OVERLAP (dictionary match - use as a hint for SKILLS MATCH):"
+    )
+    return f"""CANDIDATE:
+{candidate_description}
+{overlap_section}"""
+
+
+def _local_components_for(
+    scoring_mode: str,
+    candidate: Dict[str, Any],
+    job: Dict[str, Any],
+    rules_engine: MatchingRulesEngine,
+    skill_overlap: Optional[Dict[str, Any]] = None,
+) -> Optional[Tuple[Dict[str, float], str]]:
+    """Local components in hybrid mode, None when the LLM scores everything"""
+    if scoring_mode != "hybrid":
+        return None
+    return compute_local_components(candidate, job, rules_engine, skill_overlap)
+
+
+def build_match_result(
+    ai_result: Dict[str, Any],
+    rules_engine: MatchingRulesEngine,
+    deal_breakers: Dict[str, Any],
+    local_components: Optional[Tuple[Dict[str, float], str]] = None,
+) -> Dict[str, Any]:
+    """
+    Turn the LLM's component scores for one candidate into a match result
+
+    Args:
+        ai_result: Parsed LLM output for the candidate
+        rules_engine: Rules engine providing weights and recommendation bands
+        deal_breakers: Deal breaker details for the candidate
+        local_components: compute_local_components output replacing the LLM's
+            skills and experience scores (hybrid mode)
+
+    Returns:
+        Match result dictionary with scores and deal-breaker info
+    """
+    analysis = {
+        "component_scores": {
+            "job_title_match": ai_result.get("job_title_match_score", 50),
+            "skills": ai_result.get("skills_score", 50),
+            "experience": ai_result.get("experience_score", 50),
+            "profile_description_match": ai_result.get("profile_description_match_score", 50)
+        },
+        "strengths": ai_result.get("strengths", []),
+        "gaps": ai_result.get("gaps", []),
+        "reasoning": ai_result.get("reasoning", ""),
+    }
+    return score_analysis(analysis, rules_engine, deal_breakers, local_components)
+
+
+def score_analysis(
+    analysis: Dict[str, Any],
+    rules_engine: MatchingRulesEngine,
+    deal_breakers: Dict[str, Any],
+    local_components: Optional[Tuple[Dict[str, float], str]] = None,
+) -> Dict[str, Any]:
+    """
+    Build a match result from the LLM analysis fields (see ANALYSIS_FIELDS)
+
+    Args:
+        analysis: Component scores, strengths, gaps and reasoning
+        rules_engine: Rules engine providing weights and recommendation bands
+        deal_breakers: Deal breaker details for the candidate
+        local_components: compute_local_components output overriding the
+            skills and experience scores (hybrid mode)
+
+    Returns:
+        Match result dictionary with scores and deal-breaker info
+    """
+    component_scores = dict(analysis["component_scores"])
+    if local_components is not None:
+        component_scores.update(local_components[0])
+
+    result = {
+        "match_score": None,
+        "score_without_deal_breakers": None,
+        "component_scores": component_scores,
+        "recommendation": None,
+        "strengths": analysis.get("strengths", []),
+        "gaps": analysis.get("gaps", []),
+        "reasoning": analysis.get("reasoning", ""),
+        "deal_breaker_only": False,
+        # Deal breaker info
+        **deal_breakers
+    }
+    if local_components is not None:
+        result["scoring_mode"] = "hybrid"
+        result["experience_reasoning"] = local_components[1]
+    rescore_results([result], rules_engine)
+    return result
+
+
+def rescore_results(
+    results: List[Dict[str, Any]],
+    rules_engine: Optional[MatchingRulesEngine] = None,
+) -> int:
+    """
+    Recompute weighted scores and recommendations from stored component scores
+
+    Runs as one matrix product over all results, so re-ranking thousands of
+    results after a weight change takes milliseconds and no LLM calls.
+    Results without component scores (deal-breaker-only, not shortlisted,
+    parse failures) are left untouched.
+
+    Args:
+        results: Match result dictionaries, updated in place
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+
+    Returns:
+        Number of results rescored
+    """
+    if rules_engine is None:
+        rules_engine = get_rules_engine()
+
+    scored = [result for result in results if result.get("component_scores")]
+    if not scored:
+        return 0
+
+    component_matrix = np.array(
+        [[result["component_scores"].get(key, 50) for key in COMPONENT_KEYS] for result in scored],
+        dtype=np.float64,
+    )
+    overall_scores = rules_engine.calculate_weighted_scores_bulk(component_matrix)
+    recommendations = rules_engine.get_recommendations_bulk(overall_scores)
+
+    # "Potential" score - shows skills-based match even if deal breakers fail
+    for result, score, recommendation in zip(scored, overall_scores.tolist(), recommendations):
+        result["match_score"] = round(score, 1)
+        result["score_without_deal_breakers"] = round(score, 1)
+        result["recommendation"] = recommendation
+
+    return len(scored)
+
+
+def match_error_result(error: Exception) -> Dict[str, Any]:
+    """
+    Build the placeholder result used when the LLM response cannot be parsed
+
+    Args:
+        error: Parsing error
+
+    Returns:
+        Match result dictionary flagged for manual review
+    """
+    return {
+        "match_score": 50,
+        "score_without_deal_breakers": 50,
+        "component_scores": {},
+        "recommendation": "REVIEW REQUIRED",
+        "strengths": ["Unable to parse AI response"],
+        "gaps": [],
+        "reasoning": f"Error: {str(error)}",
+        "deal_breaker_only": False,
+        "excluded": False,
+        "exclusion_reason": None,
+        "location_score": 50,
+        "location_reasoning": "Error",
+        "location_passes": True,
+        "work_auth_passes": True,
+        "work_auth_reasoning": "Error"
+    }
+
+
+# ============================================================================
+# BATCHED MATCHING
+# ============================================================================
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt fragment (about 4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def batch_size_for_budget(
+    job: Dict[str, Any],
+    candidate_descriptions: List[str],
+    token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = MAX_BATCH_SIZE,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+) -> int:
+    """
+    Number of candidates that fit in one batched prompt
+
+    The job block and instructions are paid once per prompt; every candidate
+    adds its description plus the JSON it gets back. The longest candidate is
+    used so no batch overshoots the budget.
+
+    Args:
+        job: Job position dictionary
+        candidate_descriptions: Rendered descriptions of the candidates that will be batched
+        token_budget: Prompt plus response tokens allowed per request
+        max_batch_size: Upper bound on candidates per request
+        scoring_mode: "llm" or "hybrid" (hybrid answers are shorter)
+
+    Returns:
+        Batch size (at least 1)
+    """
+    if not candidate_descriptions:
+        return 1
+
+    output_tokens = HYBRID_OUTPUT_TOKENS_PER_CANDIDATE if scoring_mode == "hybrid" else OUTPUT_TOKENS_PER_CANDIDATE
+    fixed = estimate_tokens(prepare_batch_prefix(job, scoring_mode)) + estimate_tokens(prepare_batch_prompt([], job))
+    per_candidate = max(
+        estimate_tokens(description) for description in candidate_descriptions
+    ) + output_tokens
+
+    return max(1, min(max_batch_size, (token_budget - fixed) // per_candidate))
+
+
+def prepare_batch_prefix(job: Dict[str, Any], scoring_mode: str = DEFAULT_SCORING_MODE) -> str:
+    """
+    Build the static part of the batched scoring prompt
+
+    Follows the layout of BATCH_MATCH_CANDIDATES_PROMPT (job block once,
+    answered as ranked_candidates) with the component scores of the
+    single-candidate prompt. It only depends on the job and scoring mode, so
+    every batch of the job shares it byte for byte and the provider can cache it.
+
+    Args:
+        job: Job position dictionary
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+
+    Returns:
+        Prompt prefix (instructions, job block and answer format)
+    """
+    instructions, score_lines = _prompt_components(scoring_mode, "      ")
+    return f"""
+You are an expert recruiter. Score each candidate listed at the end of this message against the job independently.
+
+JOB:
+{prepare_job_description(job)}
+
+Score these components (0-100 each) for EVERY candidate:
+{instructions}
+Return ONLY valid JSON with exactly one entry per candidate_id listed below:
+{{
+  "ranked_candidates": [
+    {{
+      "candidate_id": "c0",
+{score_lines}
+      "strengths": ["strength1", "strength2", "strength3"],
+      "gaps": ["gap1", "gap2"],
+      "reasoning": "Brief explanation"
+    }}
+  ]
+}}
+
+"""
+
+
+def prepare_batch_prompt(
+    candidates: List[Dict[str, Any]],
+    job: Dict[str, Any],
+    candidate_descriptions: Optional[List[str]] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+) -> str:
+    """
+    Build the per-batch part of the batched scoring prompt (sent after prepare_batch_prefix)
+
+    Candidates are labelled c0, c1, ... so answers can be matched back to them.
+
+    Args:
+        candidates: Candidate dictionaries in the batch
+        job: Job position dictionary
+        candidate_descriptions: Prerendered candidate descriptions, if available
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+
+    Returns:
+        Prompt text
+    """
+    if candidate_descriptions is None:
+        candidate_descriptions = [prepare_candidate_description(candidate) for candidate in candidates]
+
+    candidate_blocks = "\n".join(
+        f"[candidate_id: c{position}]{description}"
+        + _skill_overlap_section(
+            scoring_mode, compute_skill_overlap(candidate, job), "Skill Overlap (precomputed hint):"
+        )
+        for position, (candidate, description) in enumerate(zip(candidates, candidate_descriptions))
+    )
+
+    return f"""CANDIDATES:
+{candidate_blocks}
+"""
+
+
+def match_candidates_batch(
+    llm: BaseChatModel,
+    candidates: List[Dict[str, Any]],
+    job: Dict[str, Any],
+    rules_engine: Optional[MatchingRulesEngine] = None,
+    deal_breakers: Optional[List[Dict[str, Any]]] = None,
+    candidate_descriptions: Optional[List[str]] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+) -> List[Dict[str, Any]]:
+    """
+    Score several candidates against one job with a single LLM call
+
+    Every candidate id must come back in the response. Candidates missing
+    from an otherwise valid response are scored again in a new batch, and a
+    batch whose response cannot be parsed is split in half and retried. A
+    single candidate that still fails falls back to match_candidate_to_job_simple.
+
+    Args:
+        llm: Language model instance
+        candidates: Candidate dictionaries to score
+        job: Job position dictionary
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+        deal_breakers: Precomputed deal breaker details, one per candidate
+        candidate_descriptions: Prerendered candidate descriptions, one per candidate
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+
+    Returns:
+        List of match results in the same order as candidates
+    """
+    if rules_engine is None:
+        rules_engine = get_rules_engine()
+    if deal_breakers is None:
+        deal_breakers = [evaluate_deal_breakers(candidate, job, rules_engine) for candidate in candidates]
+    if candidate_descriptions is None:
+        candidate_descriptions = [prepare_candidate_description(candidate) for candidate in candidates]
+
+    if len(candidates) == 1:
+        return [match_candidate_to_job_simple(
+            llm, candidates[0], job, rules_engine, deal_breakers[0], candidate_descriptions[0], scoring_mode
+        )]
+
+    messages = build_cached_messages(
+        None,
+        prepare_batch_prefix(job, scoring_mode),
+        prepare_batch_prompt(candidates, job, candidate_descriptions, scoring_mode),
+        supports_prompt_caching(llm),
+    )
+    response = invoke_with_limit(llm, messages, call_site="batch_match")
+
+    try:
+        parsed = validate_json_response(response.content)
+        entries = merge_batch_responses([parsed]).get("ranked_candidates", [])
+    except (ValueError, AttributeError, TypeError) as e:
+        logger.warning(f"Unparseable batch of {len(candidates)} candidates, splitting: {e}")
+        half = len(candidates) // 2
+        return (
+            match_candidates_batch(
+                llm, candidates[:half], job, rules_engine, deal_breakers[:half],
+                candidate_descriptions[:half], scoring_mode,
+            )
+            + match_candidates_batch(
+                llm, candidates[half:], job, rules_engine, deal_breakers[half:],
+                candidate_descriptions[half:], scoring_mode,
+            )
+        )
+
+    answers = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            answers.setdefault(str(entry.get("candidate_id")), entry)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(candidates)
+    missing = []
+    for position in range(len(candidates)):
+        answer = answers.get(f"c{position}")
+        if answer is None:
+            missing.append(position)
+        else:
+            skill_overlap = compute_skill_overlap(candidates[position], job)
+            results[position] = build_match_result(
+                answer, rules_engine, deal_breakers[position],
+                _local_components_for(scoring_mode, candidates[position], job, rules_engine, skill_overlap),
+            )
+            results[position]["skill_overlap"] = skill_overlap
+
+    if missing:
+        logger.warning(f"Batch response omitted {len(missing)} of {len(candidates)} candidates")
+        if len(missing) == len(candidates):
+            # Nothing usable came back: treat like a parse failure
+            half = len(candidates) // 2
+            groups = [list(range(half)), list(range(half, len(candidates)))]
+        else:
+            groups = [missing]
+
+        for group in groups:
+            retried = match_candidates_batch(
+                llm,
+                [candidates[position] for position in group],
+                job,
+                rules_engine,
+                [deal_breakers[position] for position in group],
+                [candidate_descriptions[position] for position in group],
+                scoring_mode,
+            )
+            for position, result in zip(group, retried):
+                results[position] = result
+
+    return results
+
+
+# ============================================================================
+# RESUME BANK MATCHING
+# ============================================================================
+
+
+def _plan_job_matching(
+    resume_bank: pd.DataFrame,
+    candidates: List[Dict[str, Any]],
+    job: Dict[str, Any],
+    bulk: Dict[str, Any],
+    rules_engine: MatchingRulesEngine,
+    score_excluded: bool,
+    top_k: Optional[int],
+    min_lexical_score: float,
+    index: Optional[ResumeBankIndex],
+    cache: Optional[MatchResultCache],
+    cache_identity: Tuple[str, Optional[float]],
+    scoring_mode: str,
+    settle: Callable[[MatchOutcome], None],
+    representatives: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """
+    Settle every row of one job that needs no LLM call (stages 1-3), and
+    set duplicate rows aside to reuse their representative's score
+
+    Args:
+        resume_bank: Resume bank DataFrame
+        candidates: Resume bank rows as dictionaries
+        job: Job position dictionary
+        bulk: Result of evaluate_deal_breakers_bulk for this job
+        rules_engine: Rules engine to use
+        score_excluded: Also send excluded candidates to the LLM
+        top_k: Maximum number of candidates sent to the LLM (None for no limit)
+        min_lexical_score: Minimum BM25 score for a candidate to be shortlisted
+        index: Prebuilt lexical index over resume_bank (built on demand if None)
+        cache: Optional persistent match result cache
+        cache_identity: (model, temperature) of the LLM, part of every cache key
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+        settle: Called with each outcome settled without an LLM call
+        representatives: find_duplicates output; only the first row of each
+            cluster left to score is sent to the LLM
+
+    Returns:
+        Plan dictionary with the job, bulk deal breakers, outcomes so far,
+        rows still to score, lexical scores, cache keys, duplicates
+        (scored row -> rows that copy its analysis) and skipped (rows settled
+        without an LLM call, by reason)
+    """
+    total = len(candidates)
+    outcomes: List[Optional[MatchOutcome]] = [None] * total
+
+    def settled(row: int, result: Dict[str, Any]) -> None:
+        outcomes[row] = MatchOutcome(index=row, candidate=candidates[row], result=result, error=None)
+        settle(outcomes[row])
+
+    # STAGE 1: Settle deal breakers for the whole bank
+    skip = bulk["excluded"] if not score_excluded else np.zeros(total, dtype=bool)
+    to_score = np.flatnonzero(~skip).tolist()
+
+    for row in np.flatnonzero(skip).tolist():
+        settled(row, deal_breaker_only_result(rules_engine.get_deal_breaker_details(bulk, row)))
+
+    logger.info(
+        f"Deal-breaker pre-filter: {total - len(to_score)} of {total} candidates "
+        f"excluded without an LLM call"
+    )
+
+    # STAGE 2: Lexical retrieval - shortlist the best keyword matches
+    lexical_scores = {}
+    not_shortlisted = 0
+    if top_k is not None or min_lexical_score > 0:
+        if index is None:
+            index = ResumeBankIndex(resume_bank)
+
+        all_scores = index.score(job_query(job))
+        ranked = index.rank(all_scores, top_k=top_k, min_score=min_lexical_score, rows=to_score)
+        lexical_scores = dict(ranked)
+
+        for row in sorted(set(to_score) - set(lexical_scores)):
+            checks = rules_engine.get_deal_breaker_details(bulk, row)
+            settled(row, not_shortlisted_result(checks, float(all_scores[row])))
+            not_shortlisted += 1
+
+        # Best keyword matches are scored first
+        to_score = [row for row, _ in ranked]
+        logger.info(f"Lexical retrieval: shortlisted {len(to_score)} candidates for LLM scoring")
+
+    plan = {
+        "job": job,
+        "bulk": bulk,
+        "outcomes": outcomes,
+        "to_score": to_score,
+        "lexical_scores": lexical_scores,
+        "cache_keys": {},
+        "scoring_mode": scoring_mode,
+        "duplicates": {},
+        "skipped": {
+            "deal_breakers": int(skip.sum()),
+            "not_shortlisted": not_shortlisted,
+            "cached": 0,
+            "duplicates": 0,
+        },
+    }
+
+    # STAGE 3: Reuse cached results
+    if cache is not None:
+        model, temperature = cache_identity
+        cache_keys = {
+            row: make_match_key(candidates[row], job, f"{match_prompt_version()}/{scoring_mode}", model, temperature)
+            for row in to_score
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+
+        remaining = []
+        for row in to_score:
+            analysis = cached.get(cache_keys[row])
+            if analysis is None or not analysis.get("component_scores"):
+                remaining.append(row)
+                continue
+            # Weights, thresholds, deal breakers and local components use the current rules
+            checks = rules_engine.get_deal_breaker_details(bulk, row)
+            skill_overlap = compute_skill_overlap(candidates[row], job)
+            result = score_analysis(
+                analysis, rules_engine, checks,
+                _local_components_for(scoring_mode, candidates[row], job, rules_engine, skill_overlap),
+            )
+            result["skill_overlap"] = skill_overlap
+            result["cached"] = True
+            settled(row, _annotate_shortlist(plan, row, result))
+
+        logger.info(f"Match cache: {len(to_score) - len(remaining)} hits, {len(remaining)} misses")
+        plan["skipped"]["cached"] = len(to_score) - len(remaining)
+        plan["to_score"] = remaining
+        plan["cache_keys"] = cache_keys
+
+    # STAGE 3b: Score one row per duplicate cluster
+    if representatives is not None:
+        scored_row = {}
+        remaining = []
+        for row in plan["to_score"]:
+            first = scored_row.setdefault(int(representatives[row]), row)
+            if first == row:
+                remaining.append(row)
+            else:
+                plan["duplicates"].setdefault(first, []).append(row)
+
+        duplicate_count = len(plan["to_score"]) - len(remaining)
+        if duplicate_count:
+            logger.info(f"Duplicate detection: {duplicate_count} rows reuse another row's score")
+        plan["skipped"]["duplicates"] = duplicate_count
+        plan["to_score"] = remaining
+
+    return plan
+
+
+def _plan_jobs(
+    resume_bank: pd.DataFrame,
+    candidates: List[Dict[str, Any]],
+    jobs: List[Dict[str, Any]],
+    rules_engine: MatchingRulesEngine,
+    score_excluded: bool,
+    top_k: Optional[int],
+    min_lexical_score: float,
+    index: Optional[ResumeBankIndex],
+    cache: Optional[MatchResultCache],
+    cache_identity: Tuple[str, Optional[float]],
+    scoring_mode: str,
+    settle: Callable[[MatchOutcome], None],
+    representatives: Optional[np.ndarray] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Plan several jobs over one bank (see _plan_job_matching), evaluating deal
+    breakers once per distinct (location type, sponsorship policy) pair
+
+    Returns:
+        One plan per job
+    """
+    bulk_by_policy = {}
+    plans = []
+    for job in jobs:
+        policy_key = (job.get("location_type", "Remote"), job.get("sponsorship_policy", "full_sponsorship"))
+        if policy_key not in bulk_by_policy:
+            bulk_by_policy[policy_key] = rules_engine.evaluate_deal_breakers_bulk(resume_bank, job)
+
+        plans.append(_plan_job_matching(
+            resume_bank,
+            candidates,
+            job,
+            bulk_by_policy[policy_key],
+            rules_engine,
+            score_excluded,
+            top_k,
+            min_lexical_score,
+            index,
+            cache,
+            cache_identity,
+            scoring_mode,
+            settle,
+            representatives,
+        ))
+    return plans
+
+
+def _duplicate_result(
+    plan: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    scored_row: int,
+    row: int,
+    result: Dict[str, Any],
+    rules_engine: MatchingRulesEngine,
+) -> Dict[str, Any]:
+    """
+    Build the result of a duplicate row from its representative's result
+
+    The LLM analysis is shared; deal breakers, local components and the
+    weighted score are computed from the duplicate's own row.
+    """
+    job = plan["job"]
+    if not result.get("component_scores"):
+        duplicate = dict(result)
+    else:
+        checks = rules_engine.get_deal_breaker_details(plan["bulk"], row)
+        skill_overlap = compute_skill_overlap(candidates[row], job)
+        duplicate = score_analysis(
+            {field: result[field] for field in ANALYSIS_FIELDS},
+            rules_engine,
+            checks,
+            _local_components_for(plan["scoring_mode"], candidates[row], job, rules_engine, skill_overlap),
+        )
+        duplicate["skill_overlap"] = skill_overlap
+    duplicate["duplicate_of"] = candidates[scored_row].get('name', f"Row {scored_row + 1}")
+    return _annotate_shortlist(plan, row, duplicate)
+
+
+def _annotate_shortlist(plan: Dict[str, Any], row: int, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Mark a scored result with its lexical shortlist score, if retrieval ran"""
+    if row in plan["lexical_scores"]:
+        result["shortlisted"] = True
+        result["lexical_score"] = round(plan["lexical_scores"][row], 2)
+    return result
+
+
+def _plan_tasks(
+    plans: List[Dict[str, Any]],
+    candidates: List[Dict[str, Any]],
+    descriptions: Dict[int, str],
+    batch_token_budget: Optional[int],
+) -> List[Dict[str, Any]]:
+    """
+    Split the remaining rows of job plans into LLM requests
+
+    Args:
+        plans: Plans from _plan_job_matching
+        candidates: Resume bank rows as dictionaries
+        descriptions: Rendered candidate description of every row still to score
+        batch_token_budget: Tokens per batched request (None scores one candidate per request)
+
+    Returns:
+        List of tasks with a display name, plan index and rows (one request each)
+    """
+    tasks = []
+    for plan_index, plan in enumerate(plans):
+        rows = plan["to_score"]
+        if not rows:
+            continue
+        if batch_token_budget is None:
+            batch_size = 1
+        else:
+            batch_size = batch_size_for_budget(
+                plan["job"], [descriptions[row] for row in rows], batch_token_budget,
+                scoring_mode=plan["scoring_mode"],
+            )
+            logger.info(
+                f"Batched matching: {len(rows)} candidates for {plan['job'].get('title', 'job')} "
+                f"in requests of up to {batch_size}"
+            )
+        for chunk in chunk_list(rows, batch_size):
+            name = candidates[chunk[0]].get('name', 'Unknown') if len(chunk) == 1 else f"batch of {len(chunk)}"
+            tasks.append({"name": name, "plan": plan_index, "rows": chunk})
+    return tasks
+
+
+def _estimate_tasks(
+    tasks: List[Dict[str, Any]],
+    plans: List[Dict[str, Any]],
+    candidates: List[Dict[str, Any]],
+    descriptions: Dict[int, str],
+    model: str,
+    max_concurrency: int,
+    prompt_caching: bool = False,
+) -> RunEstimate:
+    """
+    Render the prompt of every task and project the run's tokens and cost
+
+    Args:
+        tasks: Output of _plan_tasks
+        plans: Plans the tasks belong to
+        candidates: Resume bank rows as dictionaries
+        descriptions: Rendered candidate description of every row still to score
+        model: Model name used for pricing
+        max_concurrency: Maximum number of LLM calls in flight
+        prompt_caching: Requests carry provider cache markers on their job prefix
+
+    Returns:
+        RunEstimate with one "matching" request per task and the plans' skipped rows
+    """
+    estimate = RunEstimate(model, max_concurrency, prompt_caching)
+    prefixes: Dict[Tuple[int, bool], Tuple[str, int]] = {}
+    for plan in plans:
+        for reason, count in plan["skipped"].items():
+            estimate.skip(reason, count)
+
+    for task in tasks:
+        plan = plans[task["plan"]]
+        rows = task["rows"]
+        batched = len(rows) > 1
+        if (task["plan"], batched) not in prefixes:
+            prefix = (prepare_batch_prefix if batched else prepare_match_prefix)(plan["job"], plan["scoring_mode"])
+            prefixes[(task["plan"], batched)] = (prefix, count_message_tokens([prefix]))
+        prefix, prefix_tokens = prefixes[(task["plan"], batched)]
+
+        if batched:
+            prompt = prepare_batch_prompt(
+                [candidates[row] for row in rows], plan["job"], [descriptions[row] for row in rows],
+                plan["scoring_mode"],
+            )
+        else:
+            prompt = prepare_match_prompt(
+                candidates[rows[0]], plan["job"], descriptions[rows[0]], plan["scoring_mode"]
+            )
+        per_candidate = (
+            HYBRID_OUTPUT_TOKENS_PER_CANDIDATE if plan["scoring_mode"] == "hybrid" else OUTPUT_TOKENS_PER_CANDIDATE
+        )
+        estimate.add_request(
+            "matching", prefix_tokens + count_tokens(prompt), per_candidate * len(rows), items=len(rows),
+            prefix=prefix, prefix_tokens=prefix_tokens,
+        )
+    return estimate
+
+
+def _score_plans(
+    llm: BaseChatModel,
+    plans: List[Dict[str, Any]],
+    candidates: List[Dict[str, Any]],
+    descriptions: Dict[int, str],
+    rules_engine: MatchingRulesEngine,
+    cache: Optional[MatchResultCache],
+    max_concurrency: int,
+    batch_token_budget: Optional[int],
+    on_scored: Callable[[int, MatchOutcome], None],
+    max_cost: Optional[float] = None,
+):
+    """
+    Score the remaining rows of one or more job plans in a single pool (stage 4)
+
+    Args:
+        llm: Language model instance
+        plans: Plans from _plan_job_matching; their outcomes are filled in
+        candidates: Resume bank rows as dictionaries
+        descriptions: Rendered candidate description of every row still to score
+        rules_engine: Rules engine to use
+        cache: Optional persistent match result cache
+        max_concurrency: Maximum number of LLM calls in flight
+        batch_token_budget: Tokens per batched request (None scores one candidate per request)
+        on_scored: Called in the calling thread with (plan_index, outcome) per scored row
+        max_cost: Hard cap in USD on the projected cost of the requests (None for no cap)
+
+    Raises:
+        BudgetExceededError: If the projected cost exceeds max_cost; nothing is sent to the LLM
+    """
+    tasks = _plan_tasks(plans, candidates, descriptions, batch_token_budget)
+
+    if max_cost is not None:
+        model, _ = describe_llm(llm)
+        estimate = _estimate_tasks(
+            tasks, plans, candidates, descriptions, model, max_concurrency, supports_prompt_caching(llm)
+        ).summary(max_cost)
+        logger.info(
+            f"Pre-flight estimate: {estimate['requests']} requests, {estimate['total_tokens']} tokens, "
+            f"${estimate['cost']:.2f} (cap ${max_cost:.2f})"
+        )
+        enforce_budget(estimate)
+
+    def score_task(task: Dict[str, Any]) -> Dict[str, Any]:
+        plan = plans[task["plan"]]
+        rows = task["rows"]
+        results = match_candidates_batch(
+            llm,
+            [candidates[row] for row in rows],
+            plan["job"],
+            rules_engine,
+            [rules_engine.get_deal_breaker_details(plan["bulk"], row) for row in rows],
+            [descriptions[row] for row in rows],
+            plan["scoring_mode"],
+        )
+        duplicates = []
+        for row, result in zip(rows, results):
+            for duplicate_row in plan["duplicates"].get(row, []):
+                duplicates.append((
+                    duplicate_row,
+                    _duplicate_result(plan, candidates, row, duplicate_row, result, rules_engine),
+                ))
+            _annotate_shortlist(plan, row, result)
+
+        # Parse failures come back without component scores and are not cached
+        if cache is not None:
+            for row, result in list(zip(rows, results)) + duplicates:
+                if result.get("component_scores"):
+                    cache.set(plan["cache_keys"][row], {field: result[field] for field in ANALYSIS_FIELDS})
+        return {"results": results, "duplicates": duplicates}
+
+    def collect(outcome: MatchOutcome, _: int, __: int) -> None:
+        task = outcome["candidate"]
+        plan = plans[task["plan"]]
+        if outcome["error"] is None:
+            finished = list(zip(task["rows"], outcome["result"]["results"])) + outcome["result"]["duplicates"]
+        else:
+            # Duplicates share their representative's failure
+            rows = task["rows"] + [row for scored in task["rows"] for row in plan["duplicates"].get(scored, [])]
+            finished = [(row, None) for row in rows]
+
+        for row, result in finished:
+            plan["outcomes"][row] = MatchOutcome(
+                index=row,
+                candidate=candidates[row],
+                result=result,
+                error=outcome["error"],
+            )
+            on_scored(task["plan"], plan["outcomes"][row])
+
+    engine = MatchingEngine(score_task, max_concurrency=max_concurrency)
+    engine.run(tasks, on_result=collect)
+
+
+def match_resume_bank(
+    llm: BaseChatModel,
+    resume_bank: pd.DataFrame,
+    job: Dict[str, Any],
+    score_excluded: bool = False,
+    top_k: Optional[int] = None,
+    min_lexical_score: float = 0.0,
+    index: Optional[ResumeBankIndex] = None,
+    cache: Optional[MatchResultCache] = None,
+    rules_engine: Optional[MatchingRulesEngine] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    batch_token_budget: Optional[int] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+    deduplicate: bool = False,
+    max_cost: Optional[float] = DEFAULT_MAX_RUN_COST,
+    on_result: Optional[Callable[[MatchOutcome, int, int], None]] = None,
+) -> List[MatchOutcome]:
+    """
+    Match a whole resume bank against one job
+
+    Deal breakers are settled for every candidate first in one vectorized pass
+    over the bank. Candidates excluded by
+    location or work authorization get a deal-breaker-only result without an
+    LLM call unless score_excluded is set, in which case they are still scored
+    so their "potential" score can be shown.
+
+    When top_k or min_lexical_score is set, the remaining candidates are ranked
+    with a BM25 index over skill_set, previous_roles and domain, and only the
+    shortlist is sent to the LLM.
+
+    With a cache, LLM analyses previously computed for the same candidate row,
+    job, prompt version, model and temperature are reused instead of re-scored.
+    Only the component scores are cached; weights and deal breakers are
+    applied with the current rules.
+
+    With batch_token_budget, candidates are packed into batched prompts sized
+    to that budget instead of one request per candidate.
+
+    In hybrid scoring_mode, skills and experience are computed locally and the
+    LLM only scores job title and profile description match.
+
+    Args:
+        llm: Language model instance
+        resume_bank: Resume bank DataFrame
+        job: Job position dictionary
+        score_excluded: Also send excluded candidates to the LLM
+        top_k: Maximum number of candidates sent to the LLM (None for no limit)
+        min_lexical_score: Minimum BM25 score for a candidate to be shortlisted
+        index: Prebuilt lexical index over resume_bank (built on demand if None)
+        cache: Optional persistent match result cache
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+        max_concurrency: Maximum number of LLM calls in flight
+        batch_token_budget: Tokens per batched request (None scores one candidate per request)
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+        deduplicate: Score one row per cluster of duplicate candidates (see
+            find_duplicates) and copy its analysis to the others
+        max_cost: Hard cap in USD on the projected cost of the LLM calls;
+            BudgetExceededError is raised before any call if it is exceeded
+            (None for no cap, default LLM_MAX_RUN_COST)
+        on_result: Optional progress callback (outcome, completed_count, total_count)
+
+    Returns:
+        List of outcomes in the same order as the resume bank rows
+    """
+    if rules_engine is None:
+        rules_engine = get_rules_engine()
+
+    candidates = resume_bank.to_dict('records')
+    total = len(candidates)
+    completed = 0
+
+    def progress(outcome: MatchOutcome) -> None:
+        nonlocal completed
+        completed += 1
+        if on_result is not None:
+            on_result(outcome, completed, total)
+
+    plan = _plan_job_matching(
+        resume_bank,
+        candidates,
+        job,
+        rules_engine.evaluate_deal_breakers_bulk(resume_bank, job),
+        rules_engine,
+        score_excluded,
+        top_k,
+        min_lexical_score,
+        index,
+        cache,
+        describe_llm(llm),
+        scoring_mode,
+        settle=progress,
+        representatives=find_duplicates(resume_bank) if deduplicate else None,
+    )
+
+    # STAGE 4: Score the remaining candidates concurrently
+    descriptions = {row: prepare_candidate_description(candidates[row]) for row in plan["to_score"]}
+    _score_plans(
+        llm,
+        [plan],
+        candidates,
+        descriptions,
+        rules_engine,
+        cache,
+        max_concurrency,
+        batch_token_budget,
+        on_scored=lambda _, outcome: progress(outcome),
+        max_cost=max_cost,
+    )
+
+    return plan["outcomes"]
+
+
+def match_resume_bank_to_jobs(
+    llm: BaseChatModel,
+    resume_bank: pd.DataFrame,
+    jobs: List[Dict[str, Any]],
+    score_excluded: bool = False,
+    top_k: Optional[int] = None,
+    min_lexical_score: float = 0.0,
+    index: Optional[ResumeBankIndex] = None,
+    cache: Optional[MatchResultCache] = None,
+    rules_engine: Optional[MatchingRulesEngine] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    batch_token_budget: Optional[int] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+    deduplicate: bool = False,
+    max_cost: Optional[float] = DEFAULT_MAX_RUN_COST,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> ScoreMatrix:
+    """
+    Match a whole resume bank against every job in one run
+
+    Per-candidate work is done once for all jobs: rows are converted and
+    their descriptions rendered once, deal breakers are evaluated once per
+    distinct (location type, sponsorship policy) pair, and a single lexical
+    index is shared. The LLM calls of all jobs go through one pool, so the
+    run is not held up by the slowest candidate of each job in turn.
+
+    Args:
+        llm: Language model instance
+        resume_bank: Resume bank DataFrame
+        jobs: Job position dictionaries
+        score_excluded: Also send excluded candidates to the LLM
+        top_k: Maximum number of candidates per job sent to the LLM (None for no limit)
+        min_lexical_score: Minimum BM25 score for a candidate to be shortlisted
+        index: Prebuilt lexical index over resume_bank (built on demand if None)
+        cache: Optional persistent match result cache
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+        max_concurrency: Maximum number of LLM calls in flight
+        batch_token_budget: Tokens per batched request (None scores one candidate per request)
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+        deduplicate: Score one row per cluster of duplicate candidates (see
+            find_duplicates) and copy its analysis to the others
+        max_cost: Hard cap in USD on the projected cost of the LLM calls;
+            BudgetExceededError is raised before any call if it is exceeded
+            (None for no cap, default LLM_MAX_RUN_COST)
+        on_progress: Optional progress callback (completed_count, total_count)
+            counting candidate-job pairs
+
+    Returns:
+        ScoreMatrix holding the outcomes of every candidate-job pair
+    """
+    if rules_engine is None:
+        rules_engine = get_rules_engine()
+
+    candidates = resume_bank.to_dict('records')
+    total = len(candidates) * len(jobs)
+    completed = 0
+
+    def progress(*_: Any) -> None:
+        nonlocal completed
+        completed += 1
+        if on_progress is not None:
+            on_progress(completed, total)
+
+    if index is None and (top_k is not None or min_lexical_score > 0):
+        index = ResumeBankIndex(resume_bank)
+
+    plans = _plan_jobs(
+        resume_bank,
+        candidates,
+        jobs,
+        rules_engine,
+        score_excluded,
+        top_k,
+        min_lexical_score,
+        index,
+        cache,
+        describe_llm(llm),
+        scoring_mode,
+        settle=progress,
+        representatives=find_duplicates(resume_bank) if deduplicate else None,
+    )
+
+    rows = sorted({row for plan in plans for row in plan["to_score"]})
+    descriptions = {row: prepare_candidate_description(candidates[row]) for row in rows}
+    logger.info(
+        f"Score matrix: {len(candidates)} candidates x {len(jobs)} jobs, "
+        f"{sum(len(plan['to_score']) for plan in plans)} pairs need LLM scoring"
+    )
+
+    _score_plans(
+        llm,
+        plans,
+        candidates,
+        descriptions,
+        rules_engine,
+        cache,
+        max_concurrency,
+        batch_token_budget,
+        on_scored=progress,
+        max_cost=max_cost,
+    )
+
+    return ScoreMatrix(jobs, candidates, [plan["outcomes"] for plan in plans])
+
+
+def estimate_resume_bank_matching(
+    llm: BaseChatModel,
+    resume_bank: pd.DataFrame,
+    jobs: List[Dict[str, Any]],
+    score_excluded: bool = False,
+    top_k: Optional[int] = None,
+    min_lexical_score: float = 0.0,
+    index: Optional[ResumeBankIndex] = None,
+    cache: Optional[MatchResultCache] = None,
+    rules_engine: Optional[MatchingRulesEngine] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    batch_token_budget: Optional[int] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+    deduplicate: bool = False,
+    max_cost: Optional[float] = DEFAULT_MAX_RUN_COST,
+) -> Dict[str, Any]:
+    """
+    Project the tokens, cost and duration of matching a resume bank, without any LLM call
+
+    Runs the same planning as match_resume_bank_to_jobs - deal breakers,
+    lexical shortlist, cache lookups, duplicate detection and batching - then
+    renders the prompt of every request that would be sent and counts its
+    tokens locally. Takes the same options, so the estimate matches the run.
+
+    Args:
+        llm: Language model instance (its model prices the run and keys the cache)
+        resume_bank: Resume bank DataFrame
+        jobs: Job position dictionaries
+        score_excluded: Also send excluded candidates to the LLM
+        top_k: Maximum number of candidates per job sent to the LLM (None for no limit)
+        min_lexical_score: Minimum BM25 score for a candidate to be shortlisted
+        index: Prebuilt lexical index over resume_bank (built on demand if None)
+        cache: Optional persistent match result cache
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+        max_concurrency: Maximum number of LLM calls in flight
+        batch_token_budget: Tokens per batched request (None scores one candidate per request)
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+        deduplicate: Score one row per cluster of duplicate candidates
+        max_cost: Hard cap in USD the estimate is checked against (None for no cap)
+
+    Returns:
+        RunEstimate summary (see RunEstimate.summary) plus candidates and jobs counts
+    """
+    if rules_engine is None:
+        rules_engine = get_rules_engine()
+
+    candidates = resume_bank.to_dict('records')
+    if index is None and (top_k is not None or min_lexical_score > 0):
+        index = ResumeBankIndex(resume_bank)
+
+    cache_identity = describe_llm(llm)
+    plans = _plan_jobs(
+        resume_bank,
+        candidates,
+        jobs,
+        rules_engine,
+        score_excluded,
+        top_k,
+        min_lexical_score,
+        index,
+        cache,
+        cache_identity,
+        scoring_mode,
+        settle=lambda _: None,
+        representatives=find_duplicates(resume_bank) if deduplicate else None,
+    )
+
+    rows = sorted({row for plan in plans for row in plan["to_score"]})
+    descriptions = {row: prepare_candidate_description(candidates[row]) for row in rows}
+    tasks = _plan_tasks(plans, candidates, descriptions, batch_token_budget)
+
+    estimate = _estimate_tasks(
+        tasks, plans, candidates, descriptions, cache_identity[0], max_concurrency, supports_prompt_caching(llm)
+    ).summary(max_cost)
+    estimate["candidates"] = len(candidates)
+    estimate["jobs"] = len(jobs)
+    logger.info(
+        f"Pre-flight estimate: {len(candidates)} candidates x {len(jobs)} jobs -> "
+        f"{estimate['requests']} requests, {estimate['total_tokens']} tokens, "
+        f"${estimate['cost']:.2f}, ~{estimate['seconds']:.0f}s"
+    )
+    return estimate
+
+
+def rematch_resume_bank(
+    llm: BaseChatModel,
+    resume_bank: pd.DataFrame,
+    job: Dict[str, Any],
+    previous_bank: pd.DataFrame,
+    previous_outcomes: List[MatchOutcome],
+    score_excluded: bool = False,
+    top_k: Optional[int] = None,
+    min_lexical_score: float = 0.0,
+    cache: Optional[MatchResultCache] = None,
+    rules_engine: Optional[MatchingRulesEngine] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    batch_token_budget: Optional[int] = None,
+    scoring_mode: str = DEFAULT_SCORING_MODE,
+    deduplicate: bool = False,
+    max_cost: Optional[float] = DEFAULT_MAX_RUN_COST,
+    on_result: Optional[Callable[[MatchOutcome, int, int], None]] = None,
+) -> List[MatchOutcome]:
+    """
+    Re-match a re-uploaded resume bank, scoring only what changed
+
+    Rows are matched to the previous upload by candidate identity and content
+    fingerprint. Unchanged rows keep their previous outcome, removed rows are
+    dropped, and only added, changed or previously failed rows go through
+    match_resume_bank. The top_k shortlist is applied to those rows only.
+    on_result is called for reused outcomes too, before any new scoring.
+
+    Args:
+        llm: Language model instance
+        resume_bank: Newly uploaded resume bank DataFrame
+        job: Job position dictionary
+        previous_bank: Resume bank the previous outcomes were computed for
+        previous_outcomes: Outcomes of the previous run, aligned with previous_bank
+        score_excluded: Also send excluded candidates to the LLM
+        top_k: Maximum number of changed candidates sent to the LLM
+        min_lexical_score: Minimum BM25 score for a candidate to be shortlisted
+        cache: Optional persistent match result cache
+        rules_engine: Rules engine to use. If None, uses the shared instance.
+        max_concurrency: Maximum number of LLM calls in flight
+        batch_token_budget: Tokens per batched request (None scores one candidate per request)
+        scoring_mode: "llm" or "hybrid" (see SCORING_MODES)
+        deduplicate: Score one row per cluster of duplicate candidates (see
+            find_duplicates) and copy its analysis to the others
+        max_cost: Hard cap in USD on the projected cost of the LLM calls;
+            BudgetExceededError is raised before any call if it is exceeded
+            (None for no cap, default LLM_MAX_RUN_COST)
+        on_result: Optional progress callback (outcome, completed_count, total_count)
+
+    Returns:
+        List of outcomes in the same order as the new resume bank rows
+    """
+    diff = diff_resume_banks(previous_bank, resume_bank)
+    candidates = resume_bank.to_dict('records')
+    total = len(candidates)
+    outcomes: List[Optional[MatchOutcome]] = [None] * total
+
+    rows = diff["added"] + diff["changed"]
+    for row, previous_row in diff["unchanged"].items():
+        previous = previous_outcomes[previous_row]
+        if previous is None or previous["error"] is not None:
+            rows.append(row)
+            continue
+        outcomes[row] = MatchOutcome(
+            index=row,
+            candidate=candidates[row],
+            result=previous["result"],
+            error=None,
+        )
+    rows.sort()
+
+    reused = total - len(rows)
+    logger.info(f"Incremental re-match: reusing {reused} results, scoring {len(rows)} rows")
+
+    if on_result is not None:
+        reused_outcomes = (outcome for outcome in outcomes if outcome is not None)
+        for completed, outcome in enumerate(reused_outcomes, start=1):
+            on_result(outcome, completed, total)
+
+    if not rows:
+        return outcomes
+
+    def collect(outcome: MatchOutcome, done: int, _: int) -> None:
+        row = rows[outcome["index"]]
+        outcome["index"] = row
+        if on_result is not None:
+            on_result(outcome, reused + done, total)
+
+    changed_outcomes = match_resume_bank(
+        llm,
+        resume_bank.iloc[rows].reset_index(drop=True),
+        job,
+        score_excluded=score_excluded,
+        top_k=top_k,
+        min_lexical_score=min_lexical_score,
+        cache=cache,
+        rules_engine=rules_engine,
+        max_concurrency=max_concurrency,
+        batch_token_budget=batch_token_budget,
+        scoring_mode=scoring_mode,
+        deduplicate=deduplicate,
+        max_cost=max_cost,
+        on_result=collect,
+    )
+
+    for position, outcome in enumerate(changed_outcomes):
+        row = rows[position]
+        outcome["index"] = row
+        outcome["candidate"] = candidates[row]
+        outcomes[row] = outcome
+
+    return outcomes
@@ -0,0 +1,385 @@
+"""
+Concurrency - Adaptive limit on in-flight LLM calls shared by every call site
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable, Tuple, TypeVar
+
+from .token_usage import get_token_usage_tracker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Window bounds and starting point (override with LLM_MIN/MAX/INITIAL_CONCURRENCY)
+MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "8"))
+
+# Multiplicative decrease on rate limiting and on latency or error degradation
+RATE_LIMIT_BACKOFF = 0.5
+DEGRADED_BACKOFF = 0.9
+
+# Calls are "healthy" while smoothed latency stays within this factor of the best seen
+LATENCY_TOLERANCE = 2.0
+
+# Smoothed error rate above which the window stops growing and shrinks
+MAX_ERROR_RATE = 0.2
+
+# Smoothing factor of the latency and error rate moving averages
+EWMA_ALPHA = 0.2
+
+# Pause after a rate limit without a retry-after header
+DEFAULT_RETRY_AFTER = 1.0
+
+# Attempts made by invoke_with_limit when the provider rate limits a call
+MAX_RATE_LIMIT_RETRIES = 4
+
+# HTTP statuses treated as rate limiting: 429 Too Many Requests, 529 Overloaded
+RATE_LIMIT_STATUSES = (429, 529)
+
+# Call site of calls that do not name one (latency baselines are kept per call site)
+DEFAULT_CALL_SITE = "default"
+
+_instance_lock = threading.Lock()
+
+
+def rate_limit_delay(error: BaseException) -> Optional[float]:
+    """
+    Recognize a provider rate limit error
+
+    Args:
+        error: Exception raised by an LLM call
+
+    Returns:
+        Seconds to wait before retrying (from retry-after, or DEFAULT_RETRY_AFTER),
+        or None if the error is not a rate limit
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status not in RATE_LIMIT_STATUSES and type(error).__name__ not in ("RateLimitError", "OverloadedError"):
+        return None
+
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the number of LLM calls in flight across all threads.
+
+    The window grows by about one slot per window of healthy completions
+    (additive increase) and is halved when the provider rate limits a call
+    (multiplicative decrease), so throughput settles just under the account's
+    quota without manual tuning. Rising latency or error rate shrinks the
+    window gently. Latency is compared with a baseline kept per call site, so
+    slow call types (e.g. batched matching) are not judged against fast ones.
+    A retry-after header pauses new calls until it expires. Decreases are
+    applied once per congestion event: calls started before the last decrease
+    do not shrink the window again.
+
+    Threads wait for a slot on a Condition and coroutines on futures of their
+    own event loop, both woken by release, so waiting coroutines hold no
+    thread and a cancelled waiter never ends up holding a slot.
+    """
+
+    def __init__(
+        self,
+        initial: int = INITIAL_CONCURRENCY,
+        min_window: int = MIN_CONCURRENCY,
+        max_window: int = MAX_CONCURRENCY,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            initial: Starting window
+            min_window: Smallest window
+            max_window: Largest window (also the thread pool size callers should use)
+        """
+        if not 1 <= min_window <= max_window:
+            raise ValueError("Concurrency bounds must satisfy 1 <= min_window <= max_window")
+
+        self.min_window = min_window
+        self.max_window = max_window
+        self._window = float(min(max(initial, min_window), max_window))
+
+        self._condition = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+
+        self._latency: Dict[str, float] = {}
+        self._best_latency: Dict[str, float] = {}
+        self._error_rate = 0.0
+
+        self.completed = 0
+        self.rate_limited = 0
+        self.failed = 0
+
+    @property
+    def window(self) -> float:
+        """Current window (number of calls allowed in flight)"""
+        return self._window
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently in flight"""
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """
+        Wait for a free slot
+
+        Returns:
+            Start time of the call (pass it back to release)
+        """
+        with self._condition:
+            while True:
+                pause = self._try_acquire()
+                if pause is None:
+                    return time.monotonic()
+                self._condition.wait(timeout=pause if pause > 0 else None)
+
+    async def aacquire(self) -> float:
+        """
+        Async version of acquire (waits on the event loop, not in a thread)
+
+        Returns:
+            Start time of the call (pass it back to release)
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                pause = self._try_acquire()
+                if pause is None:
+                    return time.monotonic()
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                # A cancelled task stops here, before it has taken a slot
+                await asyncio.wait({waiter}, timeout=pause if pause > 0 else None)
+            finally:
+                with self._condition:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def _try_acquire(self) -> Optional[float]:
+        """Take a slot if one is free; caller must hold the lock. Returns None or the pause left (0 if full)"""
+        pause = self._paused_until - time.monotonic()
+        if pause <= 0 and self._in_flight < int(self._window):
+            self._in_flight += 1
+            return None
+        return max(pause, 0.0)
+
+    def _notify(self):
+        """Wake every waiting thread and coroutine; caller must hold the lock"""
+        self._condition.notify_all()
+        for loop, waiter in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The waiter's event loop is closed
+                pass
+        self._async_waiters.clear()
+
+    def release(
+        self,
+        started: float,
+        error: Optional[BaseException] = None,
+        call_site: str = DEFAULT_CALL_SITE,
+    ) -> Optional[float]:
+        """
+        Free a slot and adapt the window to how the call went
+
+        Args:
+            started: Value returned by acquire
+            error: Exception raised by the call, if any
+            call_site: Kind of call (latency is compared with this call site's baseline)
+
+        Returns:
+            Retry delay if the call was rate limited, otherwise None
+        """
+        now = time.monotonic()
+        delay = rate_limit_delay(error) if isinstance(error, Exception) else None
+
+        with self._condition:
+            self._in_flight -= 1
+            previous = int(self._window)
+
+            if error is not None and not isinstance(error, Exception):
+                # Cancelled or interrupted: the call says nothing about the provider
+                pass
+            elif delay is not None:
+                self.rate_limited += 1
+                self._paused_until = max(self._paused_until, now + delay)
+                self._decrease(started, now, RATE_LIMIT_BACKOFF)
+            else:
+                failed = error is not None
+                self.completed += 1
+                self.failed += failed
+                self._error_rate += EWMA_ALPHA * (failed - self._error_rate)
+                if not failed:
+                    self._observe_latency(call_site, now - started)
+
+                if self._error_rate > MAX_ERROR_RATE or self._latency_degraded(call_site):
+                    self._decrease(started, now, DEGRADED_BACKOFF)
+                elif not failed:
+                    self._window = min(self.max_window, self._window + 1.0 / self._window)
+
+            if int(self._window) != previous:
+                logger.info(
+                    f"LLM concurrency window {previous} -> {int(self._window)} "
+                    f"({self._in_flight} in flight, {self.rate_limited} rate limited)"
+                )
+            self._notify()
+
+        return delay
+
+    def _observe_latency(self, call_site: str, latency: float):
+        """Update a call site's smoothed latency and best (baseline) latency seen"""
+        smoothed = self._latency.get(call_site)
+        smoothed = latency if smoothed is None else smoothed + EWMA_ALPHA * (latency - smoothed)
+        self._latency[call_site] = smoothed
+        # The baseline drifts up slowly so a permanently slower model is accepted
+        best = self._best_latency.get(call_site)
+        self._best_latency[call_site] = smoothed if best is None else min(best * 1.01, smoothed)
+
+    def _latency_degraded(self, call_site: str) -> bool:
+        if call_site not in self._latency:
+            return False
+        return self._latency[call_site] > LATENCY_TOLERANCE * self._best_latency[call_site]
+
+    def _decrease(self, started: float, now: float, factor: float):
+        """Shrink the window once per congestion event; caller must hold the lock"""
+        if started < self._last_decrease:
+            return
+        self._window = max(float(self.min_window), self._window * factor)
+        self._last_decrease = now
+
+    def call(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        max_retries: int = MAX_RATE_LIMIT_RETRIES,
+        call_site: str = DEFAULT_CALL_SITE,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run fn within a slot, retrying when the provider rate limits it
+
+        Args:
+            fn: Function making one LLM call
+            *args: Positional arguments for fn
+            max_retries: Retries allowed after rate limit errors
+            call_site: Kind of call (see release)
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Return value of fn
+        """
+        for attempt in range(max_retries + 1):
+            started = self.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                delay = self.release(started, e, call_site)
+                if delay is None or attempt == max_retries:
+                    raise
+                logger.warning(f"LLM call rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                continue
+            self.release(started, call_site=call_site)
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        max_retries: int = MAX_RATE_LIMIT_RETRIES,
+        call_site: str = DEFAULT_CALL_SITE,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Async version of call for coroutine functions
+
+        Args:
+            fn: Coroutine function making one LLM call
+            *args: Positional arguments for fn
+            max_retries: Retries allowed after rate limit errors
+            call_site: Kind of call (see release)
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Awaited return value of fn
+        """
+        for attempt in range(max_retries + 1):
+            started = await self.aacquire()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                # Includes cancellation, so the slot is always given back
+                delay = self.release(started, e, call_site)
+                if delay is None or attempt == max_retries:
+                    raise
+                logger.warning(f"LLM call rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                continue
+            self.release(started, call_site=call_site)
+            return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current limiter metrics
+
+        Returns:
+            Dictionary with window, in_flight, latency (smoothed seconds per
+            call site), error_rate, completed, failed and rate_limited counts
+        """
+        with self._condition:
+            return {
+                "window": round(self._window, 2),
+                "in_flight": self._in_flight,
+                "latency": {site: round(latency, 3) for site, latency in self._latency.items()},
+                "error_rate": round(self._error_rate, 3),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rate_limited": self.rate_limited,
+            }
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def get_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Get singleton instance of the LLM concurrency limiter"""
+    global _concurrency_limiter_instance
+
+    # Locked: worker threads may ask for the limiter at the same time
+    with _instance_lock:
+        if '_concurrency_limiter_instance' not in globals():
+            _concurrency_limiter_instance = AdaptiveConcurrencyLimiter()
+
+    return _concurrency_limiter_instance
+
+
+def invoke_with_limit(llm: Any, messages: Any, call_site: str = DEFAULT_CALL_SITE, **kwargs: Any) -> Any:
+    """llm.invoke(messages) through the shared concurrency limiter, recording token usage"""
+    response = get_concurrency_limiter().call(llm.invoke, messages, call_site=call_site, **kwargs)
+    get_token_usage_tracker().record(response)
+    return response
+
+
+async def ainvoke_with_limit(llm: Any, messages: Any, call_site: str = DEFAULT_CALL_SITE, **kwargs: Any) -> Any:
+    """await llm.ainvoke(messages) through the shared concurrency limiter, recording token usage"""
+    response = await get_concurrency_limiter().acall(llm.ainvoke, messages, call_site=call_site, **kwargs)
+    get_token_usage_tracker().record(response)
+    return response
@@ -0,0 +1,263 @@
+"""
+Cost Estimator - Pre-flight token, cost and duration estimates for bulk LLM runs
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from app.prompts.config import PRICING, estimate_cost
+from .concurrency import get_concurrency_limiter
+
+# Local tokenizer (falls back to about 4 characters per token)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Encoding used for every model. Exact for OpenAI models, within a few
+# percent for Anthropic and Google models.
+TOKENIZER_ENCODING = "cl100k_base"
+
+# Role and separator tokens added per chat message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Latency model of one request: fixed overhead plus output generation time
+REQUEST_OVERHEAD_SECONDS = float(os.getenv("LLM_REQUEST_OVERHEAD_SECONDS", "1.0"))
+OUTPUT_TOKENS_PER_SECOND = float(os.getenv("LLM_OUTPUT_TOKENS_PER_SECOND", "50"))
+
+# Shortest prefix the provider caches (shorter marked prefixes are sent uncached)
+MIN_CACHEABLE_TOKENS = 1024
+MIN_CACHEABLE_TOKENS_BY_MODEL = {"claude-3-haiku-20240307": 2048}
+
+# Hard cap on the projected cost of one bulk run in USD (unset = no cap)
+DEFAULT_MAX_RUN_COST = float(os.getenv("LLM_MAX_RUN_COST")) if os.getenv("LLM_MAX_RUN_COST") else None
+
+_encoding_lock = threading.Lock()
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when the projected cost or tokens of a run exceed its hard cap"""
+
+    def __init__(self, estimate: Dict[str, Any]):
+        self.estimate = estimate
+        super().__init__(
+            f"Projected run cost ${estimate['cost']:.2f} ({estimate['total_tokens']:,} tokens) "
+            f"exceeds the cap of ${estimate['max_cost']:.2f}"
+        )
+
+
+def _get_encoding() -> Optional[Any]:
+    """Get the shared tiktoken encoding, or None if it cannot be loaded"""
+    global _encoding_instance
+
+    with _encoding_lock:
+        if '_encoding_instance' not in globals():
+            _encoding_instance = None
+            if TIKTOKEN_AVAILABLE:
+                try:
+                    _encoding_instance = tiktoken.get_encoding(TOKENIZER_ENCODING)
+                except Exception as e:
+                    # The encoding file is downloaded on first use
+                    logger.warning(f"tiktoken encoding unavailable, estimating tokens from length: {e}")
+
+    return _encoding_instance
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a prompt locally
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Token count (tiktoken when available, otherwise about 4 characters per token)
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: Sequence[str]) -> int:
+    """
+    Count the input tokens of a chat request
+
+    Args:
+        messages: Content of every message sent
+
+    Returns:
+        Token count including per-message overhead
+    """
+    return sum(count_tokens(content) + MESSAGE_OVERHEAD_TOKENS for content in messages)
+
+
+class RunEstimate:
+    """
+    Projected tokens, cost and duration of a bulk run, built request by request.
+
+    Requests are grouped by stage (e.g. "matching", "parsing"). Work that will
+    not reach the LLM (deal breakers, cache hits, duplicates) is recorded with
+    skip so the summary shows where the savings come from. With prompt
+    caching, the first request of a static prefix long enough to be cached
+    is counted as writing it to the provider's prompt cache (priced above
+    plain input), and later requests as reading it.
+    """
+
+    def __init__(self, model: str, max_concurrency: int = 1, prompt_caching: bool = False):
+        """
+        Initialize an empty estimate
+
+        Args:
+            model: Model name used to price the run (see PRICING)
+            max_concurrency: Requests the run is allowed to keep in flight
+            prompt_caching: Requests carry provider cache markers (see supports_prompt_caching)
+        """
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.prompt_caching = prompt_caching
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.skipped: Dict[str, int] = {}
+        self._latencies: List[float] = []
+        self._prefixes: set = set()
+
+    def _stage(self, stage: str) -> Dict[str, Any]:
+        return self.stages.setdefault(
+            stage, {
+                "requests": 0, "items": 0, "input_tokens": 0,
+                "cached_input_tokens": 0, "cache_write_input_tokens": 0, "output_tokens": 0,
+            }
+        )
+
+    def _cached_tokens(self, prefix: Optional[str], prefix_tokens: int) -> Tuple[int, int]:
+        """
+        Prefix tokens read from and written to the prompt cache
+
+        Only prefixes long enough for the provider to cache count: the first
+        request of a prefix writes it, later requests read it.
+
+        Returns:
+            Tuple of (cache read tokens, cache write tokens)
+        """
+        if not self.prompt_caching or prefix is None:
+            return 0, 0
+        if prefix_tokens < MIN_CACHEABLE_TOKENS_BY_MODEL.get(self.model, MIN_CACHEABLE_TOKENS):
+            return 0, 0
+        if prefix in self._prefixes:
+            return prefix_tokens, 0
+        self._prefixes.add(prefix)
+        return 0, prefix_tokens
+
+    def add_request(
+        self,
+        stage: str,
+        input_tokens: int,
+        output_tokens: int,
+        items: int = 1,
+        prefix: Optional[str] = None,
+        prefix_tokens: int = 0,
+    ):
+        """
+        Record one LLM request
+
+        Args:
+            stage: Stage the request belongs to
+            input_tokens: Prompt tokens (see count_message_tokens)
+            output_tokens: Expected response tokens
+            items: Work items (e.g. candidates) answered by the request
+            prefix: Static prompt prefix of the request, if it is marked for caching
+            prefix_tokens: Tokens of the prefix (included in input_tokens)
+        """
+        totals = self._stage(stage)
+        totals["requests"] += 1
+        totals["items"] += items
+        cache_read, cache_write = self._cached_tokens(prefix, prefix_tokens)
+        totals["input_tokens"] += input_tokens
+        totals["cached_input_tokens"] += cache_read
+        totals["cache_write_input_tokens"] += cache_write
+        totals["output_tokens"] += output_tokens
+        self._latencies.append(REQUEST_OVERHEAD_SECONDS + output_tokens / OUTPUT_TOKENS_PER_SECOND)
+
+    def skip(self, reason: str, count: int):
+        """Record work items settled without an LLM call"""
+        if count:
+            self.skipped[reason] = self.skipped.get(reason, 0) + count
+
+    def summary(self, max_cost: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Totals of the run
+
+        Duration assumes requests run max_concurrency at a time, capped by the
+        current window of the shared concurrency limiter.
+
+        Args:
+            max_cost: Hard cap in USD to check the projection against (None for no cap)
+
+        Returns:
+            Dictionary with model, priced (False if the model has no PRICING
+            entry), requests, input/output/total tokens, cached_input_tokens
+            (prompt cache reads), cache_write_input_tokens (prompt cache
+            writes), cost, seconds,
+            concurrency, per-stage totals, skipped counts, cache_hit_rate,
+            max_cost and within_budget
+        """
+        input_tokens = sum(stage["input_tokens"] for stage in self.stages.values())
+        output_tokens = sum(stage["output_tokens"] for stage in self.stages.values())
+        cached_input_tokens = sum(stage["cached_input_tokens"] for stage in self.stages.values())
+        cache_write_input_tokens = sum(stage["cache_write_input_tokens"] for stage in self.stages.values())
+        requests = len(self._latencies)
+
+        concurrency = max(1, min(self.max_concurrency, int(get_concurrency_limiter().window)))
+        seconds = max(sum(self._latencies) / concurrency, max(self._latencies, default=0.0))
+
+        stages = {
+            name: dict(totals, cost=round(estimate_cost(
+                self.model, totals["input_tokens"], totals["output_tokens"],
+                totals["cached_input_tokens"], totals["cache_write_input_tokens"],
+            ), 4))
+            for name, totals in self.stages.items()
+        }
+        cost = estimate_cost(self.model, input_tokens, output_tokens, cached_input_tokens, cache_write_input_tokens)
+
+        items = sum(stage["items"] for stage in self.stages.values()) + sum(self.skipped.values())
+        cached = self.skipped.get("cached", 0)
+
+        return {
+            "model": self.model,
+            "priced": self.model in PRICING,
+            "requests": requests,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cached_input_tokens": cached_input_tokens,
+            "cache_write_input_tokens": cache_write_input_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "cost": round(cost, 4),
+            "seconds": round(seconds, 1),
+            "concurrency": concurrency,
+            "stages": stages,
+            "skipped": dict(self.skipped),
+            "cache_hit_rate": round(cached / items, 3) if items else 0.0,
+            "max_cost": max_cost,
+            "within_budget": max_cost is None or cost <= max_cost,
+        }
+
+
+def enforce_budget(estimate: Dict[str, Any]):
+    """
+    Stop a run whose projection is over its cap
+
+    Args:
+        estimate: RunEstimate.summary output
+
+    Raises:
+        BudgetExceededError: If the projected cost exceeds estimate["max_cost"]
+    """
+    if not estimate["within_budget"]:
+        raise BudgetExceededError(estimate)
+    if not estimate["priced"] and estimate["max_cost"] is not None:
+        logger.warning(f"No pricing for model {estimate['model']}: the cost cap cannot be enforced")
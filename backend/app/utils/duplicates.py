@@ -0,0 +1,264 @@
+"""
+Duplicates - Duplicate candidate detection in resume banks
+"""
+
+import re
+import zlib
+import logging
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Contact columns used as exact blocking keys (first present column of each group wins)
+EMAIL_COLUMNS = ("email", "email_address")
+PHONE_COLUMNS = ("phone", "phone_number", "mobile")
+
+# Free-text columns compared with MinHash
+DEFAULT_TEXT_COLUMNS = ("skill_set", "previous_roles")
+
+# MinHash signature length and LSH banding (bands * rows per band = permutations)
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+
+# Estimated Jaccard similarity needed for two rows to be merged
+NAME_MATCH_THRESHOLD = 0.5    # same normalized name
+TEXT_MATCH_THRESHOLD = 0.8    # compatible name found through LSH only
+
+# Phones are compared on their last digits (drops country codes and formatting)
+PHONE_DIGITS = 10
+MIN_PHONE_DIGITS = 7
+
+# Mersenne prime used by the MinHash permutations
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_HASH_MASK = np.uint64((1 << 32) - 1)
+
+# Rows hashed per vectorized MinHash step (bounds the permutation matrix size)
+_MINHASH_CHUNK_ROWS = 2048
+
+
+def normalize_name(name: Any) -> Optional[str]:
+    """Lowercase name with punctuation and repeated spaces removed, or None if missing"""
+    if not isinstance(name, str):
+        return None
+    normalized = " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+    return normalized or None
+
+
+def normalize_email(email: Any) -> Optional[str]:
+    """Lowercase, trimmed email address, or None if missing or malformed"""
+    if not isinstance(email, str) or "@" not in email:
+        return None
+    return email.strip().lower()
+
+
+def normalize_phone(phone: Any) -> Optional[str]:
+    """Last PHONE_DIGITS digits of a phone number, or None if it is too short"""
+    if phone is None or (isinstance(phone, float) and np.isnan(phone)):
+        return None
+    if isinstance(phone, float) and phone.is_integer():
+        phone = int(phone)
+    digits = re.sub(r"\D", "", str(phone))
+    if len(digits) < MIN_PHONE_DIGITS:
+        return None
+    return digits[-PHONE_DIGITS:]
+
+
+def name_key(normalized_name: Optional[str]) -> Optional[str]:
+    """First initial plus last name ("j smith" for "John A. Smith"), or None"""
+    if not normalized_name:
+        return None
+    parts = normalized_name.split()
+    return f"{parts[0][0]} {parts[-1]}"
+
+
+def minhash_signatures(
+    token_sets: Sequence[Sequence[str]],
+    num_perm: int = DEFAULT_NUM_PERM,
+    seed: int = 1,
+) -> np.ndarray:
+    """
+    Compute MinHash signatures of token sets
+
+    Args:
+        token_sets: Tokens of every row
+        num_perm: Signature length
+        seed: Seed of the random permutations
+
+    Returns:
+        (rows, num_perm) uint64 array. Rows without tokens get the maximum
+        value in every position, so they never look similar to anything.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+
+    empty = np.iinfo(np.uint64).max
+    signatures = np.full((len(token_sets), num_perm), empty, dtype=np.uint64)
+
+    for start in range(0, len(token_sets), _MINHASH_CHUNK_ROWS):
+        chunk = token_sets[start:start + _MINHASH_CHUNK_ROWS]
+        lengths = np.array([len(tokens) for tokens in chunk], dtype=np.int64)
+        if not lengths.any():
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for tokens in chunk for token in tokens),
+            dtype=np.uint64,
+            count=int(lengths.sum()),
+        )
+        # (a * h + b) mod p over every token, then the minimum per row
+        permuted = ((a * hashes + b) % _MERSENNE_PRIME) & _HASH_MASK
+        has_tokens = lengths > 0
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[has_tokens]
+        rows = start + np.flatnonzero(has_tokens)
+        signatures[rows] = np.minimum.reduceat(permuted, offsets, axis=1).T
+
+    return signatures
+
+
+class _UnionFind:
+    """Disjoint sets over row positions; the smallest row of a set is its root"""
+
+    def __init__(self, size: int):
+        self.parent = np.arange(size)
+
+    def find(self, row: int) -> int:
+        root = row
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[row] != root:
+            self.parent[row], row = root, self.parent[row]
+        return root
+
+    def union(self, first: int, second: int):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def _first_column(resume_bank: pd.DataFrame, columns: Sequence[str]) -> Optional[str]:
+    return next((column for column in columns if column in resume_bank.columns), None)
+
+
+def find_duplicates(
+    resume_bank: pd.DataFrame,
+    text_columns: Sequence[str] = DEFAULT_TEXT_COLUMNS,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_BANDS,
+    name_threshold: float = NAME_MATCH_THRESHOLD,
+    text_threshold: float = TEXT_MATCH_THRESHOLD,
+) -> np.ndarray:
+    """
+    Cluster resume bank rows that describe the same person
+
+    Rows are merged when they share a normalized email or phone number, when
+    they share a normalized name and their skill/role text is at least
+    name_threshold similar, or when LSH over the MinHash signatures of that
+    text finds them at least text_threshold similar and their names agree on
+    first initial and last name. Similarities are MinHash Jaccard estimates.
+
+    Args:
+        resume_bank: Resume bank DataFrame
+        text_columns: Free-text columns compared with MinHash
+        num_perm: MinHash signature length (must be divisible by bands)
+        bands: Number of LSH bands
+        name_threshold: Similarity needed for rows with the same name
+        text_threshold: Similarity needed for rows found through LSH
+
+    Returns:
+        Array giving, for every row, the position of its cluster's
+        representative (the first row of the cluster). Unique rows point at
+        themselves.
+    """
+    total = len(resume_bank)
+    clusters = _UnionFind(total)
+    if total < 2:
+        return clusters.parent.copy()
+
+    # Exact blocking keys
+    blocking = {}
+    email_column = _first_column(resume_bank, EMAIL_COLUMNS)
+    if email_column:
+        blocking["email"] = [normalize_email(value) for value in resume_bank[email_column].tolist()]
+    phone_column = _first_column(resume_bank, PHONE_COLUMNS)
+    if phone_column:
+        blocking["phone"] = [normalize_phone(value) for value in resume_bank[phone_column].tolist()]
+
+    for keys in blocking.values():
+        first_row = {}
+        for row, key in enumerate(keys):
+            if key is None:
+                continue
+            clusters.union(first_row.setdefault(key, row), row)
+
+    # Text similarity
+    present = [column for column in text_columns if column in resume_bank.columns]
+    token_sets = [
+        sorted(set(token for value in values for token in tokenize(value)))
+        for values in zip(*(resume_bank[column].tolist() for column in present))
+    ] if present else [[] for _ in range(total)]
+    signatures = minhash_signatures(token_sets, num_perm)
+
+    def similarity(first: int, second: int) -> float:
+        if not token_sets[first] or not token_sets[second]:
+            return 0.0
+        return float(np.mean(signatures[first] == signatures[second]))
+
+    # Plain lists: Series.map would turn missing keys into NaN
+    names = [normalize_name(value) for value in resume_bank["name"].tolist()] \
+        if "name" in resume_bank.columns else [None] * total
+
+    # Same normalized name with similar text
+    rows_by_name = defaultdict(list)
+    for row, name in enumerate(names):
+        if name is not None:
+            rows_by_name[name].append(row)
+    for rows in rows_by_name.values():
+        for row in rows[1:]:
+            if similarity(rows[0], row) >= name_threshold:
+                clusters.union(rows[0], row)
+
+    # LSH: rows sharing a band bucket and a name key are compared
+    name_keys = [name_key(name) for name in names]
+    rows_per_band = num_perm // bands
+    has_text = np.array([bool(tokens) for tokens in token_sets])
+    for band in range(bands):
+        band_signatures = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        buckets = defaultdict(list)
+        for row in np.flatnonzero(has_text).tolist():
+            if name_keys[row] is not None:
+                buckets[(band_signatures[row].tobytes(), name_keys[row])].append(row)
+        for rows in buckets.values():
+            for row in rows[1:]:
+                if clusters.find(row) != clusters.find(rows[0]) and similarity(rows[0], row) >= text_threshold:
+                    clusters.union(rows[0], row)
+
+    representatives = np.array([clusters.find(row) for row in range(total)])
+    duplicates = int((representatives != np.arange(total)).sum())
+    logger.info(
+        f"Duplicate detection: {duplicates} of {total} rows are duplicates "
+        f"({len(np.unique(representatives))} distinct candidates)"
+    )
+    return representatives
+
+
+def duplicate_groups(representatives: np.ndarray) -> Dict[int, List[int]]:
+    """
+    Group rows by representative
+
+    Args:
+        representatives: Output of find_duplicates
+
+    Returns:
+        Mapping of representative row -> its duplicate rows (clusters of one are left out)
+    """
+    groups = defaultdict(list)
+    for row, representative in enumerate(representatives.tolist()):
+        if row != representative:
+            groups[representative].append(row)
+    return dict(groups)
@@ -0,0 +1,238 @@
+"""
+Job Analysis Cache - Reuse analyzed job descriptions across resumes
+"""
+
+import os
+import re
+import copy
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, AsyncIterator
+
+from .match_cache import MatchResultCache
+
+logger = logging.getLogger(__name__)
+
+# Analyses kept in memory (one per distinct job description)
+DEFAULT_MAX_ENTRIES = 256
+
+# Also persist analyses in data/cache/job_analyses.db (survives restarts)
+DISK_CACHE_ENABLED = os.getenv("JOB_ANALYSIS_DISK_CACHE", "true").lower() in ("1", "true", "yes")
+
+_instance_lock = threading.Lock()
+
+
+def normalize_job_description(job_description: str) -> str:
+    """
+    Normalize a job description so formatting-only differences share a cache entry
+
+    Args:
+        job_description: Raw job description text
+
+    Returns:
+        Text with line endings unified and runs of whitespace collapsed
+    """
+    return re.sub(r"\s+", " ", job_description.replace("\r\n", "\n")).strip()
+
+
+def make_job_analysis_key(
+    job_description: str,
+    model: str,
+    temperature: Optional[float],
+    prompt_version: str,
+) -> str:
+    """
+    Build the cache key of one job analysis
+
+    Args:
+        job_description: Raw job description text
+        model: LLM model name
+        temperature: LLM temperature
+        prompt_version: Job analysis prompt version identifier
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        [normalize_job_description(job_description), model, temperature, prompt_version],
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JobAnalysisCache:
+    """
+    Two-tier cache of analyzed job descriptions.
+
+    An in-memory LRU serves repeated lookups within the process. An optional
+    SQLite tier (a MatchResultCache) keeps analyses across restarts. lock and
+    alock serialize work on one key, so resumes matched concurrently against
+    the same job wait for a single analysis instead of each making their own.
+    A key's lock only exists while someone holds or waits for it. aget and
+    aset run the SQLite tier in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_cache: Optional[MatchResultCache] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of analyses kept in memory
+            disk_cache: Optional persistent tier
+        """
+        self.max_entries = max_entries
+        self.disk_cache = disk_cache
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # key -> [lock, number of holders and waiters]
+        self._key_locks: Dict[str, List[Any]] = {}
+        # asyncio locks belong to one event loop, so they are kept per loop
+        self._async_key_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, List[Any]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an analysis
+
+        Args:
+            key: Key from make_job_analysis_key
+
+        Returns:
+            Copy of the cached analysis, or None
+        """
+        analysis = self._recall(key)
+        if analysis is None and self.disk_cache is not None:
+            analysis = self.disk_cache.get(key)
+            if analysis is not None:
+                self._remember(key, analysis)
+        return self._count(analysis)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Async version of get (the disk tier is read in a worker thread)"""
+        analysis = self._recall(key)
+        if analysis is None and self.disk_cache is not None:
+            analysis = await asyncio.to_thread(self.disk_cache.get, key)
+            if analysis is not None:
+                self._remember(key, analysis)
+        return self._count(analysis)
+
+    def _recall(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+            return analysis
+
+    def _count(self, analysis: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if analysis is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        # Callers store the analysis in their own state and may modify it
+        return copy.deepcopy(analysis)
+
+    def set(self, key: str, analysis: Dict[str, Any]):
+        """
+        Store an analysis
+
+        Args:
+            key: Key from make_job_analysis_key
+            analysis: Analyzed job (must be JSON serializable)
+        """
+        analysis = copy.deepcopy(analysis)
+        self._remember(key, analysis)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, analysis)
+
+    async def aset(self, key: str, analysis: Dict[str, Any]):
+        """Async version of set (the disk tier is written in a worker thread)"""
+        analysis = copy.deepcopy(analysis)
+        self._remember(key, analysis)
+        if self.disk_cache is not None:
+            await asyncio.to_thread(self.disk_cache.set, key, analysis)
+
+    def _remember(self, key: str, analysis: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Hold the per-key lock while checking the cache and analyzing on a miss"""
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+    @asynccontextmanager
+    async def alock(self, key: str) -> AsyncIterator[None]:
+        """Async version of lock for the event loop's coroutines"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_locks = self._async_key_locks.setdefault(loop, {})
+            entry = loop_locks.setdefault(key, [asyncio.Lock(), 0])
+            entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del loop_locks[key]
+                    if not loop_locks:
+                        del self._async_key_locks[loop]
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit statistics (for health checks)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "disk": self.disk_cache is not None,
+            }
+
+
+def get_job_analysis_cache() -> JobAnalysisCache:
+    """Get singleton instance of the job analysis cache"""
+    global _job_analysis_cache_instance
+
+    # Locked: parallel graph runs may ask for the cache at the same time
+    with _instance_lock:
+        if '_job_analysis_cache_instance' not in globals():
+            disk_cache = None
+            if DISK_CACHE_ENABLED:
+                try:
+                    disk_cache = MatchResultCache(
+                        Path(__file__).parent.parent.parent / "data" / "cache" / "job_analyses.db"
+                    )
+                except Exception as e:
+                    logger.warning(f"Job analysis disk cache unavailable, caching in memory only: {e}")
+            _job_analysis_cache_instance = JobAnalysisCache(disk_cache=disk_cache)
+
+    return _job_analysis_cache_instance
@@ -0,0 +1,177 @@
+"""
+Lexical Index - BM25 retrieval over resume bank text columns
+"""
+
+import re
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Resume bank columns indexed by default
+DEFAULT_INDEX_COLUMNS = ("skill_set", "previous_roles", "domain")
+
+# Keeps tech tokens such as "c++", "c#", "node.js" and ".net" intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]")
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Split free text into lowercase search tokens
+
+    Args:
+        text: Text to tokenize (non-strings and missing values give no tokens)
+
+    Returns:
+        List of tokens
+    """
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class ResumeBankIndex:
+    """
+    In-process BM25 inverted index over a resume bank DataFrame.
+
+    Postings are stored per term as NumPy arrays of row positions and term
+    frequencies, so scoring a query touches only the rows that contain one of
+    its terms and ranking is a single sort over the score vector.
+    """
+
+    def __init__(
+        self,
+        resume_bank: pd.DataFrame,
+        columns: Sequence[str] = DEFAULT_INDEX_COLUMNS,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        """
+        Build the index
+
+        Args:
+            resume_bank: Resume bank DataFrame
+            columns: Text columns to index (missing columns are skipped)
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.columns = [column for column in columns if column in resume_bank.columns]
+        self.num_docs = len(resume_bank)
+
+        doc_ids: Dict[str, List[int]] = defaultdict(list)
+        term_freqs: Dict[str, List[int]] = defaultdict(list)
+        doc_lengths = np.zeros(self.num_docs, dtype=np.float32)
+
+        texts = [resume_bank[column].tolist() for column in self.columns]
+        for row, values in enumerate(zip(*texts)):
+            tokens = [token for value in values for token in tokenize(value)]
+            doc_lengths[row] = len(tokens)
+            for term, count in Counter(tokens).items():
+                doc_ids[term].append(row)
+                term_freqs[term].append(count)
+
+        self.doc_lengths = doc_lengths
+        self.avg_doc_length = float(doc_lengths.mean()) if self.num_docs and doc_lengths.sum() else 1.0
+
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            term: (np.array(doc_ids[term], dtype=np.int32), np.array(term_freqs[term], dtype=np.float32))
+            for term in doc_ids
+        }
+
+        logger.info(
+            f"Built lexical index: {self.num_docs} candidates, {len(self.postings)} terms "
+            f"over {self.columns}"
+        )
+
+    def score(self, query: Sequence[str]) -> np.ndarray:
+        """
+        BM25 score of every row for a query
+
+        Args:
+            query: Query strings (e.g. required skills); each is tokenized
+
+        Returns:
+            Array of scores, one per resume bank row
+        """
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        length_norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / self.avg_doc_length)
+
+        terms = {token for text in query for token in tokenize(text)}
+        for term in terms:
+            if term not in self.postings:
+                continue
+            rows, tf = self.postings[term]
+            idf = np.log(1 + (self.num_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += idf * tf * (self.k1 + 1) / (tf + length_norm[rows])
+
+        return scores
+
+    def search(
+        self,
+        query: Sequence[str],
+        top_k: Optional[int] = None,
+        min_score: float = 0.0,
+        rows: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank resume bank rows for a query
+
+        Args:
+            query: Query strings (e.g. required skills)
+            top_k: Maximum number of rows to return (None for all)
+            min_score: Minimum BM25 score a row needs to be returned
+            rows: Optional row positions to restrict the search to
+
+        Returns:
+            List of (row_position, score) sorted by score descending, then row
+        """
+        return self.rank(self.score(query), top_k=top_k, min_score=min_score, rows=rows)
+
+    def rank(
+        self,
+        scores: np.ndarray,
+        top_k: Optional[int] = None,
+        min_score: float = 0.0,
+        rows: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank resume bank rows by precomputed scores
+
+        Args:
+            scores: Result of score() for a query
+            top_k: Maximum number of rows to return (None for all)
+            min_score: Minimum BM25 score a row needs to be returned
+            rows: Optional row positions to restrict the ranking to
+
+        Returns:
+            List of (row_position, score) sorted by score descending, then row
+        """
+        if rows is None:
+            rows = np.arange(self.num_docs)
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[scores[rows] >= min_score]
+
+        # Full sort keeps ties at the top_k boundary deterministic (lowest row wins)
+        order = np.lexsort((rows, -scores[rows]))
+        if top_k is not None:
+            order = order[:top_k]
+        return [(int(row), float(scores[row])) for row in rows[order]]
+
+
+def job_query(job: Dict[str, Any]) -> List[str]:
+    """
+    Build the lexical query for a job position
+
+    Args:
+        job: Job position dictionary
+
+    Returns:
+        Query strings (required skills plus the job title)
+    """
+    return list(job.get("required_skills", [])) + [job.get("title", "")]
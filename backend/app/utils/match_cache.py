@@ -0,0 +1,216 @@
+"""
+Match Result Cache - Disk-backed cache of candidate-job match results
+"""
+
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Job fields that identify a posting rather than describe it
+VOLATILE_JOB_FIELDS = ("id", "created_at")
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def describe_llm(llm: Any) -> Tuple[str, Optional[float]]:
+    """
+    Get the model name and temperature of a chat model
+
+    Args:
+        llm: LangChain chat model instance
+
+    Returns:
+        Tuple of (model_name, temperature)
+    """
+    model = getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__
+    return str(model), getattr(llm, "temperature", None)
+
+
+def make_match_key(
+    candidate: Dict[str, Any],
+    job: Dict[str, Any],
+    prompt_version: str,
+    model: str,
+    temperature: Optional[float],
+) -> str:
+    """
+    Build a stable cache key for one candidate-job match
+
+    Args:
+        candidate: Candidate dictionary (one resume bank row)
+        job: Job position dictionary
+        prompt_version: Scoring prompt version identifier
+        model: LLM model name
+        temperature: LLM temperature
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    job_content = {k: v for k, v in job.items() if k not in VOLATILE_JOB_FIELDS}
+    payload = json.dumps(
+        [candidate, job_content, prompt_version, model, temperature],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MatchResultCache:
+    """
+    SQLite-backed cache of LLM match analyses shared by every session in the process.
+
+    Entries expire after ttl_seconds and the least recently used entries are
+    evicted once the cache grows past max_entries.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            db_path: Path to the SQLite file. Defaults to data/cache/match_results.db
+            max_entries: Maximum number of cached results
+            ttl_seconds: Time to live of a cached result
+        """
+        if db_path is None:
+            db_path = Path(__file__).parent.parent.parent / "data" / "cache" / "match_results.db"
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS match_results (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_match_results_accessed ON match_results (accessed_at)"
+        )
+        self._conn.commit()
+
+        self._writes_since_evict = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several keys at once
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary of key -> cached result for the keys that were found
+        """
+        if not keys:
+            return {}
+
+        now = time.time()
+        cutoff = now - self.ttl_seconds
+        found = {}
+
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, result FROM match_results "
+                    f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                    (*chunk, cutoff),
+                ).fetchall()
+                found.update({key: json.loads(result) for key, result in rows})
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE match_results SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+        return found
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up one key
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached result or None
+        """
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result
+
+        Args:
+            key: Cache key
+            result: Match result dictionary (must be JSON serializable)
+        """
+        now = time.time()
+        payload = json.dumps(result, default=str)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO match_results (key, result, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._conn.commit()
+
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= 500:
+                self._evict()
+
+    def evict(self):
+        """Remove expired entries and trim the cache to max_entries"""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        """Eviction body; caller must hold the lock"""
+        self._writes_since_evict = 0
+        self._conn.execute(
+            "DELETE FROM match_results WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,),
+        )
+        self._conn.execute(
+            "DELETE FROM match_results WHERE key IN ("
+            "SELECT key FROM match_results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._conn.commit()
+
+    def clear(self):
+        """Remove every cached result"""
+        with self._lock:
+            self._conn.execute("DELETE FROM match_results")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM match_results").fetchone()[0]
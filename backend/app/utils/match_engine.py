@@ -0,0 +1,133 @@
+"""
+Matching Engine - Score resume bank candidates concurrently with a bounded
+number of in-flight LLM calls
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TypedDict, Dict, Any, List, Optional, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Default number of candidates scored at the same time (override with MATCH_MAX_CONCURRENCY)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("MATCH_MAX_CONCURRENCY", "8"))
+
+
+class MatchOutcome(TypedDict):
+    """Result of scoring one candidate"""
+
+    index: int
+    """Position of the candidate in the input sequence"""
+
+    candidate: Dict[str, Any]
+    """Candidate dictionary that was scored"""
+
+    result: Optional[Dict[str, Any]]
+    """Match result returned by the match function (None on failure)"""
+
+    error: Optional[str]
+    """Error message if scoring this candidate failed"""
+
+
+class MatchingEngine:
+    """
+    Runs a per-candidate match function over a resume bank using a thread pool.
+
+    LLM calls are I/O bound, so a small pool of worker threads keeps several
+    requests in flight while the Streamlit script thread only collects results.
+    Every candidate is isolated: an exception raised while scoring one row is
+    recorded on its outcome and never aborts the rest of the run.
+    """
+
+    def __init__(
+        self,
+        match_fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        """
+        Initialize the matching engine
+
+        Args:
+            match_fn: Function that scores a single candidate dict and returns a result dict
+            max_concurrency: Maximum number of candidates scored at the same time
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.match_fn = match_fn
+        self.max_concurrency = max_concurrency
+
+    def _score(self, index: int, candidate: Dict[str, Any]) -> MatchOutcome:
+        """Score one candidate, capturing any error on the outcome"""
+        try:
+            result = self.match_fn(candidate)
+            return MatchOutcome(index=index, candidate=candidate, result=result, error=None)
+        except Exception as e:
+            logger.error(f"Error matching {candidate.get('name', 'Unknown')}: {e}")
+            return MatchOutcome(index=index, candidate=candidate, result=None, error=str(e))
+
+    def run(
+        self,
+        candidates: Iterable[Dict[str, Any]],
+        on_result: Optional[Callable[[MatchOutcome, int, int], None]] = None,
+    ) -> List[MatchOutcome]:
+        """
+        Score all candidates
+
+        Args:
+            candidates: Candidate dictionaries to score
+            on_result: Optional callback invoked in the calling thread as each
+                candidate finishes, with (outcome, completed_count, total_count)
+
+        Returns:
+            List of outcomes in the same order as the input candidates
+        """
+        candidates = list(candidates)
+        total = len(candidates)
+        outcomes: List[Optional[MatchOutcome]] = [None] * total
+
+        if total == 0:
+            return []
+
+        workers = min(self.max_concurrency, total)
+        logger.info(f"Matching {total} candidates with up to {workers} in flight")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._score, index, candidate)
+                for index, candidate in enumerate(candidates)
+            ]
+
+            for completed, future in enumerate(as_completed(futures), start=1):
+                outcome = future.result()
+                outcomes[outcome["index"]] = outcome
+                if on_result is not None:
+                    on_result(outcome, completed, total)
+
+        failed = sum(1 for outcome in outcomes if outcome["error"] is not None)
+        logger.info(f"Matching finished: {total - failed} succeeded, {failed} failed")
+
+        return outcomes
+
+
+def run_matching(
+    candidates: Iterable[Dict[str, Any]],
+    match_fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    on_result: Optional[Callable[[MatchOutcome, int, int], None]] = None,
+) -> List[MatchOutcome]:
+    """
+    Convenience wrapper that scores candidates with a one-off MatchingEngine
+
+    Args:
+        candidates: Candidate dictionaries to score
+        match_fn: Function that scores a single candidate dict
+        max_concurrency: Maximum number of candidates scored at the same time
+        on_result: Optional progress callback (outcome, completed_count, total_count)
+
+    Returns:
+        List of outcomes in input order
+    """
+    engine = MatchingEngine(match_fn, max_concurrency=max_concurrency)
+    return engine.run(candidates, on_result=on_result)
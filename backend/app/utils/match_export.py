@@ -0,0 +1,331 @@
+"""
+Match Export - Streaming Excel, CSV and Parquet export of matching results
+"""
+
+import csv
+import re
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from .match_engine import MatchOutcome
+
+# Parquet export
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("xlsx", "csv", "parquet")
+
+EXPORT_MIME_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Rows buffered per Parquet row group / CSV write
+EXPORT_CHUNK_ROWS = 5000
+
+# Excel sheet name limits
+MAX_SHEET_TITLE = 31
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+# (header, type) of every exported column, in order. Types are used for the Parquet schema.
+EXPORT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("Job", "string"),
+    ("Name", "string"),
+    ("Match Score", "float"),
+    ("Score Without Deal Breakers", "float"),
+    ("Recommendation", "string"),
+    ("Job Title Match", "float"),
+    ("Skills", "float"),
+    ("Experience", "float"),
+    ("Profile Description Match", "float"),
+    ("Excluded", "bool"),
+    ("Exclusion Reason", "string"),
+    ("Location Passes", "bool"),
+    ("Work Auth Passes", "bool"),
+    ("Shortlisted", "bool"),
+    ("Lexical Score", "float"),
+    ("Duplicate Of", "string"),
+    ("Experience (Years)", "string"),
+    ("Domain", "string"),
+    ("Skills Matched", "string"),
+    ("Skills Missing", "string"),
+    ("Strengths", "string"),
+    ("Gaps", "string"),
+    ("Reasoning", "string"),
+)
+
+# Row pairs of (candidate, result)
+ExportRows = Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]
+
+_export_executor_lock = threading.Lock()
+
+
+def outcome_rows(outcomes: Iterable[Optional[MatchOutcome]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Export rows of a list of outcomes, skipping errors and unfinished rows"""
+    for outcome in outcomes:
+        if outcome is not None and outcome["result"] is not None:
+            yield outcome["candidate"], outcome["result"]
+
+
+def ranked_outcome_rows(
+    outcomes: Iterable[Optional[MatchOutcome]],
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Export rows of a list of outcomes, best match_score first
+
+    A generator: the rows are only collected and sorted when the export
+    consumes them, i.e. in the export thread rather than the caller's.
+    """
+    yield from sorted(outcome_rows(outcomes), key=lambda row: row[1].get("match_score", 0) or 0, reverse=True)
+
+
+def result_rows(results: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Export rows of match results that carry their candidate (as in the page's matching_results)"""
+    for result in results:
+        yield result.get("candidate", {}), result
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    return str(value)
+
+
+def export_record(job_title: str, candidate: Dict[str, Any], result: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Flatten one match result into an export row
+
+    Args:
+        job_title: Title of the job the result belongs to
+        candidate: Candidate dictionary (one resume bank row)
+        result: Match result dictionary
+
+    Returns:
+        Tuple of values in EXPORT_COLUMNS order
+    """
+    components = result.get("component_scores") or {}
+    overlap = result.get("skill_overlap") or {}
+    return (
+        job_title,
+        _text(candidate.get("name")),
+        result.get("match_score"),
+        result.get("score_without_deal_breakers"),
+        result.get("recommendation"),
+        components.get("job_title_match"),
+        components.get("skills"),
+        components.get("experience"),
+        components.get("profile_description_match"),
+        bool(result.get("excluded", False)),
+        result.get("exclusion_reason"),
+        bool(result.get("location_passes", True)),
+        bool(result.get("work_auth_passes", True)),
+        bool(result.get("shortlisted", True)),
+        result.get("lexical_score"),
+        result.get("duplicate_of"),
+        _text(candidate.get("exp_years")),
+        _text(candidate.get("domain")),
+        "; ".join(overlap.get("matched", [])),
+        "; ".join(overlap.get("missing", [])),
+        "; ".join(result.get("strengths", [])),
+        "; ".join(result.get("gaps", [])),
+        result.get("reasoning", ""),
+    )
+
+
+def _records(sheets: Sequence[Tuple[str, ExportRows]]) -> Iterator[Tuple[str, Iterator[Tuple[Any, ...]]]]:
+    for job_title, rows in sheets:
+        yield job_title, (export_record(job_title, candidate, result) for candidate, result in rows)
+
+
+def _sheet_title(job_title: str, used: set) -> str:
+    """Valid, unique Excel sheet name for a job"""
+    base = INVALID_SHEET_CHARS.sub(" ", job_title).strip() or "Job"
+    title = base[:MAX_SHEET_TITLE]
+    number = 2
+    while title.lower() in used:
+        suffix = f" ({number})"
+        title = base[:MAX_SHEET_TITLE - len(suffix)] + suffix
+        number += 1
+    used.add(title.lower())
+    return title
+
+
+def _write_xlsx(sheets: Sequence[Tuple[str, ExportRows]], path: Path) -> int:
+    # Write-only mode streams rows to disk instead of keeping every cell in memory
+    workbook = Workbook(write_only=True)
+    headers = [header for header, _ in EXPORT_COLUMNS]
+    used_titles: set = set()
+    count = 0
+    for job_title, records in _records(sheets):
+        sheet = workbook.create_sheet(_sheet_title(job_title, used_titles))
+        sheet.append(headers)
+        for record in records:
+            # Control characters (e.g. from LLM reasoning) are not allowed in worksheets
+            sheet.append([
+                ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
+                for value in record
+            ])
+            count += 1
+    if not used_titles:
+        workbook.create_sheet("Matching Results").append(headers)
+    workbook.save(path)
+    return count
+
+
+def _write_csv(sheets: Sequence[Tuple[str, ExportRows]], path: Path) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _ in EXPORT_COLUMNS])
+        for _, records in _records(sheets):
+            for record in records:
+                writer.writerow(record)
+                count += 1
+    return count
+
+
+def _write_parquet(sheets: Sequence[Tuple[str, ExportRows]], path: Path) -> int:
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet export")
+
+    types = {"string": pa.string(), "float": pa.float64(), "bool": pa.bool_()}
+    schema = pa.schema([(header, types[kind]) for header, kind in EXPORT_COLUMNS])
+    count = 0
+
+    def flush(writer: "pq.ParquetWriter", chunk: List[Tuple[Any, ...]]) -> None:
+        columns = list(zip(*chunk))
+        writer.write_batch(pa.record_batch(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema,
+        ))
+
+    with pq.ParquetWriter(path, schema) as writer:
+        chunk: List[Tuple[Any, ...]] = []
+        for _, records in _records(sheets):
+            for record in records:
+                chunk.append(record)
+                count += 1
+                if len(chunk) >= EXPORT_CHUNK_ROWS:
+                    flush(writer, chunk)
+                    chunk = []
+        if chunk:
+            flush(writer, chunk)
+    return count
+
+
+def export_results(
+    sheets: Sequence[Tuple[str, ExportRows]],
+    export_format: str = "xlsx",
+    path: Optional[Path] = None,
+) -> Path:
+    """
+    Stream matching results of one or more jobs to a file
+
+    Rows are flattened one at a time and written straight to disk, so memory
+    use does not grow with the number of results. Excel exports get one sheet
+    per job; CSV and Parquet exports are a single table with a Job column.
+
+    Args:
+        sheets: (job title, rows) pairs, where rows yields (candidate, result)
+            pairs - see outcome_rows and result_rows
+        export_format: One of EXPORT_FORMATS
+        path: Output file. If None, a temporary file is created (the caller
+            deletes it, see read_export)
+
+    Returns:
+        Path of the written file
+    """
+    writers = {"xlsx": _write_xlsx, "csv": _write_csv, "parquet": _write_parquet}
+    if export_format not in writers:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    temporary = path is None
+    if temporary:
+        handle = tempfile.NamedTemporaryFile(prefix="matches_", suffix=f".{export_format}", delete=False)
+        handle.close()
+        path = Path(handle.name)
+
+    try:
+        count = writers[export_format](sheets, Path(path))
+    except BaseException:
+        if temporary:
+            Path(path).unlink(missing_ok=True)
+        raise
+    logger.info(f"Exported {count} match results for {len(sheets)} job(s) to {path}")
+    return Path(path)
+
+
+def start_export(
+    sheets: Sequence[Tuple[str, ExportRows]],
+    export_format: str = "xlsx",
+    path: Optional[Path] = None,
+) -> "Future[Path]":
+    """
+    Run export_results in a background thread
+
+    Row iterables are consumed in that thread, so pass snapshots (e.g. lists
+    of results) rather than state the caller keeps mutating.
+
+    Args:
+        sheets: (job title, rows) pairs as for export_results
+        export_format: One of EXPORT_FORMATS
+        path: Output file. If None, a temporary file is created.
+
+    Returns:
+        Future resolving to the written file's path
+    """
+    return get_export_executor().submit(export_results, sheets, export_format, path)
+
+
+def read_export(future: "Future[Path]") -> bytes:
+    """
+    Read a finished temporary export and delete its file
+
+    Args:
+        future: Finished future returned by start_export without a path
+
+    Returns:
+        Contents of the exported file
+    """
+    path = future.result()
+    try:
+        return path.read_bytes()
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def discard_export(future: "Future[Path]"):
+    """Delete the temporary file of an export that will not be read, once it is written"""
+    def remove(done: "Future[Path]"):
+        if not done.cancelled() and done.exception() is None:
+            done.result().unlink(missing_ok=True)
+
+    future.add_done_callback(remove)
+
+
+def get_export_executor() -> ThreadPoolExecutor:
+    """Get singleton thread pool running background exports"""
+    global _export_executor_instance
+
+    # Locked: concurrent Streamlit sessions may start exports at the same time
+    with _export_executor_lock:
+        if '_export_executor_instance' not in globals():
+            _export_executor_instance = ThreadPoolExecutor(max_workers=2, thread_name_prefix="match-export")
+
+    return _export_executor_instance
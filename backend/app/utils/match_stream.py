@@ -0,0 +1,120 @@
+"""
+Match Stream - Running top-N and summary statistics while a matching run is in progress
+"""
+
+import heapq
+import itertools
+import logging
+from typing import Dict, Any, Iterable, List, Tuple
+
+from .match_engine import MatchOutcome
+
+logger = logging.getLogger(__name__)
+
+# Number of best matches kept while a run is streaming
+DEFAULT_TOP_N = 12
+
+
+def is_scored_match(result: Dict[str, Any]) -> bool:
+    """
+    Check whether a result counts as a match in the stats
+
+    Args:
+        result: Match result dictionary
+
+    Returns:
+        True if the result was AI scored, passed the deal breakers and was
+        shortlisted (deal-breaker and not-shortlisted rows score 0)
+    """
+    return bool(result.get("component_scores")) and not result.get("excluded") and result.get("shortlisted", True)
+
+
+def summarize_results(results: Iterable[Dict[str, Any]]) -> Tuple[int, float, int]:
+    """
+    Stats bar numbers of a finished run
+
+    Args:
+        results: Match results
+
+    Returns:
+        Tuple of (number of matches, their average match_score, number of excluded results)
+    """
+    matches, score_total, excluded = 0, 0.0, 0
+    for result in results:
+        if result.get("excluded"):
+            excluded += 1
+        elif is_scored_match(result):
+            matches += 1
+            score_total += result.get("match_score", 0) or 0
+    return matches, score_total / matches if matches else 0.0, excluded
+
+
+class MatchStream:
+    """
+    Incrementally tracks the best matches and the stats bar numbers.
+
+    Outcomes are fed in as they complete (in any order). The best top_n
+    compatible candidates are kept in a min-heap so each update is O(log N),
+    and the counts and average score are updated in O(1) - nothing is
+    re-sorted until the run finishes. Only scored matches (see
+    is_scored_match) count toward matches and the average; excluded rows are
+    counted separately.
+    """
+
+    def __init__(self, top_n: int = DEFAULT_TOP_N):
+        """
+        Initialize the stream
+
+        Args:
+            top_n: Number of best compatible matches to keep
+        """
+        self.top_n = top_n
+        self.completed = 0
+        self.errors = 0
+        self.excluded = 0
+        self.matches = 0
+        self.score_total = 0.0
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+
+    def add(self, outcome: MatchOutcome):
+        """
+        Record one finished outcome
+
+        Args:
+            outcome: Outcome passed to a match_resume_bank on_result callback
+        """
+        self.completed += 1
+        if outcome["error"] is not None:
+            self.errors += 1
+            return
+
+        result = outcome["result"]
+        if result.get("excluded"):
+            self.excluded += 1
+            return
+        if not is_scored_match(result):
+            return
+
+        self.matches += 1
+        self.score_total += result.get("match_score", 0) or 0
+
+        entry = (result["match_score"], -next(self._sequence), {**result, "candidate": outcome["candidate"]})
+        if len(self._heap) < self.top_n:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    @property
+    def average_score(self) -> float:
+        """Average match score of the scored matches so far"""
+        return self.score_total / self.matches if self.matches else 0.0
+
+    def top(self) -> List[Dict[str, Any]]:
+        """
+        Best compatible matches so far
+
+        Returns:
+            Match results (with their candidate attached), best first
+        """
+        return [result for _, _, result in sorted(self._heap, reverse=True)]
@@ -0,0 +1,457 @@
+"""
+Results Store - Server-wide store of resume bank matching runs shared across sessions
+"""
+
+import json
+import time
+import uuid
+import hashlib
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .match_cache import VOLATILE_JOB_FIELDS
+from .match_engine import MatchOutcome
+
+logger = logging.getLogger(__name__)
+
+# A running run whose writer has not reported progress for this long is
+# considered abandoned (e.g. the browser tab or process died) and can be claimed
+DEFAULT_LEASE_SECONDS = 300
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Expired runs are deleted by claim at most this often
+EVICT_INTERVAL_SECONDS = 60 * 60
+
+# Matching options that change how a run executes but not its results
+RUN_INDEPENDENT_OPTIONS = ("cache", "index", "max_concurrency", "max_cost", "on_result", "rules_engine")
+
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+ABANDONED = "abandoned"
+
+
+def make_run_key(
+    bank_id: str,
+    job: Dict[str, Any],
+    options: Dict[str, Any],
+    model: str,
+    temperature: Optional[float],
+    prompt_version: str,
+) -> str:
+    """
+    Build the key of one bank-against-job run
+
+    Args:
+        bank_id: Resume bank snapshot identifier (see ResumeBankStore.ingest)
+        job: Job position dictionary
+        options: match_resume_bank keyword options
+        model: LLM model name
+        temperature: LLM temperature
+        prompt_version: Scoring prompt version identifier
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    job_content = {k: v for k, v in job.items() if k not in VOLATILE_JOB_FIELDS}
+    run_options = {k: v for k, v in options.items() if k not in RUN_INDEPENDENT_OPTIONS}
+    payload = json.dumps(
+        [bank_id, job_content, run_options, model, temperature, prompt_version],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MatchRunStore:
+    """
+    SQLite-backed store of matching runs shared by every session and process.
+
+    Each run key has at most one writer: claim hands out an owner token and
+    only that owner can record outcomes. The writer records every outcome as
+    it finishes, so other sessions can follow an in-progress run or load a
+    finished one instead of paying for the same LLM calls again. Writers hold
+    the run's lease with hold, which renews it during stages that produce no
+    outcomes. SQLite's WAL mode lets readers proceed while the writer commits.
+    Expired runs are deleted by claim.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the store
+
+        Args:
+            db_path: Path to the SQLite file. Defaults to data/cache/match_runs.db
+            lease_seconds: Seconds without progress after which a running run is abandoned
+            ttl_seconds: Time to live of a stored run
+        """
+        if db_path is None:
+            db_path = Path(__file__).parent.parent.parent / "data" / "cache" / "match_runs.db"
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+        # Autocommit mode: claims open their own BEGIN IMMEDIATE transaction
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS match_runs (
+                run_key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                completed INTEGER NOT NULL,
+                metadata TEXT NOT NULL,
+                error TEXT,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS match_run_outcomes (
+                run_key TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                result TEXT,
+                error TEXT,
+                PRIMARY KEY (run_key, idx)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_match_run_outcomes_seq ON match_run_outcomes (run_key, seq)"
+        )
+
+    def _run_row(self, run_key: str) -> Optional[Tuple]:
+        return self._conn.execute(
+            "SELECT owner, status, total, completed, metadata, error, started_at, updated_at "
+            "FROM match_runs WHERE run_key = ?",
+            (run_key,),
+        ).fetchone()
+
+    def _status(self, status: str, updated_at: float, now: float) -> str:
+        if status == RUNNING and now - updated_at > self.lease_seconds:
+            return ABANDONED
+        return status
+
+    def get_run(self, run_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a run
+
+        Args:
+            run_key: Key from make_run_key
+
+        Returns:
+            Dictionary with status (running, complete, failed or abandoned),
+            total, completed, metadata, error, started_at and updated_at, or
+            None if the run is unknown or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._run_row(run_key)
+
+        if row is None or now - row[6] > self.ttl_seconds:
+            return None
+
+        owner, status, total, completed, metadata, error, started_at, updated_at = row
+        return {
+            "status": self._status(status, updated_at, now),
+            "total": total,
+            "completed": completed,
+            "metadata": json.loads(metadata),
+            "error": error,
+            "started_at": started_at,
+            "updated_at": updated_at,
+        }
+
+    def claim(
+        self,
+        run_key: str,
+        total: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        force: bool = False,
+    ) -> Optional[str]:
+        """
+        Become the single writer of a run
+
+        A run can be claimed if it is unknown, expired, failed or abandoned,
+        or if it is complete and force is set (a deliberate re-run). A run
+        that another writer is actively working on is never taken over.
+
+        Args:
+            run_key: Key from make_run_key
+            total: Number of outcomes the run will produce
+            metadata: JSON-serializable details readers need (e.g. the rules version)
+            force: Replace a complete run
+
+        Returns:
+            Owner token to pass to record, complete and fail, or None if the run is taken
+        """
+        owner = uuid.uuid4().hex
+        now = time.time()
+
+        if now - self._last_evict > EVICT_INTERVAL_SECONDS:
+            self._last_evict = now
+            self.evict()
+
+        with self._lock:
+            # BEGIN IMMEDIATE takes SQLite's write lock, so concurrent claims from
+            # any process are serialized and exactly one of them wins
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._run_row(run_key)
+                if row is not None and now - row[6] <= self.ttl_seconds:
+                    status = self._status(row[1], row[7], now)
+                    if status == RUNNING or (status == COMPLETE and not force):
+                        self._conn.execute("ROLLBACK")
+                        return None
+
+                self._conn.execute("DELETE FROM match_run_outcomes WHERE run_key = ?", (run_key,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO match_runs "
+                    "(run_key, owner, status, total, completed, metadata, error, started_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, 0, ?, NULL, ?, ?)",
+                    (run_key, owner, RUNNING, total, json.dumps(metadata or {}, default=str), now, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        logger.info(f"Claimed match run {run_key[:12]} ({total} candidates)")
+        return owner
+
+    def heartbeat(self, run_key: str, owner: str) -> bool:
+        """
+        Renew the lease of a claimed run without recording an outcome
+
+        Args:
+            run_key: Key from make_run_key
+            owner: Token returned by claim
+
+        Returns:
+            False if the run is no longer owned by owner
+        """
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE match_runs SET updated_at = ? WHERE run_key = ? AND owner = ? AND status = ?",
+                (time.time(), run_key, owner, RUNNING),
+            ).rowcount
+        return bool(updated)
+
+    @contextmanager
+    def hold(self, run_key: str, owner: str, interval: Optional[float] = None) -> Iterator[threading.Event]:
+        """
+        Keep a claimed run's lease alive while its writer works
+
+        A background thread renews the lease every interval seconds, so
+        planning, deduplication or a slow batched call longer than the lease
+        does not let another session take the run over.
+
+        Args:
+            run_key: Key from make_run_key
+            owner: Token returned by claim
+            interval: Seconds between renewals (defaults to a third of the lease)
+
+        Yields:
+            Event set once the run is found to be owned by someone else
+        """
+        if interval is None:
+            interval = self.lease_seconds / 3
+        lost = threading.Event()
+        done = threading.Event()
+
+        def renew():
+            while not done.wait(interval):
+                try:
+                    if not self.heartbeat(run_key, owner):
+                        lost.set()
+                        return
+                except Exception as e:
+                    logger.warning(f"Could not renew the lease of match run {run_key[:12]}: {e}")
+
+        thread = threading.Thread(target=renew, name=f"match-run-lease-{run_key[:12]}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            done.set()
+            thread.join()
+
+    def record(self, run_key: str, owner: str, outcome: MatchOutcome, completed: int) -> bool:
+        """
+        Store one finished outcome of a claimed run
+
+        Args:
+            run_key: Key from make_run_key
+            owner: Token returned by claim
+            outcome: Outcome passed to a match_resume_bank on_result callback
+            completed: Outcomes finished so far (including this one)
+
+        Returns:
+            False if the run is no longer owned by owner (nothing is stored)
+        """
+        result = json.dumps(outcome["result"], default=str) if outcome["result"] is not None else None
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                updated = self._conn.execute(
+                    "UPDATE match_runs SET completed = ?, updated_at = ? "
+                    "WHERE run_key = ? AND owner = ? AND status = ?",
+                    (completed, time.time(), run_key, owner, RUNNING),
+                ).rowcount
+                if updated:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO match_run_outcomes (run_key, idx, seq, result, error) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (run_key, outcome["index"], completed, result, outcome["error"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return bool(updated)
+
+    def complete(self, run_key: str, owner: str, outcomes: List[MatchOutcome]) -> bool:
+        """
+        Store the final outcomes of a claimed run and mark it complete
+
+        Outcomes already stored by record keep their seq, so readers following
+        the run with outcomes(after=...) see every outcome exactly once; the
+        rest are appended after them.
+
+        Args:
+            run_key: Key from make_run_key
+            owner: Token returned by claim
+            outcomes: Every outcome of the run
+
+        Returns:
+            False if the run is no longer owned by owner
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                updated = self._conn.execute(
+                    "UPDATE match_runs SET status = ?, total = ?, completed = ?, updated_at = ? "
+                    "WHERE run_key = ? AND owner = ? AND status = ?",
+                    (COMPLETE, len(outcomes), len(outcomes), time.time(), run_key, owner, RUNNING),
+                ).rowcount
+                if updated:
+                    recorded = {
+                        idx for (idx,) in self._conn.execute(
+                            "SELECT idx FROM match_run_outcomes WHERE run_key = ?", (run_key,)
+                        )
+                    }
+                    (last_seq,) = self._conn.execute(
+                        "SELECT COALESCE(MAX(seq), 0) FROM match_run_outcomes WHERE run_key = ?", (run_key,)
+                    ).fetchone()
+                    missing = [outcome for outcome in outcomes if outcome["index"] not in recorded]
+                    self._conn.executemany(
+                        "INSERT INTO match_run_outcomes (run_key, idx, seq, result, error) VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (
+                                run_key,
+                                outcome["index"],
+                                seq,
+                                json.dumps(outcome["result"], default=str) if outcome["result"] is not None else None,
+                                outcome["error"],
+                            )
+                            for seq, outcome in enumerate(missing, start=last_seq + 1)
+                        ],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return bool(updated)
+
+    def fail(self, run_key: str, owner: str, error: str):
+        """
+        Mark a claimed run as failed so another session can claim it
+
+        Args:
+            run_key: Key from make_run_key
+            owner: Token returned by claim
+            error: Error message shown to attached sessions
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE match_runs SET status = ?, error = ?, updated_at = ? "
+                "WHERE run_key = ? AND owner = ? AND status = ?",
+                (FAILED, error, time.time(), run_key, owner, RUNNING),
+            )
+
+    def outcomes(
+        self,
+        run_key: str,
+        candidates: List[Dict[str, Any]],
+        after: int = 0,
+    ) -> List[MatchOutcome]:
+        """
+        Read the stored outcomes of a run
+
+        Candidates are not stored: the run key pins the bank snapshot, so the
+        caller's rows are the ones that were scored.
+
+        Args:
+            run_key: Key from make_run_key
+            candidates: Rows of the run's resume bank (resume_bank.to_dict('records'))
+            after: Only return outcomes recorded after this many (for following a running run)
+
+        Returns:
+            Outcomes in the order they were recorded
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, result, error FROM match_run_outcomes WHERE run_key = ? AND seq > ? ORDER BY seq",
+                (run_key, after),
+            ).fetchall()
+
+        return [
+            MatchOutcome(
+                index=idx,
+                candidate=candidates[idx],
+                result=json.loads(result) if result is not None else None,
+                error=error,
+            )
+            for idx, result, error in rows
+            if idx < len(candidates)
+        ]
+
+    def evict(self):
+        """Remove runs older than the time to live"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM match_run_outcomes WHERE run_key IN "
+                    "(SELECT run_key FROM match_runs WHERE started_at < ?)",
+                    (cutoff,),
+                )
+                self._conn.execute("DELETE FROM match_runs WHERE started_at < ?", (cutoff,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
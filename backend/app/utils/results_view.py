@@ -0,0 +1,191 @@
+"""
+Results View - Category indexes, filters and pagination for the match results cards
+"""
+
+import math
+import logging
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPATIBLE = "compatible"
+MISMATCH = "mismatch"
+
+# Resume bank columns matched by the text filter
+SEARCH_FIELDS = ('name', 'domain', 'skill_set', 'location', 'location_preference')
+
+# Filter results kept per view (one entry per category/score/search combination)
+MAX_CACHED_FILTERS = 32
+
+
+def is_location_mismatch(candidate: Dict[str, Any], job_location_type: str) -> bool:
+    """
+    Check whether a candidate's work arrangement blocks the job
+
+    Args:
+        candidate: Resume bank row
+        job_location_type: Onsite, Remote or Hybrid
+
+    Returns:
+        True if the candidate's location preference is incompatible with the job
+    """
+    candidate_pref = candidate.get('location_preference', 'Flexible')
+    willing_relocate = str(candidate.get('willing_to_relocate', 'No')).lower() in ['yes', 'true', '1']
+
+    if job_location_type == 'Onsite' and candidate_pref == 'Remote' and not willing_relocate:
+        return True
+    if job_location_type == 'Remote' and candidate_pref == 'Onsite':
+        return True
+    if job_location_type == 'Hybrid' and candidate_pref == 'Remote' and not willing_relocate:
+        return True
+    return False
+
+
+class MatchResultsView:
+    """
+    Read-side index over one job's sorted match results.
+
+    Results are categorized once into compatible and mismatch positions
+    (not-shortlisted results are only counted). Card HTML is built by the
+    category's renderer the first time a result is shown and reused on later
+    reruns, and filter results are memoized, so showing a page costs only the
+    cards on that page.
+    """
+
+    def __init__(
+        self,
+        results: List[Dict[str, Any]],
+        job_location_type: str,
+        renderers: Dict[str, Callable[[Dict[str, Any]], str]],
+        version: Any = None,
+    ):
+        """
+        Categorize the results
+
+        Args:
+            results: Match results sorted by match_score (best first)
+            job_location_type: Location type of the job the results belong to
+            renderers: Card HTML builder per category (COMPATIBLE, MISMATCH)
+            version: Anything else the cards depend on (e.g. the rules version after a rescore)
+        """
+        self.results = results
+        self.size = len(results)
+        self.version = version
+        self.job_location_type = job_location_type
+        self.renderers = renderers
+        self.categories: Dict[str, List[int]] = {COMPATIBLE: [], MISMATCH: []}
+        self.not_shortlisted = 0
+
+        self._search_text: List[str] = []
+        self._fragments: Dict[int, str] = {}
+        self._filters: Dict[Tuple[str, float, str], List[int]] = {}
+
+        for position, result in enumerate(results):
+            candidate = result.get('candidate', {})
+            self._search_text.append(" ".join(
+                str(candidate.get(field, '')) for field in SEARCH_FIELDS
+            ).lower())
+
+            if not result.get('shortlisted', True):
+                self.not_shortlisted += 1
+            elif result.get('excluded') or is_location_mismatch(candidate, job_location_type):
+                self.categories[MISMATCH].append(position)
+            else:
+                self.categories[COMPATIBLE].append(position)
+
+    def count(self, category: str) -> int:
+        """Number of results in a category"""
+        return len(self.categories[category])
+
+    def filter(self, category: str, min_score: float = 0, query: str = "") -> List[int]:
+        """
+        Positions of a category's results passing the filters, in score order
+
+        Args:
+            category: COMPATIBLE or MISMATCH
+            min_score: Lowest match_score shown
+            query: Case-insensitive text matched against the SEARCH_FIELDS columns
+
+        Returns:
+            Result positions (memoized per filter combination)
+        """
+        query = query.strip().lower()
+        key = (category, min_score, query)
+        if key not in self._filters:
+            if len(self._filters) >= MAX_CACHED_FILTERS:
+                self._filters.clear()
+            self._filters[key] = [
+                position for position in self.categories[category]
+                if (self.results[position].get('match_score', 0) or 0) >= min_score
+                and (not query or query in self._search_text[position])
+            ]
+        return self._filters[key]
+
+    def fragment(self, category: str, position: int) -> str:
+        """Card HTML of one result (built once, then reused)"""
+        if position not in self._fragments:
+            self._fragments[position] = self.renderers[category](self.results[position])
+        return self._fragments[position]
+
+    def page(
+        self,
+        category: str,
+        page: int,
+        page_size: int,
+        min_score: float = 0,
+        query: str = "",
+    ) -> Tuple[List[str], int, int]:
+        """
+        Card HTML of one page of a category
+
+        Args:
+            category: COMPATIBLE or MISMATCH
+            page: 1-based page number (clamped to the available pages)
+            page_size: Cards per page
+            min_score: Lowest match_score shown
+            query: Text filter (see filter)
+
+        Returns:
+            Tuple of (card HTML fragments, number of pages, number of filtered results)
+        """
+        positions = self.filter(category, min_score, query)
+        pages = max(1, math.ceil(len(positions) / page_size))
+        page = min(max(1, page), pages)
+        start = (page - 1) * page_size
+        return (
+            [self.fragment(category, position) for position in positions[start:start + page_size]],
+            pages,
+            len(positions),
+        )
+
+
+def get_results_view(
+    current: Optional[MatchResultsView],
+    results: List[Dict[str, Any]],
+    job_location_type: str,
+    renderers: Dict[str, Callable[[Dict[str, Any]], str]],
+    version: Any = None,
+) -> MatchResultsView:
+    """
+    Reuse a results view while its results are unchanged, otherwise build a new one
+
+    Args:
+        current: View built on an earlier rerun (or None)
+        results: Current match results list
+        job_location_type: Location type of the selected job
+        renderers: Card HTML builder per category
+        version: See MatchResultsView
+
+    Returns:
+        MatchResultsView over results
+    """
+    if (
+        current is not None
+        and current.results is results
+        and current.size == len(results)
+        and current.job_location_type == job_location_type
+        and current.version == version
+    ):
+        return current
+
+    return MatchResultsView(results, job_location_type, renderers, version)
@@ -0,0 +1,358 @@
+"""
+Resume Bank - Columnar storage, row fingerprinting and change detection for
+uploaded resume banks
+"""
+
+import io
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Parquet storage
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Columns tried, in order, to identify the same candidate across uploads
+IDENTITY_COLUMNS = ("candidate_id", "id", "email", "name")
+
+# Low-cardinality columns stored as categoricals
+CATEGORICAL_COLUMNS = ("location_preference", "work_authorization", "domain", "willing_to_relocate")
+
+# Number of parsed banks kept in memory and shared by every session
+MAX_LOADED_BANKS = 4
+
+
+def fingerprint_rows(resume_bank: pd.DataFrame) -> np.ndarray:
+    """
+    Hash every resume bank row
+
+    The hash covers the values of every column (in name order) plus the set of
+    column names, so a row only keeps its fingerprint if nothing sent to the
+    matcher could have changed.
+
+    Args:
+        resume_bank: Resume bank DataFrame
+
+    Returns:
+        Array of uint64 fingerprints, one per row
+    """
+    columns = sorted(resume_bank.columns, key=str)
+    if not columns:
+        return np.zeros(len(resume_bank), dtype=np.uint64)
+
+    row_hashes = pd.util.hash_pandas_object(resume_bank[columns], index=False).to_numpy()
+    schema = hashlib.sha256("\x1f".join(map(str, columns)).encode("utf-8")).digest()[:8]
+    return row_hashes ^ np.frombuffer(schema, dtype=np.uint64)[0]
+
+
+def candidate_keys(resume_bank: pd.DataFrame) -> List[str]:
+    """
+    Build a stable identity key for every resume bank row
+
+    Uses the first available identity column (candidate_id, id, email, name),
+    normalized for case and spacing. Repeated keys are numbered by occurrence
+    so every row gets a distinct key. Banks without any identity column fall
+    back to row position.
+
+    Args:
+        resume_bank: Resume bank DataFrame
+
+    Returns:
+        List of keys, one per row
+    """
+    column = next((c for c in IDENTITY_COLUMNS if c in resume_bank.columns), None)
+    if column is None:
+        return [f"row:{row}" for row in range(len(resume_bank))]
+
+    normalized = (
+        resume_bank[column]
+        .astype(str)
+        .str.strip()
+        .str.lower()
+        .str.split()
+        .str.join(" ")
+    )
+    occurrence = normalized.groupby(normalized).cumcount()
+    return [f"{column}:{key}#{n}" for key, n in zip(normalized, occurrence)]
+
+
+def diff_resume_banks(previous: pd.DataFrame, current: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Find added, changed, removed and unchanged candidates between two uploads
+
+    Args:
+        previous: Previously matched resume bank
+        current: Newly uploaded resume bank
+
+    Returns:
+        Dictionary with:
+            added: row positions in current with no counterpart in previous
+            changed: row positions in current whose content differs
+            removed: row positions in previous missing from current
+            unchanged: mapping of current row position -> previous row position
+    """
+    previous_keys = candidate_keys(previous)
+    current_keys = candidate_keys(current)
+    previous_fp = fingerprint_rows(previous)
+    current_fp = fingerprint_rows(current)
+
+    previous_row = {key: row for row, key in enumerate(previous_keys)}
+
+    added, changed, unchanged = [], [], {}
+    for row, (key, fp) in enumerate(zip(current_keys, current_fp)):
+        old_row = previous_row.get(key)
+        if old_row is None:
+            added.append(row)
+        elif previous_fp[old_row] != fp:
+            changed.append(row)
+        else:
+            unchanged[row] = old_row
+
+    current_key_set = set(current_keys)
+    removed = [row for row, key in enumerate(previous_keys) if key not in current_key_set]
+
+    logger.info(
+        f"Resume bank diff: {len(added)} added, {len(changed)} changed, "
+        f"{len(removed)} removed, {len(unchanged)} unchanged"
+    )
+
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": unchanged,
+    }
+
+
+def read_resume_bank_file(data: bytes, filename: str) -> pd.DataFrame:
+    """
+    Parse an uploaded resume bank workbook or CSV
+
+    Args:
+        data: Raw file contents
+        filename: Original file name (the extension selects the parser)
+
+    Returns:
+        Resume bank DataFrame
+    """
+    if filename.lower().endswith(".csv"):
+        return pd.read_csv(io.BytesIO(data))
+    return pd.read_excel(io.BytesIO(data))
+
+
+def to_columnar(resume_bank: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a parsed resume bank to storage-friendly dtypes
+
+    Low-cardinality columns become categoricals. Object columns mixing value
+    types (e.g. numbers and text in one Excel column) are converted to text so
+    they can be written to Parquet; missing values stay missing.
+
+    Args:
+        resume_bank: Parsed resume bank DataFrame
+
+    Returns:
+        New DataFrame with converted columns
+    """
+    resume_bank = resume_bank.copy()
+    resume_bank.columns = [str(column) for column in resume_bank.columns]
+
+    for column in resume_bank.columns:
+        values = resume_bank[column]
+        if values.dtype == object:
+            if not values.dropna().map(lambda value: isinstance(value, str)).all():
+                resume_bank[column] = values.where(values.isna(), values.astype(str))
+        elif not pd.api.types.is_string_dtype(values):
+            continue
+        if column in CATEGORICAL_COLUMNS:
+            resume_bank[column] = resume_bank[column].astype("category")
+
+    return resume_bank
+
+
+class ResumeBankStore:
+    """
+    Persisted, columnar resume bank store shared by every session and page.
+
+    An upload is parsed once, converted with to_columnar and written as
+    Parquet under a content hash, so re-uploading the same file (from any
+    session) skips the Excel parser entirely. Stored banks are read back with
+    memory mapping, and the most recently used ones stay in memory so sessions
+    opening the same bank share one DataFrame.
+    """
+
+    def __init__(self, store_dir: Optional[Path] = None, max_loaded: int = MAX_LOADED_BANKS):
+        """
+        Initialize the store
+
+        Args:
+            store_dir: Directory for stored banks. Defaults to data/cache/resume_banks
+            max_loaded: Number of banks kept in memory
+        """
+        if store_dir is None:
+            store_dir = Path(__file__).parent.parent.parent / "data" / "cache" / "resume_banks"
+
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.max_loaded = max_loaded
+
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+    def _path(self, bank_id: str) -> Path:
+        return self.store_dir / f"{bank_id}.parquet"
+
+    def _catalog_path(self) -> Path:
+        return self.store_dir / "catalog.json"
+
+    def _read_catalog(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads(self._catalog_path().read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_atomic(self, path: Path, write: Callable[[Path], None]):
+        """
+        Write a file so readers never see it half-written
+
+        The content is written to a temporary file in store_dir and moved into
+        place with os.replace, which is atomic, so a crash leaves either the
+        old file or the new one - also for other processes sharing the store.
+
+        Args:
+            path: Final path
+            write: Function writing the content to the path it is given
+        """
+        handle = tempfile.NamedTemporaryFile(dir=self.store_dir, prefix=f".{path.name}.", suffix=".tmp", delete=False)
+        handle.close()
+        temp_path = Path(handle.name)
+        try:
+            write(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def _remember(self, bank_id: str, resume_bank: pd.DataFrame):
+        """Keep a bank in memory; caller must hold the lock"""
+        self._loaded[bank_id] = resume_bank
+        self._loaded.move_to_end(bank_id)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+    def ingest(self, data: bytes, filename: str) -> Tuple[str, pd.DataFrame]:
+        """
+        Store an uploaded resume bank file, parsing it only if it is new
+
+        Args:
+            data: Raw file contents (.xlsx, .xls or .csv)
+            filename: Original file name
+
+        Returns:
+            Tuple of (bank_id, resume bank DataFrame)
+        """
+        bank_id = hashlib.sha256(data).hexdigest()[:32]
+
+        with self._lock:
+            if bank_id in self._loaded:
+                self._loaded.move_to_end(bank_id)
+                return bank_id, self._loaded[bank_id]
+
+        if PARQUET_AVAILABLE and self._path(bank_id).exists():
+            try:
+                return bank_id, self.load(bank_id)
+            except Exception as e:
+                # e.g. a file left truncated by an older, non-atomic write: parse the upload again
+                logger.warning(f"Stored resume bank {bank_id} is unreadable, parsing the upload again: {e}")
+
+        started = time.perf_counter()
+        resume_bank = to_columnar(read_resume_bank_file(data, filename))
+        logger.info(
+            f"Parsed resume bank {filename}: {len(resume_bank)} rows in "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+
+        with self._lock:
+            if PARQUET_AVAILABLE:
+                self._write_atomic(
+                    self._path(bank_id),
+                    lambda path: resume_bank.to_parquet(path, engine="pyarrow", index=False),
+                )
+                catalog = self._read_catalog()
+                catalog[bank_id] = {
+                    "filename": filename,
+                    "rows": len(resume_bank),
+                    "ingested_at": time.time(),
+                }
+                self._write_atomic(
+                    self._catalog_path(), lambda path: path.write_text(json.dumps(catalog, indent=2))
+                )
+            else:
+                logger.warning("pyarrow is not installed - resume bank kept in memory only")
+            self._remember(bank_id, resume_bank)
+
+        return bank_id, resume_bank
+
+    def load(self, bank_id: str) -> pd.DataFrame:
+        """
+        Open a stored resume bank
+
+        Args:
+            bank_id: Identifier returned by ingest
+
+        Returns:
+            Resume bank DataFrame
+
+        Raises:
+            KeyError: If the bank is not stored
+        """
+        with self._lock:
+            if bank_id in self._loaded:
+                self._loaded.move_to_end(bank_id)
+                return self._loaded[bank_id]
+
+        if not PARQUET_AVAILABLE or not self._path(bank_id).exists():
+            raise KeyError(f"Unknown resume bank: {bank_id}")
+
+        started = time.perf_counter()
+        table = pq.read_table(self._path(bank_id), memory_map=True)
+        resume_bank = table.to_pandas()
+        logger.info(
+            f"Opened resume bank {bank_id}: {len(resume_bank)} rows in "
+            f"{time.perf_counter() - started:.3f}s"
+        )
+
+        with self._lock:
+            self._remember(bank_id, resume_bank)
+        return resume_bank
+
+    def list_banks(self) -> List[Dict[str, Any]]:
+        """
+        Stored resume banks, newest first
+
+        Returns:
+            List of dictionaries with bank_id, filename, rows and ingested_at
+        """
+        with self._lock:
+            catalog = self._read_catalog()
+        banks = [
+            {"bank_id": bank_id, **entry}
+            for bank_id, entry in catalog.items()
+            if self._path(bank_id).exists()
+        ]
+        return sorted(banks, key=lambda entry: entry["ingested_at"], reverse=True)
@@ -7,8 +7,27 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Location reasoning codes returned by evaluate_deal_breakers_bulk
+LOCATION_RULE = 0
+LOCATION_RELOCATION_BONUS = 1
+LOCATION_NO_RULE = 2
+
+# Work authorization reasoning codes returned by evaluate_deal_breakers_bulk
+WORK_AUTH_ACCEPTED = 0
+WORK_AUTH_REJECTED = 1
+WORK_AUTH_UNKNOWN_STATUS = 2
+WORK_AUTH_NOT_SPECIFIED = 3
+WORK_AUTH_UNKNOWN_POLICY = 4
+WORK_AUTH_NO_RULES = 5
+
+# Component scores combined into the overall match score, in score matrix column order
+COMPONENT_KEYS = ("job_title_match", "skills", "experience", "profile_description_match")
+
 
 class MatchingRulesEngine:
     """Engine for loading and applying matching rules"""
@@ -24,7 +43,32 @@ class MatchingRulesEngine:
             rules_path = Path(__file__).parent.parent / "config" / "matching_rules.json"
 
         self.rules_path = rules_path
+        self._rules_mtime = self._get_rules_mtime()
+        self.rules = self._load_rules()
+        self._compile_rules()
+
+    def _get_rules_mtime(self) -> Optional[float]:
+        """Modification time of the rules file (None if it cannot be read)"""
+        try:
+            return Path(self.rules_path).stat().st_mtime
+        except OSError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the rules if the rules file changed on disk (e.g. saved from Admin Settings)
+
+        Returns:
+            True if the rules were reloaded
+        """
+        mtime = self._get_rules_mtime()
+        if mtime == self._rules_mtime:
+            return False
+
+        self._rules_mtime = mtime
         self.rules = self._load_rules()
+        self._compile_rules()
+        return True
 
     def _load_rules(self) -> Dict[str, Any]:
         """Load rules from JSON file"""
@@ -51,6 +95,34 @@ class MatchingRulesEngine:
             }
         }
 
+    def _compile_rules(self):
+        """Compile location and work authorization rules into lookup tables"""
+        # (job_location, candidate_preference) -> (score, reasoning, passes)
+        self._location_table = {}
+        location_rules = self.rules.get("location_rules", {})
+        for rule in location_rules.get("compatibility_matrix", {}).get("rules", []):
+            key = (rule["job_location"], rule["candidate_preference"])
+            if key not in self._location_table:
+                self._location_table[key] = (
+                    rule["score"],
+                    rule.get("reasoning", ""),
+                    rule.get("passes", True),
+                )
+
+        # sponsorship policy -> (accepted statuses, rejected statuses, reasoning)
+        self._work_auth_policies = {}
+        work_auth_rules = self.rules.get("work_authorization_rules", {})
+        for name, policy in work_auth_rules.get("sponsorship_policies", {}).items():
+            self._work_auth_policies[name] = (
+                frozenset(policy["accepted_statuses"]),
+                frozenset(policy["rejected_statuses"]),
+                policy["reasoning"],
+            )
+
+    def get_rules_version(self) -> str:
+        """Get an identifier of the loaded rules (version and last update)"""
+        return f"{self.rules.get('version', 'unknown')}@{self.rules.get('last_updated', 'unknown')}"
+
     def get_matching_weights(self) -> Dict[str, float]:
         """Get current matching weights"""
         weights = {}
@@ -123,22 +195,13 @@ class MatchingRulesEngine:
         candidate_preference = candidate_preference.strip().title()
 
         # Find matching rule
-        location_rules = self.rules["location_rules"]["compatibility_matrix"]["rules"]
-
-        matching_rule = None
-        for rule in location_rules:
-            if (rule["job_location"] == job_location and
-                rule["candidate_preference"] == candidate_preference):
-                matching_rule = rule
-                break
+        matching_rule = self._location_table.get((job_location, candidate_preference))
 
         if matching_rule is None:
             logger.warning(f"No matching rule found for {job_location} + {candidate_preference}")
             return 50, "No specific rule found - using default score", True
 
-        base_score = matching_rule["score"]
-        reasoning = matching_rule.get("reasoning", "")
-        passes = matching_rule.get("passes", True)
+        base_score, reasoning, passes = matching_rule
 
         # Get deal breaker threshold
         threshold = self.rules["location_rules"].get("deal_breaker_threshold", 50)
@@ -159,6 +222,188 @@ class MatchingRulesEngine:
 
         return base_score, reasoning, passes
 
+    def evaluate_deal_breakers_bulk(
+        self,
+        resume_bank: pd.DataFrame,
+        job: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Evaluate location and work authorization deal breakers for a whole bank
+
+        Each distinct preference/status value is looked up once in the compiled
+        rule tables and the answers are broadcast to every row with NumPy, so
+        screening cost is dominated by factorizing the input columns.
+
+        Args:
+            resume_bank: Resume bank DataFrame (location_preference,
+                willing_to_relocate and work_authorization columns are optional)
+            job: Job position dictionary (location_type, sponsorship_policy)
+
+        Returns:
+            Dictionary of per-row arrays: location_score, location_passes,
+            location_code, work_auth_passes, work_auth_code, excluded,
+            exclusion_reason, plus the normalized location_preference and
+            work_authorization values and the job_location/sponsorship_policy
+            used, for get_deal_breaker_details
+        """
+        n = len(resume_bank)
+        job_location = str(job.get("location_type", "Remote")).strip().title()
+        sponsorship_policy = job.get("sponsorship_policy", "full_sponsorship")
+
+        # ---- Location compatibility ----
+        pref_codes, pref_values = self._factorize_column(resume_bank, "location_preference", "Flexible")
+        pref_values = np.array([str(value).strip().title() for value in pref_values], dtype=object)
+
+        unique_score = np.empty(len(pref_values), dtype=np.int64)
+        unique_passes = np.empty(len(pref_values), dtype=bool)
+        unique_has_rule = np.empty(len(pref_values), dtype=bool)
+        for i, preference in enumerate(pref_values):
+            rule = self._location_table.get((job_location, preference))
+            if rule is None:
+                logger.warning(f"No matching rule found for {job_location} + {preference}")
+                unique_score[i], unique_passes[i], unique_has_rule[i] = 50, True, False
+            else:
+                unique_score[i], unique_passes[i], unique_has_rule[i] = rule[0], rule[2], True
+
+        location_score = unique_score[pref_codes]
+        location_passes = unique_passes[pref_codes]
+        has_rule = unique_has_rule[pref_codes]
+
+        relocate_codes, relocate_values = self._factorize_column(resume_bank, "willing_to_relocate", "No")
+        unique_willing = np.array(
+            [str(value).lower() in ("yes", "true", "1") for value in relocate_values], dtype=bool
+        )
+        willing = unique_willing[relocate_codes]
+
+        location_rules = self.rules.get("location_rules", {})
+        threshold = location_rules.get("deal_breaker_threshold", 50)
+        relocation = location_rules.get("relocation", {})
+        boosted = np.zeros(n, dtype=bool)
+
+        # Apply relocation bonus if applicable
+        if relocation.get("enabled"):
+            boosted = has_rule & willing & (location_score < threshold)
+            location_score = np.where(
+                boosted, np.minimum(100, location_score + relocation["score_boost"]), location_score
+            )
+            location_passes = location_passes | (boosted & (location_score >= threshold))
+
+        # Final threshold check (rows without a rule keep the default pass)
+        location_passes = location_passes & ~(has_rule & (location_score < threshold))
+
+        location_code = np.full(n, LOCATION_RULE, dtype=np.int8)
+        location_code[boosted] = LOCATION_RELOCATION_BONUS
+        location_code[~has_rule] = LOCATION_NO_RULE
+
+        # ---- Work authorization ----
+        status_codes, status_values = self._factorize_column(resume_bank, "work_authorization", "Not Specified")
+        status_values = np.array([str(value).strip() for value in status_values], dtype=object)
+
+        policy = self._work_auth_policies.get(sponsorship_policy)
+        if "work_authorization_rules" in self.rules and policy is None:
+            logger.warning(f"Unknown sponsorship policy: {sponsorship_policy}")
+
+        unique_code = np.empty(len(status_values), dtype=np.int8)
+        for i, status in enumerate(status_values):
+            if status == "Not Specified":
+                unique_code[i] = WORK_AUTH_NOT_SPECIFIED
+            elif "work_authorization_rules" not in self.rules:
+                unique_code[i] = WORK_AUTH_NO_RULES
+            elif policy is None:
+                unique_code[i] = WORK_AUTH_UNKNOWN_POLICY
+            elif status in policy[0]:
+                unique_code[i] = WORK_AUTH_ACCEPTED
+            elif status in policy[1]:
+                unique_code[i] = WORK_AUTH_REJECTED
+            else:
+                logger.warning(f"Unknown work authorization status: {status}")
+                unique_code[i] = WORK_AUTH_UNKNOWN_STATUS
+
+        work_auth_code = unique_code[status_codes]
+        work_auth_passes = work_auth_code != WORK_AUTH_REJECTED
+
+        # ---- Exclusions (work authorization takes precedence) ----
+        exclusion_reason = np.full(n, None, dtype=object)
+        exclusion_reason[~location_passes] = "location_mismatch"
+        exclusion_reason[~work_auth_passes] = "work_authorization"
+
+        return {
+            "location_score": location_score,
+            "location_passes": location_passes,
+            "location_code": location_code,
+            "work_auth_passes": work_auth_passes,
+            "work_auth_code": work_auth_code,
+            "excluded": ~(location_passes & work_auth_passes),
+            "exclusion_reason": exclusion_reason,
+            "location_preference": pref_values[pref_codes],
+            "work_authorization": status_values[status_codes],
+            "job_location": job_location,
+            "sponsorship_policy": sponsorship_policy,
+        }
+
+    def get_deal_breaker_details(self, bulk: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """
+        Expand one row of evaluate_deal_breakers_bulk output into reasoning text
+
+        Args:
+            bulk: Result of evaluate_deal_breakers_bulk
+            index: Row position in the evaluated DataFrame
+
+        Returns:
+            Dictionary with exclusion flag/reason and location and work auth details
+        """
+        location_code = bulk["location_code"][index]
+        if location_code == LOCATION_NO_RULE:
+            location_reasoning = "No specific rule found - using default score"
+        else:
+            rule = self._location_table[(bulk["job_location"], bulk["location_preference"][index])]
+            location_reasoning = rule[1]
+            if location_code == LOCATION_RELOCATION_BONUS:
+                bonus = self.rules["location_rules"]["relocation"]["score_boost"]
+                location_reasoning += f" (+{bonus} bonus for willingness to relocate)"
+
+        status = bulk["work_authorization"][index]
+        work_auth_code = bulk["work_auth_code"][index]
+        if work_auth_code == WORK_AUTH_ACCEPTED:
+            work_auth_reasoning = f"Work authorization accepted: {status}"
+        elif work_auth_code == WORK_AUTH_REJECTED:
+            policy = self._work_auth_policies[bulk["sponsorship_policy"]]
+            work_auth_reasoning = f"Work authorization not accepted: {policy[2]}"
+        elif work_auth_code == WORK_AUTH_UNKNOWN_STATUS:
+            work_auth_reasoning = f"Unknown status '{status}' - review manually"
+        elif work_auth_code == WORK_AUTH_UNKNOWN_POLICY:
+            work_auth_reasoning = "Unknown policy - allowing by default"
+        elif work_auth_code == WORK_AUTH_NO_RULES:
+            work_auth_reasoning = "No work authorization rules configured"
+        else:
+            work_auth_reasoning = ""
+
+        return {
+            "excluded": bool(bulk["excluded"][index]),
+            "exclusion_reason": bulk["exclusion_reason"][index],
+            "location_score": int(bulk["location_score"][index]),
+            "location_reasoning": location_reasoning,
+            "location_passes": bool(bulk["location_passes"][index]),
+            "work_auth_passes": bool(bulk["work_auth_passes"][index]),
+            "work_auth_reasoning": work_auth_reasoning
+        }
+
+    @staticmethod
+    def _factorize_column(
+        resume_bank: pd.DataFrame,
+        column: str,
+        default: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Factorize a resume bank column into (codes, unique values), filling missing with default"""
+        if column not in resume_bank.columns:
+            return np.zeros(len(resume_bank), dtype=np.intp), np.array([default], dtype=object)
+
+        codes, uniques = pd.factorize(resume_bank[column], use_na_sentinel=True)
+        uniques = np.append(np.asarray(uniques, dtype=object), default)
+        # Missing values (-1) point at the appended default
+        codes = np.where(codes < 0, len(uniques) - 1, codes)
+        return codes, uniques
+
     def get_experience_score_adjustment(
         self,
         candidate_years: float,
@@ -225,6 +470,44 @@ class MatchingRulesEngine:
 
         return round(total_score, 1)
 
+    def calculate_weighted_scores_bulk(self, component_matrix: np.ndarray) -> np.ndarray:
+        """
+        Calculate unrounded weighted overall scores for many candidates at once
+
+        Args:
+            component_matrix: Array of shape (n, len(COMPONENT_KEYS)) with
+                component scores in COMPONENT_KEYS order
+
+        Returns:
+            Array of n overall scores (0-100)
+        """
+        weights = self.get_matching_weights()
+        weight_vector = np.array([weights.get(key, 0.0) for key in COMPONENT_KEYS], dtype=np.float64)
+        return np.asarray(component_matrix, dtype=np.float64).reshape(-1, len(COMPONENT_KEYS)) @ weight_vector
+
+    def get_recommendations_bulk(self, overall_scores: np.ndarray) -> np.ndarray:
+        """
+        Get hiring recommendations for many scores at once
+
+        Applies the same threshold bands, in the same order, as get_recommendation.
+
+        Args:
+            overall_scores: Array of overall match scores (0-100)
+
+        Returns:
+            Array of recommendation strings
+        """
+        overall_scores = np.asarray(overall_scores, dtype=np.float64)
+        recommendations = np.full(overall_scores.shape, "REVIEW REQUIRED", dtype=object)
+        unassigned = np.ones(overall_scores.shape, dtype=bool)
+
+        for config in self.rules.get("scoring_thresholds", {}).values():
+            in_band = unassigned & (overall_scores >= config["min_score"]) & (overall_scores <= config["max_score"])
+            recommendations[in_band] = config["recommendation"]
+            unassigned &= ~in_band
+
+        return recommendations
+
     def get_recommendation(
         self,
         overall_score: float,
@@ -341,6 +624,8 @@ def get_rules_engine() -> MatchingRulesEngine:
 
     if '_rules_engine_instance' not in globals():
         _rules_engine_instance = MatchingRulesEngine()
+    else:
+        _rules_engine_instance.reload_if_changed()
 
     return _rules_engine_instance
 
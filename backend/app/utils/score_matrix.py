@@ -0,0 +1,118 @@
+"""
+Score Matrix - Candidate x job match scores for cross-job views
+"""
+
+import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .match_engine import MatchOutcome
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreMatrix:
+    """
+    Outcomes of matching one resume bank against several jobs.
+
+    scores[i, j] is the weighted match score of candidate i for job j, or NaN
+    when the pair was never LLM scored (deal-breaker exclusion, not
+    shortlisted, or an error). excluded[i, j] flags deal-breaker exclusions.
+    """
+
+    def __init__(
+        self,
+        jobs: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]],
+        outcomes: List[List[MatchOutcome]],
+    ):
+        """
+        Build the matrix
+
+        Args:
+            jobs: Job position dictionaries, in column order
+            candidates: Resume bank rows, in row order
+            outcomes: Per job, the outcomes aligned with candidates
+        """
+        self.jobs = jobs
+        self.candidates = candidates
+        self.outcomes = outcomes
+        self.job_ids = [job["id"] for job in jobs]
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the score arrays from the outcomes (e.g. after rescoring results)"""
+        shape = (len(self.candidates), len(self.jobs))
+        self.scores = np.full(shape, np.nan)
+        self.excluded = np.zeros(shape, dtype=bool)
+
+        for column, job_outcomes in enumerate(self.outcomes):
+            for outcome in job_outcomes:
+                result = outcome["result"]
+                if result is None:
+                    continue
+                self.excluded[outcome["index"], column] = bool(result.get("excluded"))
+                if result.get("component_scores"):
+                    self.scores[outcome["index"], column] = result["match_score"]
+
+    def results(self) -> List[Dict[str, Any]]:
+        """All match results in the matrix (one per scored candidate-job pair)"""
+        return [
+            outcome["result"]
+            for job_outcomes in self.outcomes
+            for outcome in job_outcomes
+            if outcome["result"] is not None
+        ]
+
+    def job_outcomes(self, job_id: str) -> Optional[List[MatchOutcome]]:
+        """
+        Outcomes of one job
+
+        Args:
+            job_id: Job position id
+
+        Returns:
+            Outcomes aligned with the resume bank rows, or None if the job is not in the matrix
+        """
+        if job_id not in self.job_ids:
+            return None
+        return self.outcomes[self.job_ids.index(job_id)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Scores as a DataFrame with one row per candidate and one column per job title"""
+        return pd.DataFrame(
+            self.scores,
+            index=[candidate.get("name", f"Candidate {row + 1}") for row, candidate in enumerate(self.candidates)],
+            columns=[job["title"] for job in self.jobs],
+        )
+
+    def best_job_per_candidate(self, include_excluded: bool = False) -> pd.DataFrame:
+        """
+        Find the best scoring job for every candidate
+
+        Args:
+            include_excluded: Also consider jobs the candidate is excluded from
+                by deal breakers (their potential score)
+
+        Returns:
+            DataFrame with candidate, best_job, best_score and eligible_jobs,
+            sorted by best_score descending (candidates never scored are last)
+        """
+        scores = self.scores if include_excluded else np.where(self.excluded, np.nan, self.scores)
+        has_score = ~np.isnan(scores).all(axis=1)
+
+        best_column = np.zeros(len(self.candidates), dtype=np.int64)
+        best_column[has_score] = np.nanargmax(scores[has_score], axis=1)
+        best_score = np.full(len(self.candidates), np.nan)
+        best_score[has_score] = scores[has_score, best_column[has_score]]
+
+        titles = np.array([job["title"] for job in self.jobs], dtype=object)
+        frame = pd.DataFrame({
+            "candidate": [candidate.get("name", f"Candidate {row + 1}") for row, candidate in enumerate(self.candidates)],
+            "best_job": np.where(has_score, titles[best_column] if len(titles) else None, None),
+            "best_score": best_score,
+            "eligible_jobs": (~self.excluded).sum(axis=1),
+        })
+        return frame.sort_values("best_score", ascending=False, na_position="last", kind="stable")
@@ -0,0 +1,230 @@
+"""
+Skills - Local skill normalization and skill-overlap scoring
+"""
+
+import re
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
+
+from .lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Strict aliases stand alone in a list or sentence: "C, Go, R" matches,
+# "C-level", "Go-to-market", "R&D", "C++" and "C#" do not
+STRICT_ALIAS_BEFORE = r"(?<![^\s,;:/|(\[])"
+STRICT_ALIAS_AFTER = r"(?=$|[\s,;:/|)\]]|\.(?!\w))"
+
+
+class SkillMatcher:
+    """
+    Maps free-text skills onto a canonical skill dictionary.
+
+    Every canonical name and alias is tokenized into a trie of tokens, and
+    text is scanned left to right taking the longest alias that starts at each
+    token (so "spring boot" wins over "spring"). Matching is linear in the
+    number of tokens and needs no LLM call.
+
+    Short names that are also ordinary words or prose fragments ("C", "Go",
+    "R") are listed as strict_aliases instead: they only match with their
+    exact case and as a standalone word (see STRICT_ALIAS_BEFORE/AFTER), while
+    their longer aliases ("golang", "r programming") match as usual.
+    """
+
+    def __init__(self, dictionary_path: Optional[Path] = None):
+        """
+        Initialize the matcher
+
+        Args:
+            dictionary_path: Path to the skill dictionary JSON. If None, uses default location.
+        """
+        if dictionary_path is None:
+            dictionary_path = Path(__file__).parent.parent / "config" / "skill_dictionary.json"
+
+        self.dictionary_path = dictionary_path
+        self.dictionary = self._load_dictionary()
+
+        self.version = self.dictionary.get("version")
+        self.categories: Dict[str, str] = {}
+        self.implies: Dict[str, Tuple[str, ...]] = {}
+        # token -> child node; the None key holds the canonical skill ending at a node
+        self._trie: Dict[Any, Any] = {}
+        # strict alias -> canonical skill
+        self._strict: Dict[str, str] = {}
+
+        for name, entry in self.dictionary.get("skills", {}).items():
+            self.categories[name] = entry.get("category", "other")
+            self.implies[name] = tuple(entry.get("implies", []))
+            strict_aliases = entry.get("strict_aliases", [])
+            for alias in strict_aliases:
+                self._strict[alias] = name
+            for alias in [name, *entry.get("aliases", [])]:
+                if alias not in strict_aliases:
+                    self._add_alias(alias, name)
+
+        self._strict_pattern = None
+        if self._strict:
+            # Longest first so a strict alias never shadows a longer one
+            alternatives = "|".join(re.escape(alias) for alias in sorted(self._strict, key=len, reverse=True))
+            self._strict_pattern = re.compile(f"{STRICT_ALIAS_BEFORE}({alternatives}){STRICT_ALIAS_AFTER}")
+
+        logger.info(f"Loaded skill dictionary with {len(self.categories)} canonical skills")
+
+    def _load_dictionary(self) -> Dict[str, Any]:
+        """Load the skill dictionary from JSON"""
+        try:
+            with open(self.dictionary_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load skill dictionary: {e}")
+            return {"skills": {}}
+
+    def _add_alias(self, alias: str, canonical: str):
+        """Insert one alias into the token trie"""
+        tokens = tokenize(alias)
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(None, canonical)
+
+    def _scan(self, tokens: List[str]) -> List[Tuple[int, int, str]]:
+        """Longest-match scan of a token list: list of (start, end, canonical)"""
+        matches = []
+        position = 0
+        while position < len(tokens):
+            node = self._trie
+            match = None
+            cursor = position
+            while cursor < len(tokens) and tokens[cursor] in node:
+                node = node[tokens[cursor]]
+                cursor += 1
+                if None in node:
+                    match = (position, cursor, node[None])
+            if match is None:
+                position += 1
+            else:
+                matches.append(match)
+                position = match[1]
+        return matches
+
+    def extract(self, text: Any) -> Set[str]:
+        """
+        Find every canonical skill mentioned in free text
+
+        Args:
+            text: Free text such as a skill_set cell (non-strings give no skills)
+
+        Returns:
+            Set of canonical skill names, including implied skills
+        """
+        found = {canonical for _, _, canonical in self._scan(tokenize(text))}
+        if self._strict_pattern is not None and isinstance(text, str):
+            found.update(self._strict[alias] for alias in self._strict_pattern.findall(text))
+        for canonical in list(found):
+            found.update(self.implies.get(canonical, ()))
+        return found
+
+    def normalize(self, skill: str) -> str:
+        """
+        Canonical name of a single skill
+
+        Args:
+            skill: Skill as written (e.g. "k8s", "ReactJS")
+
+        Returns:
+            Canonical name if the whole skill is a known alias, otherwise the
+            skill's tokens joined in lowercase
+        """
+        # A required skill is a single item, so strict aliases match in any case here
+        for alias, canonical in self._strict.items():
+            if isinstance(skill, str) and skill.strip().lower() == alias.lower():
+                return canonical
+
+        tokens = tokenize(skill)
+        matches = self._scan(tokens)
+        if len(matches) == 1 and matches[0][:2] == (0, len(tokens)):
+            return matches[0][2]
+        return " ".join(tokens)
+
+    def overlap(self, candidate_skills: Any, required_skills: Sequence[str]) -> Dict[str, Any]:
+        """
+        Compare a candidate's skills with a job's required skills
+
+        Required skills missing from the dictionary are matched as whole
+        token sequences in the candidate text.
+
+        Args:
+            candidate_skills: Candidate skill_set text
+            required_skills: Job required skills
+
+        Returns:
+            Dictionary with matched, missing and additional skill lists,
+            coverage (0-1) and score (0-100)
+        """
+        candidate_tokens = tokenize(candidate_skills)
+        candidate_set = self.extract(candidate_skills)
+
+        required = []
+        for skill in required_skills:
+            canonical = self.normalize(skill)
+            if canonical and canonical not in required:
+                required.append(canonical)
+
+        matched, missing = [], []
+        for canonical in required:
+            if canonical in candidate_set or (
+                canonical not in self.categories and _contains_sequence(candidate_tokens, canonical.split())
+            ):
+                matched.append(canonical)
+            else:
+                missing.append(canonical)
+
+        coverage = len(matched) / len(required) if required else 0.0
+        return {
+            "matched": matched,
+            "missing": missing,
+            "additional": sorted(candidate_set.difference(required)),
+            "coverage": round(coverage, 3),
+            "score": round(coverage * 100, 1),
+        }
+
+
+def _contains_sequence(tokens: List[str], sequence: List[str]) -> bool:
+    """Check whether a token sequence appears contiguously in tokens"""
+    if not sequence:
+        return False
+    width = len(sequence)
+    return any(tokens[i:i + width] == sequence for i in range(len(tokens) - width + 1))
+
+
+def format_skill_overlap_hint(overlap: Dict[str, Any]) -> str:
+    """
+    Render a skill overlap as a short prompt hint
+
+    Args:
+        overlap: Result of SkillMatcher.overlap
+
+    Returns:
+        Hint text
+    """
+    matched = ", ".join(overlap["matched"]) or "none"
+    missing = ", ".join(overlap["missing"]) or "none"
+    return (
+        f"Required skills matched: {matched}\n"
+        f"Required skills missing: {missing}\n"
+        f"Required skill coverage: {overlap['coverage']:.0%}"
+    )
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Get singleton instance of skill matcher"""
+    global _skill_matcher_instance
+
+    if '_skill_matcher_instance' not in globals():
+        _skill_matcher_instance = SkillMatcher()
+
+    return _skill_matcher_instance
@@ -0,0 +1,108 @@
+"""
+Token Usage - Running totals of the tokens billed by the LLM providers
+"""
+
+import threading
+from typing import Dict, Any
+
+_instance_lock = threading.Lock()
+
+
+def response_usage(response: Any) -> Dict[str, int]:
+    """
+    Read the token usage reported with one chat model response
+
+    Uses LangChain's usage_metadata when present, otherwise the raw Anthropic
+    or OpenAI usage block in response_metadata.
+
+    Args:
+        response: AIMessage returned by llm.invoke
+
+    Returns:
+        Dictionary with input_tokens, output_tokens, cache_read_tokens and
+        cache_creation_tokens (zeros when the provider reports nothing)
+    """
+    usage = {"input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_creation_tokens": 0}
+
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata:
+        details = metadata.get("input_token_details") or {}
+        usage["input_tokens"] = metadata.get("input_tokens") or 0
+        usage["output_tokens"] = metadata.get("output_tokens") or 0
+        usage["cache_read_tokens"] = details.get("cache_read") or 0
+        usage["cache_creation_tokens"] = details.get("cache_creation") or 0
+        return usage
+
+    response_metadata = getattr(response, "response_metadata", None) or {}
+    if response_metadata.get("usage"):
+        # Anthropic: input_tokens excludes the cached prefix
+        raw = response_metadata["usage"]
+        usage["cache_read_tokens"] = raw.get("cache_read_input_tokens") or 0
+        usage["cache_creation_tokens"] = raw.get("cache_creation_input_tokens") or 0
+        usage["input_tokens"] = (
+            (raw.get("input_tokens") or 0) + usage["cache_read_tokens"] + usage["cache_creation_tokens"]
+        )
+        usage["output_tokens"] = raw.get("output_tokens") or 0
+    elif response_metadata.get("token_usage"):
+        # OpenAI: prompt_tokens includes the cached prefix
+        raw = response_metadata["token_usage"]
+        usage["input_tokens"] = raw.get("prompt_tokens") or 0
+        usage["output_tokens"] = raw.get("completion_tokens") or 0
+        usage["cache_read_tokens"] = (raw.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+
+    return usage
+
+
+class TokenUsageTracker:
+    """
+    Thread-safe totals of the tokens reported by every LLM response, so the
+    share of input read from the provider's prompt cache can be monitored.
+    """
+
+    def __init__(self):
+        """Initialize empty totals"""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+
+    def record(self, response: Any):
+        """
+        Add the usage of one response to the totals
+
+        Args:
+            response: AIMessage returned by llm.invoke
+        """
+        usage = response_usage(response)
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += usage["input_tokens"]
+            self.output_tokens += usage["output_tokens"]
+            self.cache_read_tokens += usage["cache_read_tokens"]
+            self.cache_creation_tokens += usage["cache_creation_tokens"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current totals (for health checks and the UI)"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cache_creation_tokens": self.cache_creation_tokens,
+                "cache_read_rate": round(self.cache_read_tokens / self.input_tokens, 3) if self.input_tokens else 0.0,
+            }
+
+
+def get_token_usage_tracker() -> TokenUsageTracker:
+    """Get singleton instance of the token usage tracker"""
+    global _token_usage_tracker_instance
+
+    # Locked: worker threads record usage at the same time
+    with _instance_lock:
+        if '_token_usage_tracker_instance' not in globals():
+            _token_usage_tracker_instance = TokenUsageTracker()
+
+    return _token_usage_tracker_instance
@@ -40,6 +40,11 @@ except ImportError:
     LANGSMITH_AVAILABLE = False
     print("LangSmith client not available, will use local workflow")
 
+from app.utils.match_engine import MatchingEngine, MatchOutcome
+from app.utils.concurrency import get_concurrency_limiter, invoke_with_limit
+from app.utils.resume_bank import ResumeBankStore
+from app.utils.duplicates import find_duplicates, duplicate_groups
+
 # ============================================================================
 # PAGE CONFIG
 # ============================================================================
@@ -384,6 +389,8 @@ if 'matching_results' not in st.session_state:
     st.session_state.matching_results = []
 if 'selected_job' not in st.session_state:
     st.session_state.selected_job = None
+if 'resume_bank_id' not in st.session_state:
+    st.session_state.resume_bank_id = None
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -397,6 +404,16 @@ def get_llm(temperature=0.1):
         temperature=temperature,
     )
 
+@st.cache_resource
+def get_resume_bank_store():
+    """Get process-wide resume bank store"""
+    return ResumeBankStore()
+
+@st.cache_data(show_spinner=False)
+def get_bank_duplicates(bank_id, _resume_bank):
+    """Representative row of every resume bank row, computed once per stored bank"""
+    return find_duplicates(_resume_bank)
+
 @st.cache_resource
 def get_langsmith_client_cached():
     """Get cached LangSmith client if available"""
@@ -512,7 +529,7 @@ def match_candidate_to_job_langsmith(langsmith_client, candidate, job):
             "reasoning": output.get("final_recommendation", "")
         }
     except Exception as e:
-        st.error(f"LangSmith API error: {str(e)}")
+        # Runs on a matching engine worker thread - the caller reports the error
         # Return a default error response
         return {
             "match_score": 0,
@@ -583,7 +600,7 @@ Provide ONLY the JSON response, no additional text."""
             HumanMessage(content=prompt),
         ]
 
-        response = llm.invoke(messages)
+        response = invoke_with_limit(llm, messages, call_site="entity_match")
 
         # Parse JSON response
         import re
@@ -615,6 +632,65 @@ Provide ONLY the JSON response, no additional text."""
             "error": str(e)
         }
 
+# Fields the match verdict depends on besides the name: everything in the
+# candidate description plus the deal-breaker fields
+DUPLICATE_MATCH_FIELDS = (
+    'skill_set', 'exp_years', 'domain', 'previous_roles', 'education', 'location',
+    'location_preference', 'willing_to_relocate', 'work_authorization',
+)
+
+def match_representatives(candidates, representatives):
+    """
+    Narrow duplicate clusters to rows whose match inputs are identical
+
+    A duplicate only reuses a result when it would have sent the same
+    profile to the matcher; rows of a cluster that differ in any
+    DUPLICATE_MATCH_FIELDS value are scored on their own.
+
+    Args:
+        candidates: Candidate dictionaries in resume bank order
+        representatives: Representative row of every row (find_duplicates)
+
+    Returns:
+        List with the row each candidate copies its result from
+    """
+    first_rows = {}
+    narrowed = []
+    for row, candidate in enumerate(candidates):
+        key = (int(representatives[row]),) + tuple(
+            str(candidate.get(field, 'N/A')) for field in DUPLICATE_MATCH_FIELDS
+        )
+        narrowed.append(first_rows.setdefault(key, row))
+    return narrowed
+
+def copy_duplicate_result(result, representative, candidate):
+    """
+    Copy a representative's match result to a duplicate row
+
+    Args:
+        result: Result returned for the representative (None if it failed)
+        representative: Candidate dictionary that was scored
+        candidate: Duplicate candidate dictionary
+
+    Returns:
+        Result dictionary for the duplicate, marked with duplicate_of
+    """
+    if result is None:
+        return None
+
+    duplicate = dict(result)
+    name = representative.get('name', 'N/A')
+    if duplicate.get("match_data") is not None:
+        # Local workflow wraps the analysis in match_data
+        duplicate["match_data"] = {
+            **duplicate["match_data"],
+            "candidate_name": candidate.get('name', 'N/A'),
+            "duplicate_of": name,
+        }
+    elif "match_data" not in duplicate:
+        duplicate["duplicate_of"] = name
+    return duplicate
+
 # ============================================================================
 # MAIN HEADER
 # ============================================================================
@@ -788,8 +864,11 @@ with col_right:
 
     if uploaded_file:
         try:
-            df = pd.read_excel(uploaded_file)
+            # Parsed once per distinct file, then opened from the columnar store
+            bank_id, df = get_resume_bank_store().ingest(uploaded_file.getvalue(), uploaded_file.name)
             st.session_state.resume_bank = df
+            st.session_state.resume_bank_id = bank_id
+            duplicate_count = sum(len(rows) for rows in duplicate_groups(get_bank_duplicates(bank_id, df)).values())
 
             st.markdown(f"""
                 <div class="success-box">
@@ -802,7 +881,7 @@ with col_right:
             # Display summary
             st.markdown("### 📊 Resume Bank Overview")
 
-            col1, col2, col3 = st.columns(3)
+            col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.markdown(f"""
                     <div class="metric-card">
@@ -829,6 +908,14 @@ with col_right:
                     </div>
                 """, unsafe_allow_html=True)
 
+            with col4:
+                st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-value">{duplicate_count}</div>
+                        <div class="metric-label">Duplicates</div>
+                    </div>
+                """, unsafe_allow_html=True)
+
             # Show data preview
             with st.expander("📋 View Resume Bank Data", expanded=False):
                 st.dataframe(df, use_container_width=True, height=400)
@@ -917,34 +1004,68 @@ if st.session_state.selected_job and st.session_state.resume_bank is not None:
             st.info("💻 Using local AI workflow for matching")
             llm = get_llm(temperature=0.1)
 
-        matches = []
+        def match_one(candidate):
+            # Use LangSmith if available, otherwise local
+            if use_langsmith:
+                return match_candidate_to_job_langsmith(langsmith_client, candidate, job)
+            return match_candidate_to_job_simple(llm, candidate, job)
 
-        for idx, row in df.iterrows():
-            progress = int(((idx + 1) / len(df)) * 100)
-            progress_bar.progress(progress / 100)
-            status_text.markdown(f"**🤖 Matching {idx+1}/{len(df)}:** {row.get('name', 'Unknown')}")
-
-            try:
-                candidate = row.to_dict()
-
-                # Use LangSmith if available, otherwise local
-                if use_langsmith:
-                    result = match_candidate_to_job_langsmith(langsmith_client, candidate, job)
-                    # LangSmith returns direct match data
-                    match_info = result
-                    match_info["candidate"] = candidate
-                    matches.append(match_info)
-                else:
-                    result = match_candidate_to_job_simple(llm, candidate, job)
-                    if result["success"]:
-                        match_info = result["match_data"]
-                        match_info["candidate"] = candidate
-                        matches.append(match_info)
-                    else:
-                        st.warning(f"⚠️ Failed to match {row.get('name', 'Unknown')}: {result['error']}")
+        def show_progress(outcome, completed, total):
+            progress_bar.progress(completed / total)
+            status_text.markdown(f"**🤖 Matched {completed}/{total}:** {outcome['candidate'].get('name', 'Unknown')}")
+
+        # Score one row per duplicate cluster and copy its result to rows with the same match inputs
+        candidates = df.to_dict('records')
+        representatives = match_representatives(
+            candidates, get_bank_duplicates(st.session_state.resume_bank_id, df)
+        )
+        unique_rows = [row for row, representative in enumerate(representatives) if row == representative]
+        if len(unique_rows) < len(candidates):
+            st.info(f"👥 {len(candidates) - len(unique_rows)} duplicate candidates will reuse their first entry's analysis")
+
+        engine = MatchingEngine(match_one, max_concurrency=get_concurrency_limiter().max_window)
+        unique_outcomes = dict(zip(
+            unique_rows,
+            engine.run([candidates[row] for row in unique_rows], on_result=show_progress),
+        ))
+
+        outcomes = []
+        for row, candidate in enumerate(candidates):
+            scored = unique_outcomes[representatives[row]]
+            if representatives[row] == row:
+                outcomes.append(scored)
+            else:
+                outcomes.append(MatchOutcome(
+                    index=row,
+                    candidate=candidate,
+                    result=copy_duplicate_result(scored["result"], scored["candidate"], candidate),
+                    error=scored["error"],
+                ))
+
+        matches = []
 
-            except Exception as e:
-                st.error(f"❌ Error matching {row.get('name', 'Unknown')}: {str(e)}")
+        for outcome in outcomes:
+            candidate = outcome["candidate"]
+
+            if outcome["error"] is not None:
+                st.error(f"❌ Error matching {candidate.get('name', 'Unknown')}: {outcome['error']}")
+                continue
+
+            result = outcome["result"]
+
+            if use_langsmith:
+                # LangSmith returns direct match data
+                if result["match_level"] == "Error":
+                    st.error(f"LangSmith API error for {candidate.get('name', 'Unknown')}: {result['reasoning']}")
+                match_info = result
+                match_info["candidate"] = candidate
+                matches.append(match_info)
+            elif result["success"]:
+                match_info = result["match_data"]
+                match_info["candidate"] = candidate
+                matches.append(match_info)
+            else:
+                st.warning(f"⚠️ Failed to match {candidate.get('name', 'Unknown')}: {result['error']}")
 
         progress_bar.empty()
         status_text.empty()
@@ -1004,6 +1125,8 @@ if st.session_state.matching_results:
 
         with col1:
             st.markdown(f"### {idx+1}. {candidate.get('name', 'N/A')}")
+            if match.get("duplicate_of"):
+                st.caption(f"👥 Duplicate of {match['duplicate_of']} - analysis reused")
             st.markdown(f"**Skills:** {candidate.get('skill_set', 'N/A')}")
             st.markdown(f"**Experience:** {candidate.get('exp_years', 'N/A')} years | **Domain:** {candidate.get('domain', 'N/A')}")
 
@@ -1063,7 +1186,8 @@ if st.session_state.matching_results:
             "Skill Match %": match.get('skill_match_percentage', 0),
             "Strengths": "; ".join(match.get("strengths", [])),
             "Gaps": "; ".join(match.get("gaps", [])),
-            "Reasoning": match.get("reasoning", "N/A")
+            "Reasoning": match.get("reasoning", "N/A"),
+            "Duplicate Of": match.get("duplicate_of", "")
         })
 
     export_df = pd.DataFrame(export_data)
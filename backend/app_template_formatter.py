@@ -20,8 +20,10 @@ from langchain_anthropic import ChatAnthropic
 
 from app.graphs.workflow import parse_resume_only
 from app.utils.file_processor import extract_text_from_file
+from app.utils.cost_estimator import DEFAULT_MAX_RUN_COST
+from app.prompts.utils import supports_prompt_caching
 from app.utils.document_generator import generate_enhanced_resume_docx
-from app.agents.template_formatter import format_resume_with_template
+from app.agents.template_formatter import format_resume_with_template, estimate_formatting_run
 
 # Load environment
 load_dotenv()
@@ -323,6 +325,24 @@ def get_llm(temperature=0.1):
         temperature=temperature,
     )
 
+def estimate_formatting_cost(uploaded_resumes):
+    """Pre-flight estimate of formatting the uploaded resumes (text extraction only, no AI call)"""
+    resume_texts = []
+    for resume_file in uploaded_resumes:
+        try:
+            # Extract from a copy so the upload can still be read when formatting
+            resume_texts.append(extract_text_from_file(BytesIO(resume_file.getvalue()), resume_file.name))
+        except Exception:
+            resume_texts.append("")
+    llm = get_llm(temperature=0.1)
+    return estimate_formatting_run(
+        llm.model,
+        st.session_state.template_text,
+        resume_texts,
+        st.session_state.get('template_instructions', None),
+        prompt_caching=supports_prompt_caching(llm),
+    )
+
 def process_uploaded_file(uploaded_file):
     """Process uploaded file and extract text"""
     try:
@@ -509,7 +529,32 @@ if st.session_state.template_uploaded:
         st.markdown('<div class="step-container">', unsafe_allow_html=True)
         st.markdown('<div class="step-title"><span class="step-number">3</span>Format Resumes</div>', unsafe_allow_html=True)
 
+        estimate_col, _ = st.columns([1, 3])
+        with estimate_col:
+            estimate_clicked = st.button("💰 Estimate Cost", use_container_width=True,
+                                         help="Project AI requests, tokens, cost and duration without calling the AI")
+        if estimate_clicked:
+            with st.spinner("Estimating..."):
+                estimate = estimate_formatting_cost(uploaded_resumes)
+            est_col1, est_col2, est_col3, est_col4 = st.columns(4)
+            est_col1.metric("AI Requests", f"{estimate['requests']:,}")
+            est_col2.metric("Tokens", f"{estimate['total_tokens']:,}")
+            est_col3.metric("Est. Cost", f"${estimate['cost']:.2f}" if estimate['priced'] else "n/a")
+            est_col4.metric("Est. Duration", f"{estimate['seconds'] / 60:.1f} min")
+            if not estimate['within_budget']:
+                st.error(f"🛑 Over the ${estimate['max_cost']:.2f} cap (LLM_MAX_RUN_COST) - formatting will be refused")
+
         if st.button("✨ Format All Resumes", type="primary", use_container_width=True):
+            if DEFAULT_MAX_RUN_COST is not None:
+                # Hard cap: check the projection before any AI call
+                estimate = estimate_formatting_cost(uploaded_resumes)
+                if not estimate['within_budget']:
+                    st.error(
+                        f"🛑 Projected cost ${estimate['cost']:.2f} exceeds the ${estimate['max_cost']:.2f} cap "
+                        f"(LLM_MAX_RUN_COST). Format fewer resumes or raise the cap."
+                    )
+                    st.stop()
+
             progress_bar = st.progress(0)
             status_text = st.empty()
             log_container = st.expander("📋 Processing Log (click to expand)", expanded=True)
@@ -10,7 +10,7 @@ import sys
 from pathlib import Path
 from datetime import datetime
 import json
-from io import BytesIO
+import time
 import traceback
 
 # Add project to path
@@ -38,12 +38,24 @@ try:
 except ImportError:
     LANGSMITH_AVAILABLE = False
 
-# Import rules engine
-try:
-    from app.utils.rules_engine import get_rules_engine
-    RULES_ENGINE_AVAILABLE = True
-except ImportError:
-    RULES_ENGINE_AVAILABLE = False
+# Import matching engine
+from app.utils.candidate_matching import (
+    match_resume_bank, match_resume_bank_to_jobs, rematch_resume_bank, rescore_results,
+    estimate_resume_bank_matching, DEFAULT_BATCH_TOKEN_BUDGET, match_prompt_version
+)
+from app.utils.cost_estimator import BudgetExceededError, DEFAULT_MAX_RUN_COST
+from app.utils.rules_engine import get_rules_engine
+from app.utils.concurrency import get_concurrency_limiter
+from app.utils.token_usage import get_token_usage_tracker
+from app.utils.lexical_index import ResumeBankIndex
+from app.utils.match_cache import MatchResultCache, describe_llm
+from app.utils.match_stream import MatchStream, summarize_results
+from app.utils.resume_bank import ResumeBankStore
+from app.utils.match_export import (
+    EXPORT_FORMATS, EXPORT_MIME_TYPES, ranked_outcome_rows, result_rows, start_export, read_export, discard_export
+)
+from app.utils.results_view import COMPATIBLE, MISMATCH, get_results_view
+from app.utils.results_store import MatchRunStore, make_run_key, COMPLETE, RUNNING
 
 # ============================================================================
 # PAGE CONFIG
@@ -404,6 +416,16 @@ if 'matching_results' not in st.session_state:
     st.session_state.matching_results = []
 if 'selected_job' not in st.session_state:
     st.session_state.selected_job = None
+if 'match_run' not in st.session_state:
+    st.session_state.match_run = None
+if 'score_matrix' not in st.session_state:
+    st.session_state.score_matrix = None
+if 'resume_bank_id' not in st.session_state:
+    st.session_state.resume_bank_id = None
+if 'match_export' not in st.session_state:
+    st.session_state.match_export = None
+if 'results_view' not in st.session_state:
+    st.session_state.results_view = None
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -417,6 +439,92 @@ def get_llm(temperature=0.1):
         temperature=temperature,
     )
 
+@st.cache_resource(show_spinner=False)
+def get_bank_index(bank_id, _resume_bank):
+    """Get cached lexical index for a stored resume bank"""
+    return ResumeBankIndex(_resume_bank)
+
+@st.cache_resource
+def get_resume_bank_store():
+    """Get process-wide resume bank store"""
+    return ResumeBankStore()
+
+@st.cache_resource
+def get_match_cache():
+    """Get process-wide match result cache"""
+    return MatchResultCache()
+
+@st.cache_resource
+def get_match_run_store():
+    """Get process-wide store of matching runs shared across sessions"""
+    return MatchRunStore()
+
+# Seconds between progress checks while following another session's run
+RUN_POLL_SECONDS = 1.0
+
+def run_shared_match(run_key, candidates, start_run, on_result, rules_version, force=False):
+    """
+    Load, follow or run the shared matching run for run_key
+
+    A finished run is loaded, a run in progress in another session is
+    followed until it finishes, and otherwise this session claims the run and
+    becomes its only writer. force re-runs a finished run.
+
+    Args:
+        run_key: Key from make_run_key
+        candidates: Resume bank rows the run scores
+        start_run: Function starting the run, called with the on_result callback
+        on_result: Progress callback (outcome, completed_count, total_count)
+        rules_version: Rules version the outcomes are scored with
+        force: Replace a finished run
+
+    Returns:
+        Tuple of (outcomes, rules version the outcomes were scored with)
+    """
+    store = get_match_run_store()
+    while True:
+        run = store.get_run(run_key)
+        if run is not None and run['status'] == COMPLETE and not force:
+            # Stored in completion order; callers (e.g. rematching) expect resume bank row order
+            outcomes = sorted(store.outcomes(run_key, candidates), key=lambda outcome: outcome['index'])
+            return outcomes, run['metadata'].get('rules_version')
+
+        if run is not None and run['status'] == RUNNING:
+            st.caption("👥 Following a matching run already in progress in another session")
+            seen = 0
+            while run is not None and run['status'] == RUNNING:
+                for outcome in store.outcomes(run_key, candidates, after=seen):
+                    seen += 1
+                    on_result(outcome, seen, run['total'])
+                time.sleep(RUN_POLL_SECONDS)
+                run = store.get_run(run_key)
+            force = False
+            continue
+
+        owner = store.claim(run_key, len(candidates), {'rules_version': rules_version}, force=force)
+        if owner is None:
+            # Another session claimed it first
+            force = False
+            continue
+
+        with store.hold(run_key, owner) as lost:
+            def record_result(outcome, completed, total):
+                # Once another session owns the run, keep this session's results to itself
+                if not lost.is_set() and not store.record(run_key, owner, outcome, completed):
+                    lost.set()
+                on_result(outcome, completed, total)
+
+            try:
+                outcomes = start_run(record_result)
+            except BaseException as e:
+                # Also covers Streamlit stopping the script: let other sessions take over
+                store.fail(run_key, owner, str(e) or type(e).__name__)
+                raise
+
+        if lost.is_set() or not store.complete(run_key, owner, outcomes):
+            st.caption("👥 Another session took over this matching run; showing this session's results")
+        return outcomes, rules_version
+
 def get_match_score_class(score):
     """Get CSS class based on match score"""
     if score >= 85:
@@ -440,6 +548,156 @@ def get_recommendation_class(recommendation):
     else:
         return "rec-reject"
 
+def match_card_html(result):
+    """Build the grid card HTML for a compatible candidate match"""
+    candidate = result.get('candidate', {})
+    score = result.get('match_score', 0)
+    recommendation = result.get('recommendation', 'REVIEW')
+    strengths = result.get('strengths', [])
+    gaps = result.get('gaps', [])
+
+    score_class = get_match_score_class(score)
+    rec_class = get_recommendation_class(recommendation)
+
+    # Build the gaps HTML if gaps exist
+    gaps_html = ""
+    if gaps:
+        gaps_items = "<br>".join([f"• {g}" for g in gaps[:3]])
+        gaps_html = f'<div class="match-gaps"><strong>⚠️ Gaps:</strong><br>{gaps_items}</div>'
+
+    # Local skill coverage against the job's required skills
+    coverage_html = ""
+    overlap = result.get('skill_overlap')
+    if overlap:
+        required_count = len(overlap['matched']) + len(overlap['missing'])
+        coverage_html = f'<span class="location-badge">🧩 {len(overlap["matched"])}/{required_count} required skills</span>'
+    if result.get('duplicate_of'):
+        coverage_html += f'<span class="location-badge">👥 Duplicate of {result["duplicate_of"]}</span>'
+
+    # Build the card HTML
+    return f'''<div class="match-card-grid">
+    <div class="match-score-badge {score_class}">{score}</div>
+    <div class="candidate-name">{candidate.get('name', 'Unknown')}</div>
+    <div class="candidate-meta">
+        {candidate.get('domain', 'N/A')} • {candidate.get('exp_years', 'N/A')} years<br>
+        <span class="location-badge">{candidate.get('location_preference', 'Flexible')}</span>
+        <span class="location-badge">{candidate.get('location', 'N/A')}</span>
+        {coverage_html}
+    </div>
+    <div class="match-strengths">
+        <strong>✅ Strengths:</strong><br>
+        {"<br>".join([f"• {s}" for s in strengths[:3]])}
+    </div>
+    {gaps_html}
+    <div class="rec-badge {rec_class}">{recommendation}</div>
+</div>'''
+
+def mismatch_card_html(result, job_location_type):
+    """Build the grid card HTML for a location or work authorization mismatch"""
+    candidate = result.get('candidate', {})
+    score = result.get('match_score', 0)
+    score_without_location = result.get('score_without_deal_breakers', score)
+    location_score = result.get('location_score', 0)
+    strengths = result.get('strengths', [])
+    gaps = result.get('gaps', [])
+
+    candidate_pref = candidate.get('location_preference', 'Flexible')
+    willing_relocate = str(candidate.get('willing_to_relocate', 'No')).lower() in ['yes', 'true', '1']
+
+    # Force score to show location penalty
+    score_class = "score-poor"
+    rec_class = "rec-reject"
+
+    # Get potential score color (not scored when excluded before the AI call)
+    if score_without_location is None:
+        score_without_location = "N/A"
+        potential_score_class = "score-moderate"
+    else:
+        potential_score_class = get_match_score_class(score_without_location)
+
+    mismatch_label = "WORK AUTH MISMATCH" if result.get('exclusion_reason') == "work_authorization" else "LOCATION MISMATCH"
+
+    # Build gaps HTML
+    gaps_html = ""
+    if gaps:
+        gaps_items = "<br>".join([f"• {g}" for g in gaps[:2]])
+        gaps_html = f'<div class="match-gaps"><strong>⚠️ Additional Gaps:</strong><br>{gaps_items}</div>'
+
+    # Build relocation text
+    relocation_text = '✅ Willing to relocate' if willing_relocate else '❌ Not willing to relocate'
+
+    # Build the card HTML
+    return f'''<div class="match-card-grid" style="border: 2px solid #dc2626; opacity: 0.85;">
+    <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 0.5rem;">
+        <div class="match-score-badge {score_class}" style="background: #dc2626; font-size: 1.2rem;">
+            {score}<div style="font-size: 0.55rem; margin-top: 0.2rem;">ACTUAL</div>
+        </div>
+        <div class="match-score-badge {potential_score_class}" style="font-size: 1rem; padding: 0.4rem 0.6rem;">
+            {score_without_location}<div style="font-size: 0.55rem; margin-top: 0.2rem;">POTENTIAL</div>
+        </div>
+    </div>
+    <div class="candidate-name">{candidate.get('name', 'Unknown')}</div>
+    <div class="candidate-meta">
+        {candidate.get('domain', 'N/A')} • {candidate.get('exp_years', 'N/A')} years<br>
+        <span class="location-badge" style="background: #fee2e2; color: #7f1d1d; border: 1px solid #dc2626;">
+            ❌ Prefers: {candidate_pref}
+        </span>
+        <span class="location-badge">{candidate.get('location', 'N/A')}</span>
+    </div>
+    <div style="background: #fee2e2; padding: 0.5rem; border-radius: 4px; border-left: 3px solid #dc2626; margin: 0.5rem 0; font-size: 0.75rem;">
+        <strong>🚫 Location Penalty: -{round((100 - location_score) * 0.20, 1)} pts</strong><br>
+        Job needs <strong>{job_location_type}</strong>, wants <strong>{candidate_pref}</strong><br>
+        {relocation_text}
+    </div>
+    <div class="match-strengths">
+        <strong>✅ Skills Match:</strong><br>
+        {"<br>".join([f"• {s}" for s in strengths[:3]])}
+    </div>
+    {gaps_html}
+    <div class="rec-badge {rec_class}">{mismatch_label}</div>
+</div>'''
+
+def compact_html(html):
+    """Join a card's lines so markdown never reads indentation or blank lines as text blocks"""
+    return " ".join(line.strip() for line in html.splitlines() if line.strip())
+
+CARD_RENDERERS = {
+    COMPATIBLE: lambda result: compact_html(match_card_html(result)),
+    MISMATCH: lambda result: compact_html(
+        mismatch_card_html(result, st.session_state.selected_job.get('location_type', 'Remote'))
+    ),
+}
+
+def render_card_page(fragments):
+    """Render prebuilt card HTML fragments as one grid element"""
+    if fragments:
+        st.markdown(f'<div class="match-grid">{"".join(fragments)}</div>', unsafe_allow_html=True)
+
+def render_card_grid(results):
+    """Render match cards in a grid"""
+    render_card_page([CARD_RENDERERS[COMPATIBLE](result) for result in results])
+
+def render_results_page(view, category, page_size, min_score, query):
+    """Render one page of a results category with its pager (only that page's cards are built)"""
+    key = f"results_page_{category}"
+    fragments, pages, total = view.page(category, st.session_state.get(key, 1), page_size, min_score, query)
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    page = st.session_state.get(key, 1)
+
+    if not total:
+        st.info("No candidates match the current filters")
+        return
+    render_card_page(fragments)
+
+    pager_col1, pager_col2 = st.columns([1, 4])
+    with pager_col1:
+        if pages > 1:
+            st.number_input("Page", min_value=1, max_value=pages, step=1, key=key)
+    with pager_col2:
+        first = (page - 1) * page_size + 1
+        st.caption(f"Showing {first}-{min(page * page_size, total)} of {total} · page {page}/{pages}")
+
 def create_job_position_dict(title, department, required_skills, experience_years,
                             location, job_type, description, location_type="Remote",
                             sponsorship_policy="full_sponsorship"):
@@ -458,209 +716,6 @@ def create_job_position_dict(title, department, required_skills, experience_year
         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
-def prepare_job_description(job):
-    """Convert job dict to text description for AI"""
-    skills_text = ", ".join(job["required_skills"])
-    return f"""
-Job Title: {job["title"]}
-Department: {job["department"]}
-Required Experience: {job["experience_years"]} years
-Location: {job["location"]}
-Location Type: {job.get("location_type", "Remote")}
-Job Type: {job["job_type"]}
-Required Skills: {skills_text}
-Description: {job["description"]}
-"""
-
-def prepare_candidate_description(candidate):
-    """Convert candidate dict to text description for AI"""
-    return f"""
-Candidate Name: {candidate.get('name', 'N/A')}
-Skills: {candidate.get('skill_set', 'N/A')}
-Experience: {candidate.get('exp_years', 'N/A')} years
-Domain: {candidate.get('domain', 'N/A')}
-Previous Roles: {candidate.get('previous_roles', 'N/A')}
-Education: {candidate.get('education', 'N/A')}
-Current Location: {candidate.get('location', 'N/A')}
-Location Preference: {candidate.get('location_preference', 'Flexible')}
-Willing to Relocate: {candidate.get('willing_to_relocate', 'Unknown')}
-Work Authorization: {candidate.get('work_authorization', 'Not Specified')}
-"""
-
-def match_candidate_to_job_simple(llm, candidate, job):
-    """
-    Enhanced matching with deal-breaker filtering and weighted scoring
-
-    NEW ALGORITHM (v2.0):
-    - Job Title Match: 35%
-    - Skills Match: 30%
-    - Experience: 20%
-    - Profile Description Match: 15%
-
-    DEAL BREAKERS (must pass or excluded):
-    - Location compatibility
-    - Work authorization
-    """
-    from langchain_core.messages import HumanMessage
-
-    # Get rules engine
-    if RULES_ENGINE_AVAILABLE:
-        rules_engine = get_rules_engine()
-        weights = rules_engine.get_matching_weights()
-    else:
-        weights = {
-            "job_title_match": 0.35,
-            "skills": 0.30,
-            "experience": 0.20,
-            "profile_description_match": 0.15
-        }
-
-    # STEP 1: Check Deal Breakers
-    exclusion_reason = None
-
-    # Check work authorization (DEAL BREAKER)
-    candidate_work_auth = candidate.get('work_authorization', 'Not Specified')
-    job_sponsorship = job.get('sponsorship_policy', 'full_sponsorship')
-
-    work_auth_passes = True
-    work_auth_reasoning = ""
-
-    if RULES_ENGINE_AVAILABLE and candidate_work_auth != 'Not Specified':
-        work_auth_passes, work_auth_reasoning = rules_engine.check_work_authorization(
-            candidate_work_auth, job_sponsorship
-        )
-        if not work_auth_passes:
-            exclusion_reason = "work_authorization"
-
-    # Check location compatibility (DEAL BREAKER)
-    job_location = job.get('location_type', 'Remote')
-    candidate_pref = candidate.get('location_preference', 'Flexible')
-    willing_relocate = str(candidate.get('willing_to_relocate', 'No')).lower() in ['yes', 'true', '1']
-
-    location_passes = True
-    location_score = 100
-    location_reasoning = ""
-
-    if RULES_ENGINE_AVAILABLE:
-        location_score, location_reasoning, location_passes = rules_engine.get_location_compatibility_score(
-            job_location, candidate_pref, willing_relocate
-        )
-    else:
-        # Fallback logic
-        if job_location == candidate_pref or candidate_pref == 'Flexible':
-            location_score = 100
-            location_passes = True
-        elif job_location == 'Onsite' and candidate_pref == 'Remote':
-            location_score = 30
-            location_passes = False if not willing_relocate else True
-        else:
-            location_score = 70
-            location_passes = True
-
-    if not location_passes and not exclusion_reason:
-        exclusion_reason = "location_mismatch"
-
-    # STEP 2: Ask AI to score components
-    prompt = f"""
-You are an expert recruiter. Score this candidate against the job.
-
-CANDIDATE:
-{prepare_candidate_description(candidate)}
-
-JOB:
-{prepare_job_description(job)}
-
-Score these components (0-100 each):
-1. JOB TITLE MATCH ({weights['job_title_match']:.0%}): How well does candidate's current/previous titles align with this job title?
-2. SKILLS MATCH ({weights['skills']:.0%}): Technical skills from job description match
-3. EXPERIENCE ({weights['experience']:.0%}): Years and domain relevance
-4. PROFILE DESCRIPTION MATCH ({weights['profile_description_match']:.0%}): Overall profile narrative alignment with job description
-
-Return ONLY valid JSON:
-{{
-  "job_title_match_score": 0-100,
-  "skills_score": 0-100,
-  "experience_score": 0-100,
-  "profile_description_match_score": 0-100,
-  "strengths": ["strength1", "strength2", "strength3"],
-  "gaps": ["gap1", "gap2"],
-  "reasoning": "Brief explanation"
-}}
-"""
-
-    messages = [HumanMessage(content=prompt)]
-    response = llm.invoke(messages)
-
-    try:
-        ai_result = json.loads(response.content)
-
-        # STEP 3: Calculate weighted scores
-        component_scores = {
-            "job_title_match": ai_result.get("job_title_match_score", 50),
-            "skills": ai_result.get("skills_score", 50),
-            "experience": ai_result.get("experience_score", 50),
-            "profile_description_match": ai_result.get("profile_description_match_score", 50)
-        }
-
-        # Calculate overall score
-        overall_score = sum(component_scores[k] * weights[k] for k in component_scores.keys())
-
-        # Calculate "potential" score - shows skills-based match even if deal breakers fail
-        score_without_deal_breakers = overall_score
-
-        # STEP 4: Get recommendation
-        if RULES_ENGINE_AVAILABLE:
-            rec_info = rules_engine.get_recommendation(overall_score)
-            recommendation = rec_info['recommendation']
-        else:
-            if overall_score >= 85:
-                recommendation = "STRONG HIRE"
-            elif overall_score >= 75:
-                recommendation = "RECOMMENDED"
-            elif overall_score >= 65:
-                recommendation = "CONSIDER"
-            elif overall_score >= 50:
-                recommendation = "WEAK MATCH"
-            else:
-                recommendation = "NOT RECOMMENDED"
-
-        # STEP 5: Return result with exclusion info
-        return {
-            "match_score": round(overall_score, 1),
-            "score_without_deal_breakers": round(score_without_deal_breakers, 1),
-            "component_scores": component_scores,
-            "recommendation": recommendation,
-            "strengths": ai_result.get("strengths", []),
-            "gaps": ai_result.get("gaps", []),
-            "reasoning": ai_result.get("reasoning", ""),
-            # Deal breaker info
-            "excluded": exclusion_reason is not None,
-            "exclusion_reason": exclusion_reason,
-            "location_score": location_score,
-            "location_reasoning": location_reasoning,
-            "location_passes": location_passes,
-            "work_auth_passes": work_auth_passes,
-            "work_auth_reasoning": work_auth_reasoning
-        }
-    except Exception as e:
-        st.error(f"Matching error: {str(e)}")
-        return {
-            "match_score": 50,
-            "score_without_deal_breakers": 50,
-            "component_scores": {},
-            "recommendation": "REVIEW REQUIRED",
-            "strengths": ["Unable to parse AI response"],
-            "gaps": [],
-            "reasoning": f"Error: {str(e)}",
-            "excluded": False,
-            "exclusion_reason": None,
-            "location_score": 50,
-            "location_reasoning": "Error",
-            "location_passes": True,
-            "work_auth_passes": True,
-            "work_auth_reasoning": "Error"
-        }
-
 # ============================================================================
 # COMPACT HEADER
 # ============================================================================
@@ -678,16 +733,92 @@ st.markdown('''
 # STATS BAR
 # ============================================================================
 
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("Jobs", len(st.session_state.job_positions), delta=None)
-with col2:
-    st.metric("Candidates", len(st.session_state.resume_bank) if st.session_state.resume_bank is not None else 0)
-with col3:
-    st.metric("Matches", len(st.session_state.matching_results))
-with col4:
-    avg_score = sum([r.get('match_score', 0) for r in st.session_state.matching_results]) / len(st.session_state.matching_results) if st.session_state.matching_results else 0
-    st.metric("Avg Score", f"{avg_score:.0f}")
+def start_match_export(sheets, export_format, file_stem, origin):
+    """Start writing an export in the background; the download appears once it is ready"""
+    previous = st.session_state.match_export
+    if previous is not None and previous['data'] is None:
+        # Its file has not been read yet: delete it once written
+        discard_export(previous['future'])
+
+    st.session_state.match_export = {
+        'origin': origin,
+        'future': start_export(sheets, export_format),
+        'data': None,
+        'format': export_format,
+        'file_name': f"{file_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}",
+    }
+
+
+def render_match_export(origin):
+    """Show the state of the latest export started from origin: progress note, error or download button"""
+    export = st.session_state.match_export
+    if export is None or export['origin'] != origin:
+        return
+
+    future = export['future']
+    if export['data'] is None:
+        if not future.done():
+            st.info("⏳ Preparing export in the background...")
+            st.button("🔄 Check Export", key=f"check_export_{origin}")
+            return
+        if future.exception() is not None:
+            st.error(f"❌ Export failed: {future.exception()}")
+            st.session_state.match_export = None
+            return
+        # The temporary file is deleted once read; later reruns reuse the bytes
+        export['data'] = read_export(future)
+
+    st.download_button(
+        label=f"⬇️ Download {export['format'].upper()}",
+        data=export['data'],
+        file_name=export['file_name'],
+        mime=EXPORT_MIME_TYPES[export['format']],
+    )
+
+
+def render_run_estimate(estimate):
+    """Show a pre-flight estimate: requests, tokens, cost, duration and where calls were saved"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("AI Requests", f"{estimate['requests']:,}")
+    with col2:
+        st.metric("Tokens", f"{estimate['total_tokens']:,}",
+                  help=f"{estimate['input_tokens']:,} in ({estimate['cached_input_tokens']:,} read from and "
+                       f"{estimate['cache_write_input_tokens']:,} written to prompt cache) "
+                       f"/ {estimate['output_tokens']:,} out")
+    with col3:
+        st.metric("Est. Cost", f"${estimate['cost']:.2f}" if estimate['priced'] else "n/a")
+    with col4:
+        st.metric("Est. Duration", f"{estimate['seconds'] / 60:.1f} min",
+                  help=f"At {estimate['concurrency']} concurrent requests")
+
+    skipped = {reason.replace('_', ' '): count for reason, count in estimate['skipped'].items() if count}
+    if skipped:
+        st.caption("Settled without AI: " + ", ".join(f"{count:,} {reason}" for reason, count in skipped.items())
+                   + f" · cache hit rate {estimate['cache_hit_rate']:.0%}")
+    if not estimate['priced']:
+        st.warning(f"No pricing for model {estimate['model']}; cost cannot be estimated")
+    elif not estimate['within_budget']:
+        st.error(f"🛑 Over the ${estimate['max_cost']:.2f} cap - the run will be refused")
+
+
+def render_stats_bar(container, match_count, avg_score, excluded_count):
+    """Render the stats bar into a placeholder (updated live while matching)"""
+    with container.container():
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric("Jobs", len(st.session_state.job_positions), delta=None)
+        with col2:
+            st.metric("Candidates", len(st.session_state.resume_bank) if st.session_state.resume_bank is not None else 0)
+        with col3:
+            st.metric("Matches", match_count)
+        with col4:
+            st.metric("Avg Score", f"{avg_score:.0f}")
+        with col5:
+            st.metric("Excluded", excluded_count, help="Failed a deal breaker (not counted in matches or the average)")
+
+stats_bar = st.empty()
+render_stats_bar(stats_bar, *summarize_results(st.session_state.matching_results))
 
 # ============================================================================
 # MAIN LAYOUT - 2 COLUMNS
@@ -792,12 +923,28 @@ with col_right:
 
     st.markdown('<div class="info-box-compact"><strong>📋 Required columns:</strong> name, skill_set, exp_years, domain<br><strong>Optional:</strong> location_preference, willing_to_relocate</div>', unsafe_allow_html=True)
 
-    uploaded_file = st.file_uploader("Upload Excel (.xlsx)", type=['xlsx', 'xls'], label_visibility="collapsed")
+    uploaded_file = st.file_uploader("Upload Excel (.xlsx) or CSV", type=['xlsx', 'xls', 'csv'], label_visibility="collapsed")
+    bank_store = get_resume_bank_store()
+
+    if not uploaded_file and st.session_state.resume_bank is None:
+        stored_banks = bank_store.list_banks()
+        if stored_banks:
+            bank_choice = st.selectbox(
+                "Or open a stored bank",
+                [None] + stored_banks,
+                format_func=lambda b: "—" if b is None else f"{b['filename']} ({b['rows']} candidates)",
+            )
+            if bank_choice is not None:
+                st.session_state.resume_bank = bank_store.load(bank_choice['bank_id'])
+                st.session_state.resume_bank_id = bank_choice['bank_id']
+                st.rerun()
 
     if uploaded_file:
         try:
-            df = pd.read_excel(uploaded_file)
+            # Parsed once per distinct file, then opened from the columnar store
+            bank_id, df = bank_store.ingest(uploaded_file.getvalue(), uploaded_file.name)
             st.session_state.resume_bank = df
+            st.session_state.resume_bank_id = bank_id
             st.success(f"✅ Loaded {len(df)} candidates")
 
             # Show preview
@@ -812,103 +959,316 @@ with col_right:
 # MATCHING RESULTS - FULL WIDTH GRID
 # ============================================================================
 
+# ============================================================================
+# MATCH ALL POSITIONS - CANDIDATE x JOB SCORE MATRIX
+# ============================================================================
+
+if st.session_state.resume_bank is not None and (st.session_state.job_positions or st.session_state.selected_job):
+    st.markdown("---")
+
+    # Matching options shared by single-job and all-position runs
+    with st.expander("⚙️ Matching Options", expanded=False):
+        opt_col1, opt_col2, opt_col3 = st.columns(3)
+        with opt_col1:
+            score_excluded = st.checkbox(
+                "Score excluded candidates (show potential score)",
+                value=False,
+                help="Candidates failing location or work authorization are skipped without an AI call unless this is checked"
+            )
+            batch_requests = st.checkbox(
+                "Batch candidates per AI request",
+                value=False,
+                help="Score several candidates in one request, sending the job description once"
+            )
+            deduplicate = st.checkbox(
+                "Score duplicate candidates once",
+                value=True,
+                help="Rows with the same email or phone, or the same name and near-identical skills and roles, share one AI score"
+            )
+        with opt_col2:
+            shortlist_size = st.number_input(
+                "Shortlist top K (0 = all)", min_value=0, value=0, step=10,
+                help="Only the K best keyword matches on skills, roles and domain are sent for AI scoring"
+            )
+            hybrid_scoring = st.checkbox(
+                "Hybrid scoring (local skills & experience)",
+                value=False,
+                help="Skills and experience are scored locally from the skill dictionary and experience rules; AI only scores job title and profile fit"
+            )
+        with opt_col3:
+            min_lexical_score = st.number_input(
+                "Min keyword score", min_value=0.0, value=0.0, step=0.5,
+                help="Candidates below this BM25 keyword score are not sent for AI scoring"
+            )
+            max_run_cost = st.number_input(
+                "Max run cost ($, 0 = no cap)", min_value=0.0, value=DEFAULT_MAX_RUN_COST or 0.0, step=1.0,
+                help="Runs whose projected AI cost is above this are refused before any AI call"
+            )
+            concurrency = get_concurrency_limiter().snapshot()
+            usage = get_token_usage_tracker().snapshot()
+            st.caption(
+                f"⚙️ AI concurrency window: {concurrency['window']:.0f} "
+                f"({concurrency['in_flight']} in flight, {concurrency['rate_limited']} rate-limited calls) · "
+                f"prompt cache reads {usage['cache_read_rate']:.0%} of {usage['input_tokens']:,} input tokens"
+            )
+
+    match_options = dict(
+        score_excluded=score_excluded,
+        top_k=shortlist_size or None,
+        min_lexical_score=min_lexical_score,
+        cache=get_match_cache(),
+        # The shared adaptive limiter decides how many of these threads call the AI at once
+        max_concurrency=get_concurrency_limiter().max_window,
+        batch_token_budget=DEFAULT_BATCH_TOKEN_BUDGET if batch_requests else None,
+        scoring_mode="hybrid" if hybrid_scoring else "llm",
+        deduplicate=deduplicate,
+        max_cost=max_run_cost or None,
+    )
+    rules_version = get_rules_engine().get_rules_version()
+
+    # All positions when several exist (Match All), otherwise the selected one
+    estimate_jobs = [st.session_state.selected_job] if len(st.session_state.job_positions) < 2 and st.session_state.selected_job else st.session_state.job_positions
+    if st.button(
+        f"💰 Estimate Cost ({len(estimate_jobs)} position{'s' if len(estimate_jobs) > 1 else ''})",
+        help="Project AI requests, tokens, cost and duration for these options without calling the AI"
+    ):
+        with st.spinner("Estimating..."):
+            estimate = estimate_resume_bank_matching(
+                get_llm(),
+                st.session_state.resume_bank,
+                estimate_jobs,
+                index=get_bank_index(st.session_state.resume_bank_id, st.session_state.resume_bank) if shortlist_size or min_lexical_score else None,
+                **match_options,
+            )
+        render_run_estimate(estimate)
+
+    if len(st.session_state.job_positions) > 1 and st.button(
+        f"🧮 Match All {len(st.session_state.job_positions)} Positions",
+        help="Score every candidate against every open position in one run"
+    ):
+        progress_bar = st.progress(0.0, text="🤖 AI is analyzing candidates for all positions...")
+        try:
+            matrix = match_resume_bank_to_jobs(
+                get_llm(),
+                st.session_state.resume_bank,
+                st.session_state.job_positions,
+                index=get_bank_index(st.session_state.resume_bank_id, st.session_state.resume_bank) if shortlist_size or min_lexical_score else None,
+                on_progress=lambda done, total: progress_bar.progress(done / total),
+                **match_options,
+            )
+        except BudgetExceededError as e:
+            progress_bar.empty()
+            st.error(f"🛑 {e}")
+            render_run_estimate(e.estimate)
+            st.stop()
+        progress_bar.empty()
+
+        failed = sum(1 for job_outcomes in matrix.outcomes for outcome in job_outcomes if outcome['error'] is not None)
+        if failed:
+            st.error(f"❌ {failed} candidate-job pairs could not be scored")
+
+        st.session_state.score_matrix = {
+            'bank': st.session_state.resume_bank,
+            'matrix': matrix,
+            'rules_version': rules_version,
+        }
+        # Let the selected job pick up its column of the new matrix
+        st.session_state.match_run = None
+
+    score_matrix = st.session_state.score_matrix
+    if score_matrix is not None and not score_matrix['bank'].equals(st.session_state.resume_bank):
+        # The matrix belongs to a previous upload
+        score_matrix = st.session_state.score_matrix = None
+
+    if score_matrix is not None:
+        if score_matrix['rules_version'] != rules_version:
+            rescore_results(score_matrix['matrix'].results())
+            score_matrix['matrix'].refresh()
+            score_matrix['rules_version'] = rules_version
+
+        with st.expander("📊 Cross-Position View", expanded=True):
+            tab_best, tab_matrix = st.tabs(["🏆 Best Position per Candidate", "🧮 Score Matrix"])
+            with tab_best:
+                st.dataframe(
+                    score_matrix['matrix'].best_job_per_candidate(),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "candidate": "Candidate",
+                        "best_job": "Best Position",
+                        "best_score": st.column_config.NumberColumn("Score", format="%.1f"),
+                        "eligible_jobs": "Eligible Positions",
+                    },
+                )
+            with tab_matrix:
+                st.dataframe(score_matrix['matrix'].to_frame().round(1), use_container_width=True)
+            st.caption("Blank cells were not AI scored (deal breaker, not shortlisted or error). Use 🎯 Match on a position to see its candidate cards.")
+
+            matrix_export_col1, matrix_export_col2 = st.columns([1, 3])
+            with matrix_export_col1:
+                matrix_export_format = st.selectbox("Export format", EXPORT_FORMATS, key="export_format_matrix")
+            with matrix_export_col2:
+                st.write("")
+                if st.button("📥 Export All Positions", help="One sheet per position for Excel; a Job column for CSV and Parquet"):
+                    matrix = score_matrix['matrix']
+                    start_match_export(
+                        # Rows are sorted lazily, in the export thread
+                        [
+                            (job['title'], ranked_outcome_rows(job_outcomes))
+                            for job, job_outcomes in zip(matrix.jobs, matrix.outcomes)
+                        ],
+                        matrix_export_format,
+                        "matches_all_positions",
+                        origin="matrix",
+                    )
+            render_match_export("matrix")
+
 if st.session_state.selected_job and st.session_state.resume_bank is not None:
     st.markdown("---")
     st.markdown(f"### 🎯 Matching Results for: {st.session_state.selected_job['title']}")
 
-    # Run matching
-    if not st.session_state.matching_results or st.button("🔄 Refresh Matches"):
-        with st.spinner("🤖 AI is analyzing candidates..."):
-            llm = get_llm()
-            results = []
+    match_run = st.session_state.match_run
+    resume_bank = st.session_state.resume_bank
+    refresh = st.button("🔄 Refresh Matches")
+    job_changed = match_run is None or match_run['job_id'] != st.session_state.selected_job['id']
+
+    outcomes = None
+    if not refresh and job_changed and score_matrix is not None:
+        # Reuse this job's column of the all-positions run
+        outcomes = score_matrix['matrix'].job_outcomes(st.session_state.selected_job['id'])
+
+    # Stream results into the page as they finish instead of waiting for the whole run
+    live_results = st.empty()
+    stream = MatchStream()
+    last_render = {'at': 0.0}
+
+    def stream_result(outcome, completed, total):
+        stream.add(outcome)
+        now = time.monotonic()
+        if completed < total and now - last_render['at'] < 0.5:
+            return
+        last_render['at'] = now
+
+        render_stats_bar(stats_bar, stream.matches, stream.average_score, stream.excluded)
+        top_matches = stream.top()
+        with live_results.container():
+            st.progress(completed / total, text=f"🤖 AI is analyzing candidates... {completed}/{total}")
+            if top_matches:
+                st.markdown(f"#### ⚡ Top Matches So Far ({len(top_matches)})")
+                render_card_grid(top_matches)
+
+    outcomes_rules_version = rules_version
+    llm = get_llm()
+    run_key = None
+    if st.session_state.resume_bank_id is not None:
+        run_key = make_run_key(
+            st.session_state.resume_bank_id,
+            st.session_state.selected_job,
+            match_options,
+            *describe_llm(llm),
+            match_prompt_version(),
+        )
+
+    start_run = None
+    if outcomes is None and (refresh or job_changed):
+        def start_run(on_result):
+            return match_resume_bank(
+                llm,
+                resume_bank,
+                st.session_state.selected_job,
+                index=get_bank_index(st.session_state.resume_bank_id, resume_bank) if shortlist_size or min_lexical_score else None,
+                on_result=on_result,
+                **match_options,
+            )
+    elif outcomes is None and match_run['bank'] is not resume_bank and not match_run['bank'].equals(resume_bank):
+        # Resume bank was re-uploaded: only score added and changed candidates
+        def start_run(on_result):
+            return rematch_resume_bank(
+                llm,
+                resume_bank,
+                st.session_state.selected_job,
+                match_run['bank'],
+                match_run['outcomes'],
+                on_result=on_result,
+                **match_options,
+            )
+
+    try:
+        if start_run is not None and run_key is not None:
+            # Shared with every session matching the same bank snapshot and job
+            outcomes, outcomes_rules_version = run_shared_match(
+                run_key, resume_bank.to_dict('records'), start_run, stream_result, rules_version, force=refresh
+            )
+        elif start_run is not None:
+            outcomes = start_run(stream_result)
+    except BudgetExceededError as e:
+        live_results.empty()
+        st.error(f"🛑 {e}")
+        render_run_estimate(e.estimate)
+        st.stop()
+    live_results.empty()
+
+    if outcomes is not None:
+        st.session_state.match_run = {
+            'job_id': st.session_state.selected_job['id'],
+            'bank': resume_bank,
+            'outcomes': outcomes,
+            'rules_version': outcomes_rules_version,
+        }
+
+        results = []
+        for outcome in outcomes:
+            if outcome['error'] is not None:
+                st.error(f"Error matching {outcome['candidate'].get('name', 'Unknown')}: {outcome['error']}")
+                continue
+            result = outcome['result']
+            result['candidate'] = outcome['candidate']
+            results.append(result)
 
-            for idx, candidate in st.session_state.resume_bank.iterrows():
-                try:
-                    result = match_candidate_to_job_simple(llm, candidate.to_dict(), st.session_state.selected_job)
-                    result['candidate'] = candidate.to_dict()
-                    results.append(result)
-                except Exception as e:
-                    st.error(f"Error matching {candidate.get('name', 'Unknown')}: {str(e)}")
+        st.session_state.matching_results = sorted(results, key=lambda x: x.get('match_score', 0), reverse=True)
+        render_stats_bar(stats_bar, *summarize_results(results))
 
-            st.session_state.matching_results = sorted(results, key=lambda x: x.get('match_score', 0), reverse=True)
+    if st.session_state.match_run['rules_version'] != rules_version:
+        # Weights or thresholds changed in Admin Settings: re-rank from stored component scores
+        rescore_results(st.session_state.matching_results)
+        st.session_state.matching_results.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+        st.session_state.match_run['rules_version'] = rules_version
 
     # Separate matches by location compatibility
     if st.session_state.matching_results:
         job_location_type = st.session_state.selected_job.get('location_type', 'Remote')
 
-        # Categorize results
-        good_location_matches = []
-        poor_location_matches = []
-
-        for result in st.session_state.matching_results:
-            candidate = result.get('candidate', {})
-            candidate_pref = candidate.get('location_preference', 'Flexible')
-            willing_relocate = str(candidate.get('willing_to_relocate', 'No')).lower() in ['yes', 'true', '1']
-
-            # Determine if location is a blocker
-            is_location_mismatch = False
-            if job_location_type == 'Onsite' and candidate_pref == 'Remote' and not willing_relocate:
-                is_location_mismatch = True
-            elif job_location_type == 'Remote' and candidate_pref == 'Onsite':
-                is_location_mismatch = True
-            elif job_location_type == 'Hybrid' and candidate_pref == 'Remote' and not willing_relocate:
-                is_location_mismatch = True
-
-            if is_location_mismatch:
-                poor_location_matches.append(result)
-            else:
-                good_location_matches.append(result)
+        # Categorized once per result set; reruns only build the visible page of cards
+        match_run = st.session_state.match_run
+        view = st.session_state.results_view = get_results_view(
+            st.session_state.results_view,
+            st.session_state.matching_results,
+            job_location_type,
+            CARD_RENDERERS,
+            version=(st.session_state.selected_job['id'], match_run['rules_version'] if match_run else None),
+        )
 
         # Display good matches first
-        st.markdown(f"### ✅ Compatible Candidates ({len(good_location_matches)})")
+        st.markdown(f"### ✅ Compatible Candidates ({view.count(COMPATIBLE)})")
         st.caption("📊 Scoring: Job Title Match (35%) + Skills (30%) + Experience (20%) + Profile Description (15%) | ⚠️ Location & Work Auth are DEAL BREAKERS")
+        if view.not_shortlisted:
+            st.caption(f"🔎 {view.not_shortlisted} candidates were not shortlisted by the keyword pre-screen and were not AI-scored")
 
-        # Display in grid using columns
-        num_cols = 3
-        for i in range(0, len(good_location_matches), num_cols):
-            cols = st.columns(num_cols)
-            for j, col in enumerate(cols):
-                if i + j < len(good_location_matches):
-                    result = good_location_matches[i + j]
-                    candidate = result.get('candidate', {})
-                    score = result.get('match_score', 0)
-                    recommendation = result.get('recommendation', 'REVIEW')
-                    strengths = result.get('strengths', [])
-                    gaps = result.get('gaps', [])
-
-                    score_class = get_match_score_class(score)
-                    rec_class = get_recommendation_class(recommendation)
-
-                    with col:
-                        # Build the gaps HTML if gaps exist
-                        gaps_html = ""
-                        if gaps:
-                            gaps_items = "<br>".join([f"• {g}" for g in gaps[:3]])
-                            gaps_html = f'<div class="match-gaps"><strong>⚠️ Gaps:</strong><br>{gaps_items}</div>'
-
-                        # Build the card HTML
-                        card_html = f'''<div class="match-card-grid">
-    <div class="match-score-badge {score_class}">{score}</div>
-    <div class="candidate-name">{candidate.get('name', 'Unknown')}</div>
-    <div class="candidate-meta">
-        {candidate.get('domain', 'N/A')} • {candidate.get('exp_years', 'N/A')} years<br>
-        <span class="location-badge">{candidate.get('location_preference', 'Flexible')}</span>
-        <span class="location-badge">{candidate.get('location', 'N/A')}</span>
-    </div>
-    <div class="match-strengths">
-        <strong>✅ Strengths:</strong><br>
-        {"<br>".join([f"• {s}" for s in strengths[:3]])}
-    </div>
-    {gaps_html}
-    <div class="rec-badge {rec_class}">{recommendation}</div>
-</div>'''
-                        st.markdown(card_html, unsafe_allow_html=True)
+        filter_col1, filter_col2, filter_col3 = st.columns([3, 2, 1])
+        with filter_col1:
+            results_query = st.text_input("Search candidates", placeholder="Name, domain, location or skill")
+        with filter_col2:
+            results_min_score = st.slider("Min match score", min_value=0, max_value=100, value=0, step=5)
+        with filter_col3:
+            results_page_size = st.selectbox("Cards per page", [12, 24, 48, 96], index=1)
+
+        render_results_page(view, COMPATIBLE, results_page_size, results_min_score, results_query)
 
         # Display poor location matches (hidden by default)
-        if poor_location_matches:
+        if view.count(MISMATCH):
             st.markdown("---")
 
-            with st.expander(f"⚠️ Location Mismatch Candidates ({len(poor_location_matches)}) - Click to View", expanded=False):
+            with st.expander(f"⚠️ Location / Work Auth Mismatch Candidates ({view.count(MISMATCH)}) - Click to View", expanded=False):
                 st.markdown(f"""
                 <div style="background: #fee2e2; padding: 1rem; border-radius: 8px; border-left: 4px solid #dc2626; margin-bottom: 1rem;">
                     <strong>⚠️ Location Compatibility Warning</strong><br>
@@ -920,104 +1280,28 @@ if st.session_state.selected_job and st.session_state.resume_bank is not None:
                 </div>
                 """, unsafe_allow_html=True)
 
-                # Display in grid using columns
-                num_cols = 3
-                for i in range(0, len(poor_location_matches), num_cols):
-                    cols = st.columns(num_cols)
-                    for j, col in enumerate(cols):
-                        if i + j < len(poor_location_matches):
-                            result = poor_location_matches[i + j]
-                            candidate = result.get('candidate', {})
-                            score = result.get('match_score', 0)
-                            score_without_location = result.get('score_without_location', score)
-                            location_score = result.get('location_score', 0)
-                            recommendation = result.get('recommendation', 'REVIEW')
-                            strengths = result.get('strengths', [])
-                            gaps = result.get('gaps', [])
-
-                            candidate_pref = candidate.get('location_preference', 'Flexible')
-                            willing_relocate = str(candidate.get('willing_to_relocate', 'No')).lower() in ['yes', 'true', '1']
-
-                            # Force score to show location penalty
-                            score_class = "score-poor"
-                            rec_class = "rec-reject"
-
-                            # Get potential score color
-                            potential_score_class = get_match_score_class(score_without_location)
-
-                            with col:
-                                # Build gaps HTML
-                                gaps_html = ""
-                                if gaps:
-                                    gaps_items = "<br>".join([f"• {g}" for g in gaps[:2]])
-                                    gaps_html = f'<div class="match-gaps"><strong>⚠️ Additional Gaps:</strong><br>{gaps_items}</div>'
-
-                                # Build relocation text
-                                relocation_text = '✅ Willing to relocate' if willing_relocate else '❌ Not willing to relocate'
-
-                                # Build the card HTML
-                                mismatch_card_html = f'''<div class="match-card-grid" style="border: 2px solid #dc2626; opacity: 0.85;">
-    <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 0.5rem;">
-        <div class="match-score-badge {score_class}" style="background: #dc2626; font-size: 1.2rem;">
-            {score}<div style="font-size: 0.55rem; margin-top: 0.2rem;">ACTUAL</div>
-        </div>
-        <div class="match-score-badge {potential_score_class}" style="font-size: 1rem; padding: 0.4rem 0.6rem;">
-            {score_without_location}<div style="font-size: 0.55rem; margin-top: 0.2rem;">POTENTIAL</div>
-        </div>
-    </div>
-    <div class="candidate-name">{candidate.get('name', 'Unknown')}</div>
-    <div class="candidate-meta">
-        {candidate.get('domain', 'N/A')} • {candidate.get('exp_years', 'N/A')} years<br>
-        <span class="location-badge" style="background: #fee2e2; color: #7f1d1d; border: 1px solid #dc2626;">
-            ❌ Prefers: {candidate_pref}
-        </span>
-        <span class="location-badge">{candidate.get('location', 'N/A')}</span>
-    </div>
-    <div style="background: #fee2e2; padding: 0.5rem; border-radius: 4px; border-left: 3px solid #dc2626; margin: 0.5rem 0; font-size: 0.75rem;">
-        <strong>🚫 Location Penalty: -{round((100 - location_score) * 0.20, 1)} pts</strong><br>
-        Job needs <strong>{job_location_type}</strong>, wants <strong>{candidate_pref}</strong><br>
-        {relocation_text}
-    </div>
-    <div class="match-strengths">
-        <strong>✅ Skills Match:</strong><br>
-        {"<br>".join([f"• {s}" for s in strengths[:3]])}
-    </div>
-    {gaps_html}
-    <div class="rec-badge {rec_class}">LOCATION MISMATCH</div>
-</div>'''
-                                st.markdown(mismatch_card_html, unsafe_allow_html=True)
+                render_results_page(view, MISMATCH, results_page_size, results_min_score, results_query)
 
                 st.markdown(f"""
                 <div style="background: #fef3c7; padding: 0.75rem; border-radius: 6px; border-left: 3px solid #f59e0b; margin-top: 1rem; font-size: 0.85rem;">
-                    <strong>💡 Recommendation:</strong> These {len(poor_location_matches)} candidates have <strong>location incompatibility</strong>.
+                    <strong>💡 Recommendation:</strong> These {view.count(MISMATCH)} candidates have <strong>location incompatibility</strong>.
                     While their skills may be strong, the location mismatch significantly reduces the likelihood of a successful hire.
                     Consider them only if they're exceptional and you can negotiate work arrangements.
                 </div>
                 """, unsafe_allow_html=True)
 
         # Export Button
-        if st.button("📥 Export Results to Excel"):
-            export_data = []
-            for result in st.session_state.matching_results:
-                candidate = result.get('candidate', {})
-                export_data.append({
-                    'Name': candidate.get('name'),
-                    'Score': result.get('match_score'),
-                    'Recommendation': result.get('recommendation'),
-                    'Experience': candidate.get('exp_years'),
-                    'Domain': candidate.get('domain'),
-                    'Strengths': '; '.join(result.get('strengths', [])),
-                    'Gaps': '; '.join(result.get('gaps', []))
-                })
-
-            df_export = pd.DataFrame(export_data)
-            output = BytesIO()
-            df_export.to_excel(output, index=False)
-            output.seek(0)
-
-            st.download_button(
-                label="⬇️ Download Excel",
-                data=output,
-                file_name=f"matches_{st.session_state.selected_job['title']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        export_col1, export_col2 = st.columns([1, 3])
+        with export_col1:
+            export_format = st.selectbox("Export format", EXPORT_FORMATS, key="export_format_job")
+        with export_col2:
+            st.write("")
+            if st.button("📥 Export Results"):
+                job_title = st.session_state.selected_job['title']
+                start_match_export(
+                    [(job_title, list(result_rows(st.session_state.matching_results)))],
+                    export_format,
+                    f"matches_{job_title}",
+                    origin="job",
+                )
+        render_match_export("job")
@@ -0,0 +1,161 @@
+"""
+Prompt caching - static prefixes must stay byte-identical across calls
+"""
+
+import re
+import json
+
+from langchain_core.messages import AIMessage
+
+from app.prompts.base import PARSE_RESUME_PROMPT
+from app.prompts.config import estimate_cost
+from app.prompts.utils import CACHE_CONTROL, build_cached_messages, format_prompt_parts
+from app.utils.candidate_matching import match_candidate_to_job_simple, match_candidates_batch
+from app.utils.cost_estimator import MIN_CACHEABLE_TOKENS, RunEstimate, count_tokens
+
+
+JOB = {
+    "title": "Senior Python Developer",
+    "department": "Engineering",
+    "experience_years": 5,
+    "location": "San Francisco, CA",
+    "location_type": "Remote",
+    "job_type": "Full-time",
+    "required_skills": ["Python", "Django", "AWS"],
+    "description": "Build and operate the APIs behind our hiring platform.",
+}
+
+CANDIDATES = [
+    {"name": "Ada", "skill_set": "Python, Django, AWS", "exp_years": 7, "domain": "Software",
+     "location_preference": "Remote"},
+    {"name": "Grace", "skill_set": "Java, Spring, GCP", "exp_years": 3, "domain": "Finance",
+     "location_preference": "Flexible"},
+]
+
+SCORES = {
+    "job_title_match_score": 80,
+    "skills_score": 70,
+    "experience_score": 60,
+    "profile_description_match_score": 75,
+    "strengths": ["s"],
+    "gaps": ["g"],
+    "reasoning": "r",
+}
+
+
+class FakeChatModel:
+    """Records the messages of every call and answers with fixed scores"""
+
+    model = "fake-model"
+    temperature = 0.0
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages, **kwargs):
+        self.calls.append(messages)
+        text = "".join(block["text"] if isinstance(block, dict) else block for block in _blocks(messages[-1]))
+        ids = re.findall(r"\[candidate_id: (c\d+)\]", text)
+        if ids:
+            return AIMessage(content=json.dumps({
+                "ranked_candidates": [dict(SCORES, candidate_id=candidate_id) for candidate_id in ids]
+            }))
+        return AIMessage(content=json.dumps(SCORES))
+
+
+class FakeAnthropicChatModel(FakeChatModel):
+    """Fake model that supports_prompt_caching treats as an Anthropic model"""
+
+
+FakeAnthropicChatModel.__module__ = "tests.fake_anthropic"
+
+
+def _blocks(message):
+    return message.content if isinstance(message.content, list) else [message.content]
+
+
+def test_format_prompt_parts_prefix_is_identical_across_inputs():
+    first_static, first_variable = format_prompt_parts(PARSE_RESUME_PROMPT, resume_text="Ada Lovelace\nPython")
+    second_static, second_variable = format_prompt_parts(PARSE_RESUME_PROMPT, resume_text="Grace Hopper\nCOBOL")
+
+    assert first_static == second_static
+    assert first_variable != second_variable
+    assert "Ada Lovelace" not in first_static
+
+
+def test_build_cached_messages_marks_only_the_static_block():
+    first = build_cached_messages("system", "static instructions", "candidate one", cache=True)
+    second = build_cached_messages("system", "static instructions", "candidate two", cache=True)
+
+    assert first[0].content == second[0].content
+    assert _blocks(first[1])[0] == _blocks(second[1])[0]
+    assert _blocks(first[1])[0]["cache_control"] == CACHE_CONTROL
+    assert "cache_control" not in _blocks(first[1])[1]
+    assert _blocks(first[1])[1] != _blocks(second[1])[1]
+
+
+def test_build_cached_messages_without_caching_sends_plain_text():
+    messages = build_cached_messages("system", "static ", "variable", cache=False)
+
+    assert messages[0].content == "system"
+    assert messages[1].content == "static variable"
+
+
+def test_single_candidate_prefix_is_byte_identical_across_candidates():
+    llm = FakeAnthropicChatModel()
+    for candidate in CANDIDATES:
+        match_candidate_to_job_simple(llm, candidate, JOB)
+
+    prefixes = [_blocks(messages[-1])[0] for messages in llm.calls]
+    assert len(prefixes) == 2
+    assert prefixes[0] == prefixes[1]
+    assert prefixes[0]["cache_control"] == CACHE_CONTROL
+    assert _blocks(llm.calls[0][-1])[1] != _blocks(llm.calls[1][-1])[1]
+
+
+def test_batch_prefix_is_byte_identical_across_batches():
+    llm = FakeAnthropicChatModel()
+    match_candidates_batch(llm, CANDIDATES, JOB)
+    match_candidates_batch(llm, list(reversed(CANDIDATES)), JOB)
+
+    prefixes = [_blocks(messages[-1])[0] for messages in llm.calls]
+    assert len(prefixes) == 2
+    assert prefixes[0] == prefixes[1]
+    assert prefixes[0]["cache_control"] == CACHE_CONTROL
+
+
+def test_models_without_prompt_caching_get_no_markers():
+    llm = FakeChatModel()
+    match_candidate_to_job_simple(llm, CANDIDATES[0], JOB)
+
+    assert isinstance(llm.calls[0][-1].content, str)
+
+
+def test_estimate_counts_no_cache_reads_below_the_provider_minimum():
+    prefix = "short static prefix"
+    assert count_tokens(prefix) < MIN_CACHEABLE_TOKENS
+
+    estimate = RunEstimate("claude-sonnet-4-20250514", prompt_caching=True)
+    for _ in range(3):
+        estimate.add_request("matching", 500, 100, prefix=prefix, prefix_tokens=count_tokens(prefix))
+
+    assert estimate.summary()["cached_input_tokens"] == 0
+    assert estimate.summary()["cache_write_input_tokens"] == 0
+
+
+def test_estimate_prices_the_first_cacheable_prefix_as_a_cache_write():
+    model = "claude-3-sonnet-20240229"
+    prefix_tokens = MIN_CACHEABLE_TOKENS * 2
+
+    estimate = RunEstimate(model, prompt_caching=True)
+    for _ in range(3):
+        estimate.add_request("matching", prefix_tokens + 500, 100, prefix="long prefix", prefix_tokens=prefix_tokens)
+    summary = estimate.summary()
+
+    assert summary["cache_write_input_tokens"] == prefix_tokens
+    assert summary["cached_input_tokens"] == 2 * prefix_tokens
+    assert summary["cost"] == round(estimate_cost(model, 3 * (prefix_tokens + 500), 300, 2 * prefix_tokens, prefix_tokens), 4)
+
+    single = RunEstimate(model, prompt_caching=True)
+    single.add_request("matching", prefix_tokens + 500, 100, prefix="long prefix", prefix_tokens=prefix_tokens)
+    assert single.summary()["cost"] > round(estimate_cost(model, prefix_tokens + 500, 100), 4)